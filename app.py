@@ -1,11 +1,13 @@
-import sys
 import os
-print(f"--- Debug: Running with Python executable: {sys.executable}")
-print(f"--- Debug: sys.path: {sys.path}")
+import secrets
 
-from flask import Flask, render_template, redirect, url_for, flash, request, jsonify
-from flask_login import LoginManager, login_required, current_user
+from flask import Flask, render_template, redirect, url_for, flash, request, jsonify, session
+from flask_login import LoginManager, login_required, current_user, user_logged_in, user_logged_out, user_loaded_from_cookie
+from sqlalchemy import text
 from modules.auth.models import db, User
+from utils.license_manager import validate_license
+from utils.fast_lane import RouteClassifier, FastLaneSessionInterface, IdentityCache, CHECK_LICENSE
+from utils.warmup import WarmupStage
 
 # Import configuration
 from config import Config
@@ -14,6 +16,13 @@ from config import Config
 app = Flask(__name__)
 app.config.from_object(Config)
 
+# Per-endpoint request checks and per-session user cache
+route_classifier = RouteClassifier()
+identity_cache = IdentityCache(ttl=Config.IDENTITY_CACHE_TTL)
+
+# Skip cookie session decoding for endpoints classified without CHECK_SESSION
+app.session_interface = FastLaneSessionInterface(route_classifier)
+
 # Initialize database
 db.init_app(app)
 
@@ -22,9 +31,41 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'auth.login'
 
+# Session key of the random per-login token the identity cache is keyed by
+# (Flask-Login's '_id' only hashes the client's IP and user agent)
+IDENTITY_TOKEN_KEY = '_identity_token'
+
+def _load_user_from_db(user_id):
+    """Load a user and detach it so it can be cached across requests"""
+    user = db.session.get(User, int(user_id))
+    if user is not None:
+        db.session.expunge(user)
+    return user
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    token = session.get(IDENTITY_TOKEN_KEY)
+    if not token:
+        # Logged in before tokens were issued: no cache
+        return db.session.get(User, int(user_id))
+    
+    user = identity_cache.get_or_load(token, user_id, lambda: _load_user_from_db(user_id))
+    # The cached user is a detached snapshot shared across requests: give
+    # each request its own instance attached to its database session
+    return db.session.merge(user, load=False) if user is not None else None
+
+@user_logged_in.connect_via(app)
+@user_loaded_from_cookie.connect_via(app)
+def issue_identity_token(sender, user, **extra):
+    """Start a new identity cache key for each login"""
+    session[IDENTITY_TOKEN_KEY] = secrets.token_urlsafe(16)
+
+@user_logged_out.connect_via(app)
+def forget_identity(sender, user, **extra):
+    """Drop the cached identity when a user logs out"""
+    session.pop(IDENTITY_TOKEN_KEY, None)
+    if user is not None and user.is_authenticated:
+        identity_cache.invalidate_user(user.get_id())
 
 # Import and register blueprints
 from modules.auth.routes import auth_bp
@@ -37,6 +78,20 @@ app.register_blueprint(ai_bp, url_prefix='/ai')
 app.register_blueprint(products_bp, url_prefix='/products')
 app.register_blueprint(categories_bp, url_prefix='/categories')
 
+# Startup warm-up: cache initializers run concurrently before serving
+# (serve.py waits for them, the dev server runs them in the background;
+# the WooCommerce stage opens connections and threads, so a preforking
+# server runs it in each worker)
+from modules.ai import warm_up as warm_up_prompts
+from modules.ai.models import preload_provider_sdks
+from modules.woocommerce import warm_up as warm_up_woocommerce
+
+warmup = WarmupStage(deadline=Config.WARMUP_DEADLINE, max_workers=Config.WARMUP_WORKERS)
+warmup.add('prompts', warm_up_prompts)
+warmup.add('license', validate_license)
+warmup.add('ai_sdks', preload_provider_sdks)
+warmup.add('woocommerce', warm_up_woocommerce, per_process=True)
+
 # Main routes
 @app.route('/')
 def index():
@@ -51,6 +106,26 @@ def dashboard():
     """Display the main dashboard"""
     return render_template('dashboard/index.html')
 
+@app.route('/healthz')
+def healthz():
+    """Liveness probe (no session, login or license checks)"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness probe (no session, login or license checks)"""
+    # Start the warm-up if the server didn't (e.g. an external WSGI server)
+    warmup.start()
+    report = warmup.report()
+    if not report['ready']:
+        return jsonify({'status': 'warming_up', 'warmup': report['stages']}), 503
+    
+    try:
+        db.session.execute(text('SELECT 1'))
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'database': str(e)}), 503
+    return jsonify({'status': 'ready', 'warmup': report['stages']})
+
 @app.route('/settings')
 @login_required
 def settings():
@@ -70,16 +145,13 @@ def internal_server_error(e):
 @app.before_request
 def verify_license():
     """Verify the license before processing any request"""
-    from utils.license_manager import validate_license
-    
-    # Skip license check for static files and the license activation route
-    if request.path.startswith('/static') or request.path == '/auth/activate_license':
+    # Static files, health probes and the license page itself are classified as not needing it
+    if CHECK_LICENSE not in route_classifier.checks_for(request.endpoint):
         return
     
-    # Check license validity
+    # Check license validity (cached in-process, see utils.license_manager)
     if not validate_license():
-        if request.path != '/auth/license':
-            return redirect(url_for('auth.license'))
+        return redirect(url_for('auth.license'))
 
 # Create database tables
 def init_db():
@@ -93,5 +165,7 @@ def init_db():
             db.session.commit()
 
 if __name__ == '__main__':
+    # Development server only; use serve.py in production
     init_db()
-    app.run(debug=True) 
\ No newline at end of file
+    warmup.start()
+    app.run(debug=app.config.get('DEBUG', False)) 
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+License check benchmark
+
+Measures the per-request overhead of the license check done by the
+`verify_license` before_request hook, with and without the in-process
+verdict cache. A throw-away license for this machine is generated in a
+temporary directory, so the installed license.key is never touched.
+
+Usage:
+    python -m benchmarks.license_check [--iterations 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from utils import license_manager
+from utils.keygen import generate_trial_key
+from utils.machine_id import get_machine_fingerprint, get_simplified_fingerprint
+
+def _time_calls(func, iterations):
+    """Return the mean wall time per call in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if not func():
+            raise RuntimeError("License check failed during benchmark")
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    """Run the benchmark and print a before/after comparison"""
+    parser = argparse.ArgumentParser(description='Benchmark the license check hook')
+    parser.add_argument('--iterations', type=int, default=20, help='Uncached iterations (cached runs 10000x more)')
+    args = parser.parse_args()
+    
+    original_license_file = Config.LICENSE_FILE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        Config.LICENSE_FILE = os.path.join(tmp_dir, 'license.key')
+        try:
+            license_key = generate_trial_key(
+                get_machine_fingerprint(),
+                get_simplified_fingerprint(),
+                'Benchmark',
+                'bench@example.com',
+                days_valid=1
+            )
+            with open(Config.LICENSE_FILE, 'w') as f:
+                f.write(license_key)
+            
+            # Before: full validation on every request
+            uncached = _time_calls(lambda: license_manager.validate_license(use_cache=False), args.iterations)
+            
+            # After: first call fills the cache, the rest are hits
+            license_manager.invalidate_license_cache()
+            license_manager.validate_license()
+            cached = _time_calls(license_manager.validate_license, args.iterations * 10000)
+        finally:
+            Config.LICENSE_FILE = original_license_file
+            license_manager.invalidate_license_cache()
+    
+    print(f"Uncached validate_license: {uncached:12.1f} us/request")
+    print(f"Cached validate_license:   {cached:12.1f} us/request")
+    print(f"Speedup:                   {uncached / cached:12.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Product search benchmark
+
+Fills a temporary catalog mirror with synthetic products (through the
+regular sync path, with a fake client instead of a store) and times
+typical searches of the product list page.
+
+Usage:
+    python -m benchmarks.product_search [--products 50000] [--runs 50]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.woocommerce.mirror import CatalogMirror
+from modules.woocommerce.paging import PagedResult
+from modules.woocommerce.search import ProductSearch
+
+# Common adjectives (each in ~10% of names) and a larger vocabulary of
+# product words (each in a fraction of a percent of the catalog)
+WORDS = ['blue', 'red', 'green', 'black', 'white', 'cotton', 'leather', 'wool', 'organic', 'premium',
+         'classic', 'sport', 'kids', 'summer', 'winter', 'vintage', 'smart', 'wireless', 'mini', 'pro',
+         'large', 'small', 'soft', 'light', 'heavy', 'outdoor', 'indoor', 'travel', 'home', 'office']
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'sa', 'tor', 'vi', 'ban', 'del', 'fu', 'gar', 'hin', 'jo', 'nel', 'pra', 'qui']
+
+def _vocabulary(size, rng):
+    """Made-up product words ('kalomi', 'rensador'...)"""
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+def _products(count, rng, vocabulary):
+    """Synthetic products with names, SKUs, descriptions, terms and dates"""
+    for product_id in range(1, count + 1):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.choice(vocabulary)}".title()
+        day = rng.randrange(365)
+        yield {
+            'id': product_id,
+            'name': f"{name} {product_id}",
+            'slug': f"{name.lower().replace(' ', '-')}-{product_id}",
+            'sku': f"SKU-{product_id:06d}",
+            'type': 'simple',
+            'status': 'publish',
+            'description': '<p>' + ' '.join(rng.choice(vocabulary) for _ in range(40)) + '</p>',
+            'short_description': '',
+            'date_created_gmt': f"2024-{day // 30 % 12 + 1:02d}-{day % 28 + 1:02d}T10:00:00",
+            'date_modified_gmt': '2024-12-31T00:00:00',
+            'categories': [{'id': rng.randrange(1, 200)}],
+            'tags': [{'id': rng.randrange(1000, 1100)}],
+            'brands': [{'id': rng.randrange(2000, 2050)}],
+        }
+
+class _FakeClient:
+    """Serves the synthetic catalog page by page, like WooCommerceClient.get_page"""
+    
+    def __init__(self, products):
+        self.products = products
+    
+    def get_page(self, endpoint, page=1, per_page=100, params=None, use_cache=True):
+        items = self.products[(page - 1) * per_page:page * per_page] if endpoint == 'products' else []
+        total = len(self.products) if endpoint == 'products' else 0
+        return PagedResult(items, page, per_page, total=total, total_pages=(total + per_page - 1) // per_page)
+
+class _Manager:
+    """The part of ProductManager that ProductSearch uses, bound to the mirror"""
+    
+    def __init__(self, mirror):
+        self.mirror = mirror
+    
+    def get_products_page(self, page=1, per_page=20, fields=None, **filters):
+        return self.mirror.query('products', page, per_page, None, filters)
+
+def main():
+    """Build the catalog and print timings per search"""
+    parser = argparse.ArgumentParser(description='Benchmark product search over the catalog mirror')
+    parser.add_argument('--products', type=int, default=50000, help='Products in the catalog')
+    parser.add_argument('--runs', type=int, default=50, help='Runs per search')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    path = os.path.join(tempfile.mkdtemp(), 'bench_mirror.db')
+    mirror = CatalogMirror('https://bench.example', path)
+    
+    vocabulary = _vocabulary(2000, rng)
+    start = time.perf_counter()
+    mirror.sync(_FakeClient(list(_products(args.products, rng, vocabulary))), ['products'])
+    print(f"Synced {args.products} products in {time.perf_counter() - start:.1f}s\n")
+    
+    search = ProductSearch(_Manager(mirror))
+    word = vocabulary[len(vocabulary) // 2]
+    cases = [
+        ('product word', {'text': word}),
+        ('prefix', {'text': word[:4]}),
+        ('common word', {'text': 'leather'}),
+        ('two words', {'text': f'leather {word}'}),
+        ('sku prefix', {'text': 'SKU-0421'}),
+        ('exact sku', {'sku': 'SKU-004217'}),
+        ('id', {'product_id': 4217}),
+        ('category', {'category': 42}),
+        ('brand + tag', {'brand': 2010, 'tag': 1050}),
+        ('date range', {'date_from': '2024-03-01', 'date_to': '2024-03-15'}),
+        ('word + category + dates', {'text': word, 'category': 42, 'date_from': '2024-01-01', 'date_to': '2024-06-30'}),
+    ]
+    
+    print(f"{'search':<26} {'matches':>8} {'mean':>9} {'p95':>9}")
+    for name, criteria in cases:
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            result = search.search(per_page=20, **criteria)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{name:<26} {result.total:>8} {sum(timings) / len(timings):>7.2f}ms {p95:>7.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Reorder planner benchmark
+
+Compares the menu_order writes of rewriting every term (what
+reorder_categories does with a full order map) against the minimal-move
+plan, and times the planner on large term lists. No store is contacted.
+
+Usage:
+    python -m benchmarks.reorder_plan [--sizes 500 5000 50000] [--moves 200]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.woocommerce.reorder import plan_reorder
+
+def _move_one(order, rng):
+    """Drag one term to a random position"""
+    order = list(order)
+    term = order.pop(rng.randrange(len(order)))
+    order.insert(rng.randrange(len(order) + 1), term)
+    return order
+
+def _move_block(order, rng, size=10):
+    """Drag a block of adjacent terms to a random position"""
+    order = list(order)
+    start = rng.randrange(max(1, len(order) - size))
+    block = order[start:start + size]
+    del order[start:start + size]
+    position = rng.randrange(len(order) + 1)
+    return order[:position] + block + order[position:]
+
+def _run(size, moves, scenario, rng):
+    """Apply `moves` drag-and-drops to a gapped list; return (mean writes, max writes, mean ms)"""
+    # A list that was reordered once already (values spaced by the planner)
+    current = plan_reorder({term_id: 0 for term_id in range(size)}, list(range(size)))
+    order = sorted(current, key=current.get)
+    
+    writes = []
+    elapsed = 0.0
+    for _ in range(moves):
+        order = scenario(order, rng)
+        start = time.perf_counter()
+        changes = plan_reorder(current, order)
+        elapsed += time.perf_counter() - start
+        current.update(changes)
+        writes.append(len(changes))
+    
+    return sum(writes) / moves, max(writes), elapsed / moves * 1000
+
+def main():
+    """Run the benchmark and print a comparison table"""
+    parser = argparse.ArgumentParser(description='Benchmark the minimal-move reorder planner')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 5000, 50000], help='Term list sizes')
+    parser.add_argument('--moves', type=int, default=200, help='Drag-and-drops per size and scenario')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    scenarios = [('single move', _move_one), ('block of 10', _move_block)]
+    
+    print(f"{'terms':>7}  {'scenario':<12}  {'full rewrite':>12}  {'planned (mean/max)':>18}  {'plan time':>10}")
+    for size in args.sizes:
+        for name, scenario in scenarios:
+            mean_writes, max_writes, mean_ms = _run(size, args.moves, scenario, rng)
+            print(f"{size:>7}  {name:<12}  {size:>12}  {mean_writes:>11.1f} / {max_writes:<4}  {mean_ms:>8.2f}ms")
+
+if __name__ == "__main__":
+    main()
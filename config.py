@@ -14,6 +14,9 @@ class Config:
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
     
+    # Seconds a logged-in user is cached per session (skips the DB lookup)
+    IDENTITY_CACHE_TTL = 60
+    
     # Database configuration
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         f"sqlite:///{os.path.join(BASE_DIR, 'instance', 'app.db')}"
@@ -33,6 +36,11 @@ class Config:
     # License file path
     LICENSE_FILE = os.path.join(BASE_DIR, 'license.key')
     
+    # Machine fingerprint probes (seconds)
+    FINGERPRINT_PROBE_TIMEOUT = 5
+    FINGERPRINT_FIRST_TIMEOUT = 60  # Cap on the first computation, which waits for every probe
+    FINGERPRINT_REFRESH_INTERVAL = 3600
+    
     # WooCommerce default settings
     WOOCOMMERCE_STORE_URL = os.environ.get('WOOCOMMERCE_STORE_URL', '')
     WOOCOMMERCE_CONSUMER_KEY = os.environ.get('WOOCOMMERCE_CONSUMER_KEY', '')
@@ -40,6 +48,52 @@ class Config:
     WOOCOMMERCE_VERIFY_SSL = False
     WOOCOMMERCE_TIMEOUT = 15
     WOOCOMMERCE_ITEMS_PER_PAGE = 20
+    WOOCOMMERCE_POOL_MAXSIZE = 10
+    WOOCOMMERCE_CLIENT_IDLE_TTL = 900
+    WOOCOMMERCE_ASYNC_CONCURRENCY = 6
+    WOOCOMMERCE_ITER_WORKERS = 8  # Page fetch threads of iter_all() (in-flight requests are capped per store below)
+    WOOCOMMERCE_BATCH_WORKERS = 4  # Batch chunk threads (100 operations each)
+    
+    # Retries, adaptive per-store concurrency and circuit breaking
+    WOOCOMMERCE_MAX_RETRIES = 3  # Retries of 429/502/503/504 and connection errors
+    WOOCOMMERCE_RETRY_BACKOFF = 0.5  # Base backoff in seconds, doubled per retry (with jitter)
+    WOOCOMMERCE_RETRY_MAX_DELAY = 30  # Longest wait; a longer Retry-After fails the call
+    WOOCOMMERCE_CONCURRENCY_INITIAL = 4  # Starting requests in flight per store
+    WOOCOMMERCE_CONCURRENCY_MAX = 8  # Upper bound for requests in flight per store
+    WOOCOMMERCE_CONCURRENCY_RESERVED = 2  # Slots per store bulk work (page walks, batch chunks) leaves to interactive calls
+    WOOCOMMERCE_LATENCY_TARGET = 8.0  # Seconds above which a response counts as overload
+    WOOCOMMERCE_BREAKER_THRESHOLD = 5  # Consecutive failures that open a store's circuit
+    WOOCOMMERCE_BREAKER_COOLDOWN = 30  # Seconds an open circuit fails fast before probing the store
+    
+    # WooCommerce GET response cache (TTL 0 disables it; empty disk path keeps it in memory only)
+    WOOCOMMERCE_CACHE_TTL = int(os.environ.get('WOOCOMMERCE_CACHE_TTL', 60))
+    WOOCOMMERCE_CACHE_MAX_ENTRIES = 2048
+    WOOCOMMERCE_CACHE_DISK_PATH = os.environ.get('WOOCOMMERCE_CACHE_DISK_PATH', os.path.join(BASE_DIR, 'instance', 'wc_cache.db'))
+    WOOCOMMERCE_CACHE_DISK_MAX_AGE = 86400
+    
+    # Local SQLite catalog mirror (empty path disables it)
+    WOOCOMMERCE_MIRROR_PATH = os.environ.get('WOOCOMMERCE_MIRROR_PATH', os.path.join(BASE_DIR, 'instance', 'wc_mirror.db'))
+    WOOCOMMERCE_MIRROR_MAX_AGE = 300  # Seconds after a sync during which reads are served from the mirror
+    WOOCOMMERCE_MIRROR_FULL_SYNC_INTERVAL = 86400  # Seconds between full resyncs (catch deletions made elsewhere)
+    
+    # Cached category tree (reloaded in the background after the TTL; category writes update it in place)
+    WOOCOMMERCE_CATEGORY_TREE_TTL = 3600
+    
+    # Shared taxonomy term cache (categories, brands, tags, attributes)
+    WOOCOMMERCE_TERM_CACHE_TTL = 900  # Seconds before a kind is reloaded in the background
+    
+    # In-memory typeahead for edit forms
+    WOOCOMMERCE_TYPEAHEAD_TTL = 900  # Seconds before an index is rebuilt in the background
+    WOOCOMMERCE_TYPEAHEAD_LIMIT = 10  # Suggestions returned by default
+    WOOCOMMERCE_TYPEAHEAD_MAX_LIMIT = 50  # Most suggestions a request may ask for
+    
+    # Product webhooks (POST /products/webhook); with them registered the cache and mirror TTLs can be raised
+    WOOCOMMERCE_WEBHOOK_SECRET = os.environ.get('WOOCOMMERCE_WEBHOOK_SECRET', '')
+    WOOCOMMERCE_WEBHOOK_DEBOUNCE = 2.0  # Seconds events are buffered so a burst of deliveries is applied once
+    # Shared log that carries webhook changes to the other worker processes' memory (empty path disables it)
+    WOOCOMMERCE_CHANGE_FEED_PATH = os.environ.get('WOOCOMMERCE_CHANGE_FEED_PATH', os.path.join(BASE_DIR, 'instance', 'wc_changes.db'))
+    WOOCOMMERCE_CHANGE_FEED_POLL = 1.0  # Seconds between checks of the log by each process
+    WOOCOMMERCE_CHANGE_FEED_MAX_AGE = 3600  # Seconds changes are kept in the log
     
     # AI API keys
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
@@ -49,6 +103,16 @@ class Config:
     # Default AI model
     DEFAULT_AI_MODEL = 'gpt-3.5-turbo'
     
+    # Production server (serve.py)
+    SERVER_HOST = os.environ.get('SERVER_HOST', '127.0.0.1')
+    SERVER_PORT = int(os.environ.get('SERVER_PORT', 5000))
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 8))
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 1))  # >1 forks workers (Linux/macOS only)
+    
+    # Startup warm-up (seconds to wait for cache initializers, thread pool size)
+    WARMUP_DEADLINE = int(os.environ.get('WARMUP_DEADLINE', 30))
+    WARMUP_WORKERS = 4
+    
     # UI configuration
     DEFAULT_THEME = 'light'  # 'light' or 'dark'
     
@@ -9,7 +9,7 @@ product titles, descriptions, and SEO metadata.
 from flask import Blueprint
 
 from .prompts import PromptManager
-from .routes import register_routes
+from .routes import register_routes, prompt_manager
 from .product_content_generator import ProductContentGenerator
 
 # Initialize the blueprint
@@ -18,14 +18,13 @@ ai_bp = Blueprint('ai', __name__, url_prefix='/ai')
 # Register all routes
 register_routes(ai_bp)
 
-# Initialize prompt manager
-prompt_manager = PromptManager()
-prompt_manager._ensure_prompts_file()
-prompt_manager.initialize_default_prompts()
-
-# Initialize content generator
+# Initialize content generator (shares the routes' prompt manager and its cache)
 product_content_generator = ProductContentGenerator(prompt_manager)
 
+def warm_up():
+    """Create and seed the prompts file and load it into the cache ahead of the first request (startup warm-up stage)"""
+    prompt_manager.get_prompts()
+
 def init_app(app):
     """Initialize the AI module with the Flask app"""
     app.register_blueprint(ai_bp)
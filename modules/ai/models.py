@@ -2,9 +2,8 @@ import os
 import json
 import uuid
 import datetime
-import openai
-import anthropic
-import google.generativeai as genai
+import importlib
+import logging
 from config import Config
 from utils.logger import log_ai_generation
 
@@ -94,6 +93,7 @@ class OpenAIModel(AIModel):
         super().__init__(api_key)
         self.api_key = api_key or Config.OPENAI_API_KEY
         self.model = model
+        openai = load_provider_sdk('openai')
         openai.api_key = self.api_key
     
     def generate(self, prompt, max_tokens=None, temperature=None):
@@ -113,6 +113,7 @@ class OpenAIModel(AIModel):
         temperature = temperature if temperature is not None else 0.7
         
         try:
+            openai = load_provider_sdk('openai')
             response = openai.ChatCompletion.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
@@ -168,6 +169,7 @@ class ClaudeModel(AIModel):
         super().__init__(api_key)
         self.api_key = api_key or Config.CLAUDE_API_KEY
         self.model = model
+        anthropic = load_provider_sdk('claude')
         self.client = anthropic.Anthropic(api_key=self.api_key)
     
     def generate(self, prompt, max_tokens=None, temperature=None):
@@ -246,6 +248,7 @@ class GeminiModel(AIModel):
         self.model = model
         
         # Configure the API
+        genai = load_provider_sdk('gemini')
         genai.configure(api_key=self.api_key)
     
     def generate(self, prompt, max_tokens=None, temperature=None):
@@ -266,6 +269,7 @@ class GeminiModel(AIModel):
         
         try:
             # Initialize the model
+            genai = load_provider_sdk('gemini')
             model = genai.GenerativeModel(self.model)
             
             # Generate content
@@ -308,6 +312,79 @@ class GeminiModel(AIModel):
         return self.model
 
 
+# Provider registry: each entry maps a model-name keyword to its model class,
+# the SDK module (only imported when the provider is first used) and the
+# Config attribute holding its API key
+PROVIDERS = {
+    'openai': {'keyword': 'gpt', 'model_class': OpenAIModel, 'sdk': 'openai', 'api_key_setting': 'OPENAI_API_KEY'},
+    'claude': {'keyword': 'claude', 'model_class': ClaudeModel, 'sdk': 'anthropic', 'api_key_setting': 'CLAUDE_API_KEY'},
+    'gemini': {'keyword': 'gemini', 'model_class': GeminiModel, 'sdk': 'google.generativeai', 'api_key_setting': 'GEMINI_API_KEY'},
+}
+DEFAULT_PROVIDER = 'openai'
+
+def register_provider(name, keyword, model_class, sdk, api_key_setting=None):
+    """
+    Register an AI provider
+    
+    Args:
+        name (str): Provider name
+        keyword (str): Lower-case substring identifying the provider's model names
+        model_class (type): AIModel subclass implementing the provider
+        sdk (str): Dotted module path of the provider SDK
+        api_key_setting (str, optional): Config attribute holding the provider's API key
+    """
+    PROVIDERS[name] = {'keyword': keyword, 'model_class': model_class, 'sdk': sdk, 'api_key_setting': api_key_setting}
+
+def load_provider_sdk(name):
+    """
+    Import a provider SDK on first use
+    
+    Args:
+        name (str): Provider name (a PROVIDERS key)
+        
+    Returns:
+        module: The imported SDK module
+    """
+    # importlib caches in sys.modules and serializes concurrent imports
+    return importlib.import_module(PROVIDERS[name]['sdk'])
+
+def preload_provider_sdks():
+    """
+    Import the SDKs of the default provider and of every provider with a configured API key
+    
+    Returns:
+        list: Names of the providers whose SDK was loaded
+    """
+    names = {get_provider_name(Config.DEFAULT_AI_MODEL)}
+    for name, provider in PROVIDERS.items():
+        if provider.get('api_key_setting') and getattr(Config, provider['api_key_setting'], ''):
+            names.add(name)
+    
+    loaded = []
+    for name in sorted(names):
+        try:
+            load_provider_sdk(name)
+            loaded.append(name)
+        except ImportError as e:
+            logging.warning(f"AI provider SDK for {name} is not installed: {e}")
+    return loaded
+
+def get_provider_name(model_name):
+    """
+    Get the provider name for a model name
+    
+    Args:
+        model_name (str): Model name (e.g., gpt-4, claude-3-sonnet-20240229)
+        
+    Returns:
+        str: Provider name (falls back to DEFAULT_PROVIDER)
+    """
+    model_name = model_name.lower()
+    for name, provider in PROVIDERS.items():
+        if provider['keyword'] in model_name:
+            return name
+    return DEFAULT_PROVIDER
+
 def get_ai_model(model_name=None, api_key=None):
     """
     Factory function to get an AI model instance
@@ -323,13 +400,6 @@ def get_ai_model(model_name=None, api_key=None):
     if not model_name:
         model_name = Config.DEFAULT_AI_MODEL
     
-    # Create the appropriate model
-    if "gpt" in model_name.lower():
-        return OpenAIModel(api_key=api_key, model=model_name)
-    elif "claude" in model_name.lower():
-        return ClaudeModel(api_key=api_key, model=model_name)
-    elif "gemini" in model_name.lower():
-        return GeminiModel(api_key=api_key, model=model_name)
-    else:
-        # Default to OpenAI
-        return OpenAIModel(api_key=api_key, model=model_name) 
\ No newline at end of file
+    # Create the appropriate model (its SDK is imported on first use)
+    model_class = PROVIDERS[get_provider_name(model_name)]['model_class']
+    return model_class(api_key=api_key, model=model_name)
@@ -43,6 +43,23 @@ class ProductContentGenerator:
         
         return get_ai_model(model_name, api_key)
     
+    def _get_brand(self, product):
+        """
+        Get the brand name of a product
+        
+        Brand IDs (from the 'brands' field or the _product_brand meta value)
+        are resolved through the store's shared term cache, not the API.
+        
+        Args:
+            product (dict): Product data
+            
+        Returns:
+            str: Brand name(s), or "Unknown"
+        """
+        client = self.product_manager.client
+        brands = client.terms.product_brands(client, product)
+        return ', '.join(brands) if brands else "Unknown"
+    
     def generate_product_title(self, product, prompt_id=None):
         """
         Generate a title for a product
@@ -105,11 +122,7 @@ class ProductContentGenerator:
             categories.append(category.get('name', ''))
         
         # Get product brand (if available)
-        brand = "Unknown"
-        for item in product.get('meta_data', []):
-            if item.get('key') == '_product_brand':
-                brand = item.get('value', 'Unknown')
-                break
+        brand = self._get_brand(product)
         
         # Get tags
         tags = []
@@ -237,11 +250,7 @@ class ProductContentGenerator:
             categories.append(category.get('name', ''))
         
         # Get product brand (if available)
-        brand = "Unknown"
-        for item in product.get('meta_data', []):
-            if item.get('key') == '_product_brand':
-                brand = item.get('value', 'Unknown')
-                break
+        brand = self._get_brand(product)
         
         # Get tags
         tags = []
@@ -381,11 +390,7 @@ class ProductContentGenerator:
             categories.append(category.get('name', ''))
         
         # Get product brand (if available)
-        brand = "Unknown"
-        for item in product.get('meta_data', []):
-            if item.get('key') == '_product_brand':
-                brand = item.get('value', 'Unknown')
-                break
+        brand = self._get_brand(product)
         
         # Get focus keyword (if available)
         focus_keyword = ""
@@ -470,6 +475,42 @@ class ProductContentGenerator:
         Returns:
             dict: Updated product data
         """
+        update_data = self._ai_content_update(title, description, meta_title, meta_description, focus_keyword)
+        
+        # If we have updates to make
+        if update_data:
+            return self.product_manager.update_product(product_id, update_data)
+        
+        # Otherwise, just get the current product data
+        return self.product_manager.get_product(product_id)
+    
+    def update_products_with_ai_content(self, contents):
+        """
+        Apply AI-generated content to several products in batch requests
+        
+        Args:
+            contents (dict): Dictionary mapping product IDs to dicts with title,
+                description, meta_title, meta_description and/or focus_keyword
+            
+        Returns:
+            list: BatchOperations with each product's result or error
+        """
+        product_updates = {}
+        for product_id, content in contents.items():
+            update_data = self._ai_content_update(
+                content.get('title'),
+                content.get('description'),
+                content.get('meta_title'),
+                content.get('meta_description'),
+                content.get('focus_keyword')
+            )
+            if update_data:
+                product_updates[product_id] = update_data
+        
+        return self.product_manager.update_products(product_updates)
+    
+    def _ai_content_update(self, title=None, description=None, meta_title=None, meta_description=None, focus_keyword=None):
+        """Build the product update for AI-generated content"""
         update_data = {}
         
         # Update title if provided
@@ -495,9 +536,4 @@ class ProductContentGenerator:
         if seo_meta_data:
             update_data['meta_data'] = seo_meta_data
         
-        # If we have updates to make
-        if update_data:
-            return self.product_manager.update_product(product_id, update_data)
-        
-        # Otherwise, just get the current product data
-        return self.product_manager.get_product(product_id) 
\ No newline at end of file
+        return update_data 
\ No newline at end of file
@@ -2,6 +2,7 @@ import os
 import json
 import uuid
 import datetime
+import threading
 from config import Config
 
 class PromptManager:
@@ -15,7 +16,35 @@ class PromptManager:
             prompts_file (str, optional): Path to the prompts JSON file
         """
         self.prompts_file = prompts_file or os.path.join(Config.BASE_DIR, 'data', 'prompts.json')
-        self._ensure_prompts_file()
+        # Parsed prompts cached as ((mtime, size), prompts) until the file changes
+        # (no file I/O here: the file is created and seeded on first access)
+        self._cache = None
+        self._initialized = False
+        # Reentrant: seeding reads and saves prompts through this manager
+        self._init_lock = threading.RLock()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _after_fork_in_child(self):
+        """The lock may have been held at fork time (e.g. by a warm-up thread)"""
+        self._init_lock = threading.RLock()
+    
+    def _ensure_initialized(self):
+        """Create the prompts file and seed the default prompts, once, on first access"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            # Set first: seeding calls back into get_prompts()
+            self._initialized = True
+            try:
+                self._ensure_prompts_file()
+                self.initialize_default_prompts()
+            except Exception:
+                self._initialized = False
+                raise
     
     def _ensure_prompts_file(self):
         """Ensure the prompts file exists with valid structure"""
@@ -27,6 +56,49 @@ class PromptManager:
             with open(self.prompts_file, 'w') as f:
                 json.dump([], f)
     
+    def _load_prompts(self):
+        """
+        Load all prompts from the prompts file
+        
+        The parsed list is cached in memory and re-read only when the file's
+        mtime or size changes (e.g. edited by hand or by another process).
+        
+        Returns:
+            list: List of prompts (shared, do not modify)
+        """
+        self._ensure_initialized()
+        try:
+            stat = os.stat(self.prompts_file)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return []
+        
+        cache = self._cache
+        if cache is not None and cache[0] == stamp:
+            return cache[1]
+        
+        with open(self.prompts_file, 'r') as f:
+            try:
+                prompts = json.load(f)
+            except json.JSONDecodeError:
+                # If file is corrupted, start fresh
+                prompts = []
+        
+        self._cache = (stamp, prompts)
+        return prompts
+    
+    def _save_prompts(self, prompts):
+        """
+        Save all prompts to the prompts file
+        
+        Args:
+            prompts (list): List of prompts
+        """
+        os.makedirs(os.path.dirname(self.prompts_file), exist_ok=True)
+        with open(self.prompts_file, 'w') as f:
+            json.dump(prompts, f, indent=2)
+        self._cache = None
+    
     def get_prompts(self, target_section=None, target_field=None):
         """
         Get prompts, optionally filtered by section and field
@@ -38,12 +110,8 @@ class PromptManager:
         Returns:
             list: List of prompts
         """
-        with open(self.prompts_file, 'r') as f:
-            try:
-                prompts = json.load(f)
-            except json.JSONDecodeError:
-                # If file is corrupted, start fresh
-                prompts = []
+        # Copy the cached prompts so callers can modify them freely
+        prompts = [dict(p) for p in self._load_prompts()]
         
         # Apply filters if provided
         if target_section:
@@ -112,8 +180,7 @@ class PromptManager:
         prompts.append(prompt)
         
         # Save prompts
-        with open(self.prompts_file, 'w') as f:
-            json.dump(prompts, f, indent=2)
+        self._save_prompts(prompts)
         
         return prompt
     
@@ -141,8 +208,7 @@ class PromptManager:
                 prompt['updated_at'] = datetime.datetime.now().isoformat()
                 
                 # Save prompts
-                with open(self.prompts_file, 'w') as f:
-                    json.dump(prompts, f, indent=2)
+                self._save_prompts(prompts)
                 
                 return prompt
         
@@ -166,8 +232,7 @@ class PromptManager:
                 prompts.pop(i)
                 
                 # Save prompts
-                with open(self.prompts_file, 'w') as f:
-                    json.dump(prompts, f, indent=2)
+                self._save_prompts(prompts)
                 
                 return True
         
@@ -233,8 +298,7 @@ class PromptManager:
         all_prompts.insert(0, prompt)
         
         # Save prompts
-        with open(self.prompts_file, 'w') as f:
-            json.dump(all_prompts, f, indent=2)
+        self._save_prompts(all_prompts)
         
         return True
     
@@ -359,7 +359,7 @@ def generate_product_title():
     
     # Get product data
     product_manager = ProductManager()
-    product = product_manager.get_product(product_id)
+    product = product_manager.get_product(product_id, fields='ai_context')
     
     if not product:
         return jsonify({'success': False, 'message': 'Product not found'}), 404
@@ -387,7 +387,7 @@ def generate_product_description():
     
     # Get product data
     product_manager = ProductManager()
-    product = product_manager.get_product(product_id)
+    product = product_manager.get_product(product_id, fields='ai_context')
     
     if not product:
         return jsonify({'success': False, 'message': 'Product not found'}), 404
@@ -419,7 +419,7 @@ def generate_product_seo():
     
     # Get product data
     product_manager = ProductManager()
-    product = product_manager.get_product(product_id)
+    product = product_manager.get_product(product_id, fields='ai_context')
     
     if not product:
         return jsonify({'success': False, 'message': 'Product not found'}), 404
@@ -500,7 +500,7 @@ def generate_all_product_content():
     
     # Get product data
     product_manager = ProductManager()
-    product = product_manager.get_product(product_id)
+    product = product_manager.get_product(product_id, fields='ai_context')
     
     if not product:
         return jsonify({'success': False, 'message': 'Product not found'}), 404
@@ -1,13 +1,67 @@
 from modules.woocommerce.client import WooCommerceClient
+from modules.woocommerce.pool import ClientRegistry, get_client
+from modules.woocommerce.paging import PagedResult
+from modules.woocommerce.batch import BatchWriter, BatchError
+from modules.woocommerce.mirror import CatalogMirror
+from modules.woocommerce.search import ProductSearch
+from modules.woocommerce.typeahead import TypeaheadService
+from modules.woocommerce.category_tree import CategoryTree
+from modules.woocommerce.terms import TermCache
+from modules.woocommerce.webhooks import WebhookReceiver, register_webhooks
+from modules.woocommerce.changes import ChangeFeed
 from modules.woocommerce.products import ProductManager
 from modules.woocommerce.categories import CategoryManager
 from modules.woocommerce.brands import BrandManager
 from modules.woocommerce.media import MediaManager
+from modules.woocommerce.async_client import AsyncWooCommerceClient
+from modules.woocommerce.async_managers import (
+    AsyncProductManager,
+    AsyncCategoryManager,
+    AsyncBrandManager,
+    AsyncMediaManager
+)
+
+def warm_up():
+    """Build the shared WooCommerce client, start the catalog mirror sync, fetch the term lists and fill the term cache (startup warm-up stage)"""
+    from config import Config
+    from modules.woocommerce.categories import category_manager
+    
+    if not Config.WOOCOMMERCE_STORE_URL:
+        return
+    
+    client = category_manager.client
+    if client.mirror is not None:
+        client.mirror.sync_in_background(client)
+    
+    category_manager.get_categories(per_page=100)
+    BrandManager(category_manager.client).get_brands(per_page=100)
+    
+    # Term names used when building AI prompt context
+    for kind in ('categories', 'brands', 'tags'):
+        client.terms.index(client, kind)
 
 __all__ = [
     'WooCommerceClient',
+    'ClientRegistry',
+    'get_client',
+    'PagedResult',
+    'BatchWriter',
+    'BatchError',
+    'CatalogMirror',
+    'ProductSearch',
+    'TypeaheadService',
+    'CategoryTree',
+    'TermCache',
+    'WebhookReceiver',
+    'register_webhooks',
+    'ChangeFeed',
     'ProductManager',
     'CategoryManager',
     'BrandManager',
-    'MediaManager'
+    'MediaManager',
+    'AsyncWooCommerceClient',
+    'AsyncProductManager',
+    'AsyncCategoryManager',
+    'AsyncBrandManager',
+    'AsyncMediaManager'
 ] 
\ No newline at end of file
@@ -0,0 +1,265 @@
+import json
+import asyncio
+from config import Config
+from modules.woocommerce.client import SessionAPI, WooCommerceClient
+from modules.woocommerce.cache import get_store_cache
+from modules.woocommerce.mirror import get_store_mirror
+from modules.woocommerce.typeahead import get_store_typeahead
+from modules.woocommerce.category_tree import get_store_category_tree
+from modules.woocommerce.terms import get_store_terms
+from modules.woocommerce.resilience import RetryPolicy, get_store_breaker
+
+class AsyncResponse:
+    """
+    Fully read aiohttp response with the attributes _check_response uses
+    """
+    
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = body
+    
+    def json(self):
+        """Decode the body as JSON"""
+        return json.loads(self.content)
+
+class AsyncWooCommerceClient:
+    """
+    Asynchronous client for the WooCommerce REST API
+    
+    Same surface and error handling as WooCommerceClient, built on aiohttp.
+    At most `max_concurrency` requests to the store are in flight at once,
+    so independent calls can be gathered without flooding small hosts:
+        
+        async with AsyncWooCommerceClient() as client:
+            product, categories = await asyncio.gather(
+                client.get('products/42'),
+                client.get('products/categories', {'per_page': 100})
+            )
+    """
+    
+    def __init__(self, store_url=None, consumer_key=None, consumer_secret=None, verify_ssl=None, timeout=None, max_concurrency=None):
+        """
+        Initialize the async WooCommerce client
+        
+        Args:
+            store_url (str, optional): WooCommerce store URL
+            consumer_key (str, optional): WooCommerce consumer key
+            consumer_secret (str, optional): WooCommerce consumer secret
+            verify_ssl (bool, optional): Whether to verify SSL certificates
+            timeout (int, optional): Request timeout in seconds
+            max_concurrency (int, optional): Maximum requests in flight to the store
+        """
+        # Use provided values or fall back to configuration
+        self.store_url = store_url or Config.WOOCOMMERCE_STORE_URL
+        self.consumer_key = consumer_key or Config.WOOCOMMERCE_CONSUMER_KEY
+        self.consumer_secret = consumer_secret or Config.WOOCOMMERCE_CONSUMER_SECRET
+        self.verify_ssl = verify_ssl if verify_ssl is not None else Config.WOOCOMMERCE_VERIFY_SSL
+        self.timeout = timeout or Config.WOOCOMMERCE_TIMEOUT
+        self.max_concurrency = max_concurrency or Config.WOOCOMMERCE_ASYNC_CONCURRENCY
+        
+        # Builds URLs, authentication and bodies exactly like the sync client
+        self.api = SessionAPI(
+            url=self.store_url,
+            consumer_key=self.consumer_key,
+            consumer_secret=self.consumer_secret,
+            version="wc/v3",
+            timeout=self.timeout,
+            verify_ssl=self.verify_ssl,
+            query_string_auth=True  # Force authentication via query string for problematic hosting
+        )
+        
+        # Writes invalidate the store's shared response cache and update its mirror, typeahead, category tree and term cache
+        self.cache = get_store_cache(self.store_url)
+        self.mirror = get_store_mirror(self.store_url)
+        self.typeahead = get_store_typeahead(self.store_url)
+        self.category_tree = get_store_category_tree(self.store_url)
+        self.terms = get_store_terms(self.store_url)
+        
+        # Same retry rules and the same per-store circuit as the sync client
+        self.retry = RetryPolicy()
+        self.breaker = get_store_breaker(self.store_url)
+        
+        # Created on first use, inside the running event loop
+        self._session = None
+        self._semaphore = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _get_session(self):
+        """Create the aiohttp session and the per-store semaphore on first use"""
+        if self._session is None:
+            import aiohttp
+            
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ssl=None if self.verify_ssl else False),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+    
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
+    
+    async def request(self, method, endpoint, data=None, params=None, headers=None):
+        """
+        Send a request and read the response
+        
+        Args:
+            method (str): HTTP method
+            endpoint (str): API endpoint (e.g., 'products')
+            data (dict, optional): Data to send
+            params (dict, optional): Query parameters
+            headers (dict, optional): Extra request headers
+        
+        Returns:
+            AsyncResponse: The response
+        """
+        import aiohttp
+        from yarl import URL
+        
+        session = self._get_session()
+        request = self.api.build_request(method, endpoint, data, params, headers)
+        # OAuth URLs are signed as built: stop aiohttp from re-quoting them
+        url = URL(request['url'], encoded=True)
+        auth = request['auth']
+        if auth is not None:
+            auth = aiohttp.BasicAuth(auth.username, auth.password)
+        
+        async with self._semaphore:
+            async with session.request(
+                method,
+                url,
+                params=request['params'],
+                data=request['data'],
+                headers=request['headers'],
+                auth=auth
+            ) as response:
+                body = await response.read()
+                return AsyncResponse(response.status, response.headers, body)
+    
+    async def _send(self, method, endpoint, data=None, params=None):
+        """Send a request, retrying transient failures like WooCommerceClient._send"""
+        import aiohttp
+        
+        attempt = 0
+        self.breaker.before_call()
+        response = error = None
+        try:
+            while True:
+                response = error = None
+                try:
+                    response = await self.request(method, endpoint, data=data, params=params)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    error = e
+                
+                # A timeout already cost the full timeout: don't multiply it
+                if isinstance(error, asyncio.TimeoutError) or not self.retry.should_retry(method, attempt, response, error):
+                    if error is not None:
+                        raise error
+                    return response
+                
+                await asyncio.sleep(self.retry.delay(attempt, response))
+                attempt += 1
+        finally:
+            # One outcome per call, from its last attempt
+            if response is not None or error is not None:
+                self.breaker.record(response, error)
+            else:
+                self.breaker.cancel_probe()
+    
+    async def _call(self, method, endpoint, data=None, params=None):
+        """Send a request, check it and decode the JSON body"""
+        try:
+            response = await self._send(method, endpoint, data=data, params=params)
+            self._check_response(response)
+            result = response.json()
+            if method != "GET":
+                # SQLite writes and index updates take locks: keep them off the event loop
+                await asyncio.to_thread(self._apply_write, method, endpoint, result)
+            return result
+        except Exception as e:
+            self._handle_error(e, endpoint, method, data if data is not None else params)
+            raise
+        finally:
+            if method != "GET" and self.cache is not None:
+                self.cache.invalidate(endpoint)
+    
+    async def get(self, endpoint, params=None):
+        """
+        Make a GET request to the WooCommerce API
+        
+        Args:
+            endpoint (str): API endpoint (e.g., 'products')
+            params (dict, optional): Query parameters
+        
+        Returns:
+            dict or list: Response data
+        """
+        return await self._call("GET", endpoint, params=params)
+    
+    async def post(self, endpoint, data):
+        """
+        Make a POST request to the WooCommerce API
+        
+        Args:
+            endpoint (str): API endpoint (e.g., 'products')
+            data (dict): Data to send
+        
+        Returns:
+            dict: Response data
+        """
+        return await self._call("POST", endpoint, data=data)
+    
+    async def put(self, endpoint, data):
+        """
+        Make a PUT request to the WooCommerce API
+        
+        Args:
+            endpoint (str): API endpoint (e.g., 'products/123')
+            data (dict): Data to send
+        
+        Returns:
+            dict: Response data
+        """
+        return await self._call("PUT", endpoint, data=data)
+    
+    async def delete(self, endpoint, params=None):
+        """
+        Make a DELETE request to the WooCommerce API
+        
+        Args:
+            endpoint (str): API endpoint (e.g., 'products/123')
+            params (dict, optional): Query parameters
+        
+        Returns:
+            dict: Response data
+        """
+        return await self._call("DELETE", endpoint, params=params)
+    
+    async def test_connection(self):
+        """
+        Test the connection to the WooCommerce API
+        
+        Returns:
+            bool: True if connection is successful, False otherwise
+        """
+        try:
+            # Try to fetch a single product to test connection
+            await self.get('products', {'per_page': 1})
+            return True
+        except Exception:
+            return False
+    
+    # Same error and write handling as the sync client
+    _check_response = WooCommerceClient._check_response
+    _handle_error = WooCommerceClient._handle_error
+    _apply_write = WooCommerceClient._apply_write
@@ -0,0 +1,561 @@
+import os
+import base64
+import asyncio
+import mimetypes
+from modules.woocommerce.async_client import AsyncWooCommerceClient
+from modules.woocommerce.products import ProductManager
+from modules.woocommerce.batch import AsyncBatchWriter
+from config import Config
+
+class AsyncMediaManager:
+    """
+    Async counterpart of MediaManager
+    """
+    
+    def __init__(self, wc_client=None):
+        """
+        Initialize the media manager
+        
+        Args:
+            wc_client (AsyncWooCommerceClient, optional): Async WooCommerce client instance
+        """
+        self.client = wc_client or AsyncWooCommerceClient()
+    
+    def _read_image(self, image_path):
+        """Read and base64-encode an image file (blocking, run in a thread)"""
+        # Check if file exists
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        
+        mime_type, _ = mimetypes.guess_type(image_path)
+        if not mime_type or not mime_type.startswith('image/'):
+            raise ValueError(f"File is not a valid image: {image_path}")
+        
+        with open(image_path, 'rb') as img_file:
+            return base64.b64encode(img_file.read()).decode('utf-8')
+    
+    async def upload_image(self, image_path, alt_text=None, title=None, caption=None, description=None):
+        """
+        Upload an image to the WooCommerce media library
+        
+        Args:
+            image_path (str): Path to the image file
+            alt_text (str, optional): Alt text for the image
+            title (str, optional): Title for the image
+            caption (str, optional): Caption for the image
+            description (str, optional): Description for the image
+        
+        Returns:
+            dict: Media item data
+        """
+        base64_image = await asyncio.to_thread(self._read_image, image_path)
+        
+        # Prepare media data
+        media_data = {
+            'file': base64_image,
+            'name': os.path.basename(image_path),
+        }
+        
+        # Add optional fields if provided
+        if alt_text:
+            media_data['alt_text'] = alt_text
+        
+        if title:
+            media_data['title'] = title
+        
+        if caption:
+            media_data['caption'] = caption
+        
+        if description:
+            media_data['description'] = description
+        
+        return await self.client.post('media', data=media_data)
+    
+    async def get_media(self, media_id):
+        """
+        Get a media item by ID
+        
+        Args:
+            media_id (int): Media ID
+        
+        Returns:
+            dict: Media item data
+        """
+        return await self.client.get(f'media/{media_id}')
+    
+    async def delete_media(self, media_id, force=True):
+        """
+        Delete a media item
+        
+        Args:
+            media_id (int): Media ID
+            force (bool, optional): Whether to force deletion
+        
+        Returns:
+            dict: Response data
+        """
+        return await self.client.delete(f'media/{media_id}', params={'force': force})
+
+class AsyncProductManager:
+    """
+    Async counterpart of ProductManager
+    """
+    
+    def __init__(self, wc_client=None):
+        """
+        Initialize the product manager
+        
+        Args:
+            wc_client (AsyncWooCommerceClient, optional): Async WooCommerce client instance
+        """
+        self.client = wc_client or AsyncWooCommerceClient()
+        self.media_manager = AsyncMediaManager(self.client)
+    
+    async def get_products(self, page=1, per_page=None, **filters):
+        """
+        Get a list of products with optional filtering
+        
+        Args:
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            **filters: Additional filters (category, tag, search, etc.)
+        
+        Returns:
+            list: List of products
+        """
+        if per_page is None:
+            per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
+        
+        params = {
+            'page': page,
+            'per_page': per_page,
+            **filters
+        }
+        
+        return await self.client.get('products', params=params)
+    
+    async def get_product(self, product_id):
+        """
+        Get a single product by ID
+        
+        Args:
+            product_id (int): Product ID
+        
+        Returns:
+            dict: Product data
+        """
+        return await self.client.get(f'products/{product_id}')
+    
+    async def get_many(self, product_ids):
+        """
+        Get several products concurrently
+        
+        Args:
+            product_ids (list): Product IDs
+        
+        Returns:
+            list: Product data, in the order of product_ids
+        """
+        return await asyncio.gather(*(self.get_product(product_id) for product_id in product_ids))
+    
+    async def create_product(self, product_data):
+        """
+        Create a new product
+        
+        Args:
+            product_data (dict): Product data
+        
+        Returns:
+            dict: Created product data
+        """
+        return await self.client.post('products', data=product_data)
+    
+    async def update_product(self, product_id, product_data):
+        """
+        Update an existing product
+        
+        Args:
+            product_id (int): Product ID
+            product_data (dict): Product data to update
+        
+        Returns:
+            dict: Updated product data
+        """
+        return await self.client.put(f'products/{product_id}', data=product_data)
+    
+    async def delete_product(self, product_id, force=False):
+        """
+        Delete a product
+        
+        Args:
+            product_id (int): Product ID
+            force (bool, optional): Whether to force deletion
+        
+        Returns:
+            dict: Response data
+        """
+        return await self.client.delete(f'products/{product_id}', params={'force': force})
+    
+    async def upload_product_image(self, product_id, image_path, alt_text=None, title=None, caption=None, description=None):
+        """
+        Upload a main image for a product
+        
+        Args:
+            product_id (int): Product ID
+            image_path (str): Path to image file
+            alt_text (str, optional): Alt text for the image
+            title (str, optional): Title for the image
+            caption (str, optional): Caption for the image
+            description (str, optional): Description for the image
+        
+        Returns:
+            dict: Updated product data
+        """
+        media = await self.media_manager.upload_image(
+            image_path,
+            alt_text=alt_text,
+            title=title,
+            caption=caption,
+            description=description
+        )
+        
+        return await self.update_product(product_id, {
+            'images': [{'id': media['id']}]
+        })
+    
+    async def upload_gallery_images(self, product_id, image_paths, alt_texts=None, titles=None, captions=None, descriptions=None):
+        """
+        Upload multiple gallery images for a product
+        
+        The product fetch and all uploads run concurrently; the gallery keeps
+        the order of image_paths.
+        
+        Args:
+            product_id (int): Product ID
+            image_paths (list): List of paths to image files
+            alt_texts (list, optional): List of alt texts for the images
+            titles (list, optional): List of titles for the images
+            captions (list, optional): List of captions for the images
+            descriptions (list, optional): List of descriptions for the images
+        
+        Returns:
+            dict: Updated product data
+        """
+        def nth(values, i):
+            return values[i] if values and i < len(values) else None
+        
+        uploads = [
+            self.media_manager.upload_image(
+                image_path,
+                alt_text=nth(alt_texts, i),
+                title=nth(titles, i),
+                caption=nth(captions, i),
+                description=nth(descriptions, i)
+            )
+            for i, image_path in enumerate(image_paths)
+        ]
+        product, *media_items = await asyncio.gather(self.get_product(product_id), *uploads)
+        
+        # Keep the existing main image
+        existing_images = []
+        if product.get('images') and len(product['images']) > 0:
+            existing_images = [{'id': product['images'][0]['id']}]
+        
+        gallery_images = [{'id': media['id']} for media in media_items]
+        
+        return await self.update_product(product_id, {
+            'images': existing_images + gallery_images
+        })
+    
+    async def update_product_seo(self, product_id, focus_keyword=None, meta_title=None, meta_description=None):
+        """
+        Update SEO fields for a product (using RankMath format)
+        
+        Args:
+            product_id (int): Product ID
+            focus_keyword (str, optional): Focus keyword
+            meta_title (str, optional): Meta title
+            meta_description (str, optional): Meta description
+        
+        Returns:
+            dict: Updated product data
+        """
+        meta_data = ProductManager._seo_meta_data(focus_keyword, meta_title, meta_description)
+        if meta_data:
+            return await self.update_product(product_id, {'meta_data': meta_data})
+        
+        return await self.get_product(product_id)
+
+class AsyncCategoryManager:
+    """
+    Async counterpart of CategoryManager
+    """
+    
+    def __init__(self, wc_client=None):
+        """
+        Initialize the category manager
+        
+        Args:
+            wc_client (AsyncWooCommerceClient, optional): Async WooCommerce client instance
+        """
+        self.client = wc_client or AsyncWooCommerceClient()
+        self.media_manager = AsyncMediaManager(self.client)
+    
+    async def get_categories(self, page=1, per_page=None, **filters):
+        """
+        Get a list of product categories with optional filtering
+        
+        Args:
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            **filters: Additional filters (parent, order, etc.)
+        
+        Returns:
+            list: List of categories
+        """
+        if per_page is None:
+            per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
+        
+        params = {
+            'page': page,
+            'per_page': per_page,
+            **filters
+        }
+        
+        return await self.client.get('products/categories', params=params)
+    
+    async def get_category(self, category_id):
+        """
+        Get a single product category by ID
+        
+        Args:
+            category_id (int): Category ID
+        
+        Returns:
+            dict: Category data
+        """
+        return await self.client.get(f'products/categories/{category_id}')
+    
+    async def create_category(self, category_data):
+        """
+        Create a new product category
+        
+        Args:
+            category_data (dict): Category data
+        
+        Returns:
+            dict: Created category data
+        """
+        return await self.client.post('products/categories', data=category_data)
+    
+    async def update_category(self, category_id, category_data):
+        """
+        Update an existing product category
+        
+        Args:
+            category_id (int): Category ID
+            category_data (dict): Category data to update
+        
+        Returns:
+            dict: Updated category data
+        """
+        return await self.client.put(f'products/categories/{category_id}', data=category_data)
+    
+    async def delete_category(self, category_id, force=False):
+        """
+        Delete a product category
+        
+        Args:
+            category_id (int): Category ID
+            force (bool, optional): Whether to force deletion
+        
+        Returns:
+            dict: Response data
+        """
+        return await self.client.delete(f'products/categories/{category_id}', params={'force': force})
+    
+    async def update_category_seo(self, category_id, focus_keyword=None, meta_title=None, meta_description=None):
+        """
+        Update SEO fields for a category (using RankMath format)
+        
+        Args:
+            category_id (int): Category ID
+            focus_keyword (str, optional): Focus keyword
+            meta_title (str, optional): Meta title
+            meta_description (str, optional): Meta description
+        
+        Returns:
+            dict: Updated category data
+        """
+        meta_data = ProductManager._seo_meta_data(focus_keyword, meta_title, meta_description)
+        if meta_data:
+            return await self.update_category(category_id, {'meta_data': meta_data})
+        
+        return await self.get_category(category_id)
+    
+    async def reorder_categories(self, category_orders):
+        """
+        Update the order of categories
+        
+        Args:
+            category_orders (dict): Dictionary mapping category IDs to menu_order values
+        
+        Returns:
+            list: List of updated categories
+        
+        Raises:
+            BatchError: If some categories could not be updated
+        """
+        # One batch request per 100 categories instead of one PUT each
+        writer = AsyncBatchWriter(self.client, 'products/categories')
+        for category_id, menu_order in category_orders.items():
+            writer.update(category_id, {'menu_order': menu_order})
+        
+        return [op.result for op in await writer.flush(raise_on_error=True)]
+
+class AsyncBrandManager:
+    """
+    Async counterpart of BrandManager
+    """
+    
+    def __init__(self, wc_client=None, taxonomy='product_brand'):
+        """
+        Initialize the brand manager
+        
+        Args:
+            wc_client (AsyncWooCommerceClient, optional): Async WooCommerce client instance
+            taxonomy (str, optional): Brand taxonomy name (default: 'product_brand')
+        """
+        self.client = wc_client or AsyncWooCommerceClient()
+        self.media_manager = AsyncMediaManager(self.client)
+        self.taxonomy = taxonomy
+    
+    async def get_brands(self, page=1, per_page=None, **filters):
+        """
+        Get a list of product brands with optional filtering
+        
+        Args:
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            **filters: Additional filters (parent, order, etc.)
+        
+        Returns:
+            list: List of brands
+        """
+        if per_page is None:
+            per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
+        
+        params = {
+            'page': page,
+            'per_page': per_page,
+            **filters
+        }
+        
+        return await self.client.get(f'products/{self.taxonomy}', params=params)
+    
+    async def get_brand(self, brand_id):
+        """
+        Get a single product brand by ID
+        
+        Args:
+            brand_id (int): Brand ID
+        
+        Returns:
+            dict: Brand data
+        """
+        return await self.client.get(f'products/{self.taxonomy}/{brand_id}')
+    
+    async def create_brand(self, brand_data):
+        """
+        Create a new product brand
+        
+        Args:
+            brand_data (dict): Brand data
+        
+        Returns:
+            dict: Created brand data
+        """
+        return await self.client.post(f'products/{self.taxonomy}', data=brand_data)
+    
+    async def update_brand(self, brand_id, brand_data):
+        """
+        Update an existing product brand
+        
+        Args:
+            brand_id (int): Brand ID
+            brand_data (dict): Brand data to update
+        
+        Returns:
+            dict: Updated brand data
+        """
+        return await self.client.put(f'products/{self.taxonomy}/{brand_id}', data=brand_data)
+    
+    async def delete_brand(self, brand_id, force=False):
+        """
+        Delete a product brand
+        
+        Args:
+            brand_id (int): Brand ID
+            force (bool, optional): Whether to force deletion
+        
+        Returns:
+            dict: Response data
+        """
+        return await self.client.delete(f'products/{self.taxonomy}/{brand_id}', params={'force': force})
+    
+    async def update_brand_seo(self, brand_id, focus_keyword=None, meta_title=None, meta_description=None):
+        """
+        Update SEO fields for a brand (using RankMath format)
+        
+        Args:
+            brand_id (int): Brand ID
+            focus_keyword (str, optional): Focus keyword
+            meta_title (str, optional): Meta title
+            meta_description (str, optional): Meta description
+        
+        Returns:
+            dict: Updated brand data
+        """
+        meta_data = ProductManager._seo_meta_data(focus_keyword, meta_title, meta_description)
+        if meta_data:
+            return await self.update_brand(brand_id, {'meta_data': meta_data})
+        
+        return await self.get_brand(brand_id)
+    
+    async def reorder_brands(self, brand_orders):
+        """
+        Update the order of brands
+        
+        Args:
+            brand_orders (dict): Dictionary mapping brand IDs to menu_order values
+        
+        Returns:
+            list: List of updated brands
+        
+        Raises:
+            BatchError: If some brands could not be updated
+        """
+        # One batch request per 100 brands instead of one PUT each
+        writer = AsyncBatchWriter(self.client, f'products/{self.taxonomy}')
+        for brand_id, menu_order in brand_orders.items():
+            writer.update(brand_id, {'menu_order': menu_order})
+        
+        return [op.result for op in await writer.flush(raise_on_error=True)]
+    
+    async def get_brand_products(self, brand_id, page=1, per_page=None):
+        """
+        Get products associated with a specific brand
+        
+        Args:
+            brand_id (int): Brand ID
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+        
+        Returns:
+            list: List of products
+        """
+        return await AsyncProductManager(self.client).get_products(
+            page=page,
+            per_page=per_page,
+            **{self.taxonomy: brand_id}
+        )
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from modules.woocommerce.resilience import bulk_requests
+
+# WooCommerce accepts at most 100 create/update/delete operations per batch request
+BATCH_LIMIT = 100
+
+class BatchOperation:
+    """
+    One create, update or delete queued on a BatchWriter
+    
+    After flush() either `result` (the resource returned by WooCommerce)
+    or `error` (a dict with 'code' and 'message') is set.
+    """
+    
+    def __init__(self, action, item_id=None, data=None):
+        self.action = action
+        self.item_id = item_id
+        self.data = data
+        self.result = None
+        self.error = None
+    
+    @property
+    def ok(self):
+        """True if the operation succeeded"""
+        return self.error is None and self.result is not None
+    
+    def payload(self):
+        """The operation's entry in a batch request"""
+        if self.action == 'delete':
+            return self.item_id
+        if self.action == 'update':
+            return {'id': self.item_id, **self.data}
+        return self.data
+    
+    def __repr__(self):
+        return f"<BatchOperation {self.action} {self.item_id or ''} ok={self.ok}>"
+
+class BatchError(Exception):
+    """
+    Raised when some operations of a batch failed
+    """
+    
+    def __init__(self, operations):
+        """
+        Initialize the error
+        
+        Args:
+            operations (list): Every operation of the batch (failed and succeeded)
+        """
+        self.operations = operations
+        self.failed = [op for op in operations if not op.ok]
+        details = '; '.join(
+            f"{op.action} {op.item_id or ''}: {(op.error or {}).get('message', 'no result')}".strip()
+            for op in self.failed[:5]
+        )
+        super().__init__(f"{len(self.failed)} of {len(operations)} batch operations failed: {details}")
+
+class BatchWriter:
+    """
+    Collects writes for one collection and sends them through its /batch endpoint
+    
+    Operations are sent in chunks of at most BATCH_LIMIT, with chunks
+    posted concurrently as bulk requests (within the store's adaptive
+    concurrency limit, leaving its reserved slots to interactive calls).
+    Each operation gets its own result or error back, so one bad item
+    doesn't hide the others:
+        
+        writer = BatchWriter(client, 'products/categories')
+        for category_id, order in orders.items():
+            writer.update(category_id, {'menu_order': order})
+        operations = writer.flush()
+    """
+    
+    def __init__(self, client, endpoint, chunk_size=BATCH_LIMIT, max_workers=None):
+        """
+        Initialize the batch writer
+        
+        Args:
+            client (WooCommerceClient): WooCommerce client
+            endpoint (str): Collection endpoint (e.g. 'products')
+            chunk_size (int, optional): Operations per request (at most BATCH_LIMIT)
+            max_workers (int, optional): Chunks sent concurrently
+        """
+        self.client = client
+        self.endpoint = endpoint.strip('/')
+        self.chunk_size = min(chunk_size, BATCH_LIMIT)
+        self.max_workers = max_workers or Config.WOOCOMMERCE_BATCH_WORKERS
+        self.operations = []
+    
+    def create(self, data):
+        """Queue a create; returns its BatchOperation"""
+        return self._add(BatchOperation('create', data=data))
+    
+    def update(self, item_id, data):
+        """Queue an update; returns its BatchOperation"""
+        return self._add(BatchOperation('update', item_id=item_id, data=data))
+    
+    def delete(self, item_id):
+        """Queue a (permanent) delete; returns its BatchOperation"""
+        return self._add(BatchOperation('delete', item_id=item_id))
+    
+    def _add(self, operation):
+        self.operations.append(operation)
+        return operation
+    
+    def flush(self, raise_on_error=False):
+        """
+        Send every queued operation
+        
+        Args:
+            raise_on_error (bool, optional): Raise BatchError if any operation failed
+        
+        Returns:
+            list: The BatchOperations, in the order they were queued
+        
+        Raises:
+            BatchError: If raise_on_error is set and an operation failed
+        """
+        operations, chunks = self._take_chunks()
+        
+        if len(chunks) == 1:
+            self._send(chunks[0])
+        elif chunks:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks)), thread_name_prefix='wc-batch') as executor:
+                list(executor.map(self._send, chunks))
+        
+        return self._finish(operations, raise_on_error)
+    
+    def _take_chunks(self):
+        """Dequeue the operations and split them into request-sized chunks"""
+        operations, self.operations = self.operations, []
+        return operations, [operations[i:i + self.chunk_size] for i in range(0, len(operations), self.chunk_size)]
+    
+    def _finish(self, operations, raise_on_error):
+        """Return the operations, or raise BatchError if asked to and one failed"""
+        if raise_on_error and any(not op.ok for op in operations):
+            raise BatchError(operations)
+        return operations
+    
+    def _body(self, chunk):
+        """Batch request body of a chunk"""
+        body = {}
+        for op in chunk:
+            body.setdefault(op.action, []).append(op.payload())
+        return body
+    
+    def _send(self, chunk):
+        """Post one chunk and map the response back onto its operations"""
+        try:
+            with bulk_requests():
+                response = self.client.post(f'{self.endpoint}/batch', data=self._body(chunk))
+        except Exception as e:
+            self._fail(chunk, e)
+            return
+        self._map(chunk, response)
+    
+    def _fail(self, chunk, error):
+        """Mark every operation of a chunk failed (network, auth, server error)"""
+        for op in chunk:
+            op.error = {'code': 'batch_request_failed', 'message': str(error)}
+    
+    def _map(self, chunk, response):
+        """Map a batch response back onto the chunk's operations"""
+        # WooCommerce answers each list in request order
+        for action in ('create', 'update', 'delete'):
+            queued = [op for op in chunk if op.action == action]
+            returned = response.get(action) or []
+            for op, item in zip(queued, returned):
+                if isinstance(item, dict) and item.get('error'):
+                    op.error = item['error']
+                    logging.warning(f"WooCommerce batch {action} failed for {self.endpoint} {op.item_id}: {op.error.get('message')}")
+                else:
+                    op.result = item
+            for op in queued[len(returned):]:
+                op.error = {'code': 'missing_result', 'message': 'No result returned for this operation'}
+
+class AsyncBatchWriter(BatchWriter):
+    """
+    BatchWriter for AsyncWooCommerceClient: chunks are posted as concurrent
+    tasks (at most max_workers at a time) instead of on a thread pool
+        
+        writer = AsyncBatchWriter(client, 'products/categories')
+        for category_id, order in orders.items():
+            writer.update(category_id, {'menu_order': order})
+        operations = await writer.flush()
+    """
+    
+    async def flush(self, raise_on_error=False):
+        """
+        Send every queued operation
+        
+        Args:
+            raise_on_error (bool, optional): Raise BatchError if any operation failed
+        
+        Returns:
+            list: The BatchOperations, in the order they were queued
+        
+        Raises:
+            BatchError: If raise_on_error is set and an operation failed
+        """
+        operations, chunks = self._take_chunks()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def send(chunk):
+            async with semaphore:
+                await self._send(chunk)
+        
+        await asyncio.gather(*(send(chunk) for chunk in chunks))
+        return self._finish(operations, raise_on_error)
+    
+    async def _send(self, chunk):
+        """Post one chunk and map the response back onto its operations"""
+        try:
+            response = await self.client.post(f'{self.endpoint}/batch', data=self._body(chunk))
+        except Exception as e:
+            self._fail(chunk, e)
+            return
+        self._map(chunk, response)
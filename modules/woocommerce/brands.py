@@ -1,8 +1,13 @@
-from modules.woocommerce.client import WooCommerceClient
+from modules.woocommerce.pool import PooledClientMixin
 from modules.woocommerce.media import MediaManager
+from modules.woocommerce.paging import iter_pages
+from modules.woocommerce.fields import with_fields
+from modules.woocommerce.batch import BatchWriter
+from modules.woocommerce.mirror import mirror_page, mirror_item
+from modules.woocommerce.reorder import plan_reorder
 from config import Config
 
-class BrandManager:
+class BrandManager(PooledClientMixin):
     """
     Manager for WooCommerce product brand operations
     (Works with Product Brands plugin or custom taxonomy)
@@ -16,17 +21,22 @@ class BrandManager:
             wc_client (WooCommerceClient, optional): WooCommerce client instance
             taxonomy (str, optional): Brand taxonomy name (default: 'product_brand')
         """
-        self.client = wc_client or WooCommerceClient()
-        self.media_manager = MediaManager(self.client)
+        self._client = wc_client
+        self.media_manager = MediaManager(wc_client)
         self.taxonomy = taxonomy
+        self._product_manager = None
+        
+        # The catalog mirror only syncs the default brand taxonomy
+        self._mirrored = taxonomy == 'product_brand'
     
-    def get_brands(self, page=1, per_page=None, **filters):
+    def get_brands(self, page=1, per_page=None, fields=None, **filters):
         """
         Get a list of product brands with optional filtering
         
         Args:
             page (int, optional): Page number
             per_page (int, optional): Items per page
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
             **filters: Additional filters (parent, order, etc.)
             
         Returns:
@@ -36,6 +46,11 @@ class BrandManager:
         if per_page is None:
             per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
         
+        # Serve from the catalog mirror when it is fresh
+        mirrored = mirror_page(self.client, 'brands', page, per_page, fields, filters) if self._mirrored else None
+        if mirrored is not None:
+            return mirrored.items
+        
         # Build query parameters
         params = {
             'page': page,
@@ -45,7 +60,57 @@ class BrandManager:
         
         # Make the API request
         endpoint = f'products/{self.taxonomy}'
-        return self.client.get(endpoint, params=params)
+        return self.client.get(endpoint, params=with_fields(params, 'terms', fields))
+    
+    def get_brands_page(self, page=1, per_page=None, fields=None, **filters):
+        """
+        Get a page of product brands together with the total counts
+        
+        Args:
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
+            **filters: Additional filters (parent, order, etc.)
+            
+        Returns:
+            PagedResult: Brands plus total and total_pages
+        """
+        if self._mirrored:
+            mirrored = mirror_page(self.client, 'brands', page, per_page or Config.WOOCOMMERCE_ITEMS_PER_PAGE, fields, filters)
+            if mirrored is not None:
+                return mirrored
+        
+        return self.client.get_page(f'products/{self.taxonomy}', page=page, per_page=per_page, params=with_fields(filters, 'terms', fields))
+    
+    def iter_all(self, per_page=100, max_workers=None, fields=None, **filters):
+        """
+        Iterate over every brand in the store
+        
+        Read from the catalog mirror when it is fresh; otherwise pages are
+        fetched concurrently and bypass the response cache, and brands are
+        yielded as their page arrives, so the order across pages is not
+        guaranteed.
+        
+        Args:
+            per_page (int, optional): Page size (WooCommerce allows up to 100)
+            max_workers (int, optional): Pages fetched concurrently
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
+            **filters: Additional filters (parent, order, etc.)
+            
+        Yields:
+            dict: Brand data
+        """
+        if self._mirrored:
+            mirrored = mirror_page(self.client, 'brands', 1, None, fields, filters)
+            if mirrored is not None:
+                return iter(mirrored.items)
+        
+        params = with_fields(filters, 'terms', fields)
+        
+        def fetch_page(page, size):
+            return self.client.get_page(f'products/{self.taxonomy}', page=page, per_page=size, params=params, use_cache=False)
+        
+        return iter_pages(fetch_page, per_page=per_page, max_workers=max_workers)
     
     def get_brand(self, brand_id):
         """
@@ -57,6 +122,11 @@ class BrandManager:
         Returns:
             dict: Brand data
         """
+        if self._mirrored:
+            mirrored = mirror_item(self.client, 'brands', brand_id)
+            if mirrored is not None:
+                return mirrored
+        
         endpoint = f'products/{self.taxonomy}/{brand_id}'
         return self.client.get(endpoint)
     
@@ -164,15 +234,43 @@ class BrandManager:
             
         Returns:
             list: List of updated brands
+            
+        Raises:
+            BatchError: If some brands could not be updated
         """
-        updated_brands = []
-        
-        # Update each brand
+        # One batch request per 100 brands instead of one PUT each
+        writer = BatchWriter(self.client, f'products/{self.taxonomy}')
         for brand_id, menu_order in brand_orders.items():
-            updated_brand = self.update_brand(brand_id, {'menu_order': menu_order})
-            updated_brands.append(updated_brand)
+            writer.update(brand_id, {'menu_order': menu_order})
+        
+        return [op.result for op in writer.flush(raise_on_error=True)]
+    
+    def apply_brand_order(self, ordered_ids, current_orders=None):
+        """
+        Put brands in the given order with as few menu_order writes as possible
+        
+        Only brands whose position actually changed are written (see
+        modules.woocommerce.reorder), so moving one brand in a long list
+        usually updates just that brand.
+        
+        Args:
+            ordered_ids (list): Brand IDs in the desired order
+            current_orders (dict, optional): Brand ID -> current menu_order
+                (fetched from the store if not given)
+            
+        Returns:
+            dict: Brand ID -> new menu_order for the brands that were updated
+        """
+        if current_orders is None:
+            current_orders = {
+                term['id']: term.get('menu_order', 0)
+                for term in self.iter_all(fields='id,menu_order')
+            }
         
-        return updated_brands
+        changes = plan_reorder(current_orders, ordered_ids)
+        if changes:
+            self.reorder_brands(changes)
+        return changes
     
     def get_brand_products(self, brand_id, page=1, per_page=None):
         """
@@ -197,7 +295,8 @@ class BrandManager:
             self.taxonomy: brand_id
         }
         
-        # Get products with this brand
-        from modules.woocommerce.products import ProductManager
-        product_manager = ProductManager(self.client)
-        return product_manager.get_products(**params) 
\ No newline at end of file
+        # Get products with this brand (the product manager is reused across calls)
+        if self._product_manager is None:
+            from modules.woocommerce.products import ProductManager
+            self._product_manager = ProductManager(self._client)
+        return self._product_manager.get_products(**params) 
\ No newline at end of file
@@ -0,0 +1,397 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+from modules.woocommerce.fields import project
+from modules.woocommerce.changes import poll_changes
+from config import Config
+
+# Response headers kept with each cached entry
+CACHED_HEADERS = ('X-WP-Total', 'X-WP-TotalPages', 'ETag', 'Last-Modified')
+
+def normalize_endpoint(endpoint):
+    """Strip slashes so 'products/1' and '/products/1/' share cache entries"""
+    return endpoint.strip('/')
+
+def make_cache_key(endpoint, params=None):
+    """
+    Build the cache key of a GET request
+    
+    Args:
+        endpoint (str): API endpoint
+        params (dict, optional): Query parameters
+    
+    Returns:
+        str: Endpoint plus the sorted, encoded query string
+    """
+    endpoint = normalize_endpoint(endpoint)
+    if not params:
+        return endpoint
+    items = sorted((str(key), ','.join(map(str, value)) if isinstance(value, (list, tuple)) else str(value))
+                   for key, value in params.items() if value is not None)
+    return f"{endpoint}?{urlencode(items)}"
+
+def affected_endpoints(endpoint):
+    """
+    Work out which cached endpoints a write to `endpoint` makes stale
+    
+    Args:
+        endpoint (str): Endpoint of a POST, PUT or DELETE
+    
+    Returns:
+        tuple: (exact, prefixes) - endpoints dropped as-is, and endpoints
+            dropped together with everything below them
+    """
+    parts = normalize_endpoint(endpoint).split('/')
+    
+    # products/batch changes any product: drop the whole collection
+    if parts[-1] == 'batch':
+        return set(), {'/'.join(parts[:-1])}
+    
+    exact = set()
+    # Lists of the collection (e.g. 'products' for 'products/12'), and the
+    # parent items of nested resources (e.g. 'products/12' for a variation)
+    for i in range(1, len(parts)):
+        exact.add('/'.join(parts[:i]))
+    
+    return exact, {'/'.join(parts)}
+
+class DiskTier:
+    """
+    SQLite store of cached responses that survives restarts
+    """
+    
+    def __init__(self, path, max_age=86400):
+        """
+        Initialize the disk tier
+        
+        Args:
+            path (str): SQLite file path
+            max_age (float, optional): Seconds after which entries are purged
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._open()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "store TEXT, key TEXT, endpoint TEXT, body BLOB, headers TEXT, stored_at REAL, "
+            "PRIMARY KEY (store, key))"
+        )
+        self._db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - max_age,))
+        self._db.commit()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _open(self):
+        """Open the SQLite connection (shared by threads, guarded by the lock)"""
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+    
+    def _after_fork_in_child(self):
+        """SQLite connections must not cross a fork: reopen in the child"""
+        self._lock = threading.Lock()
+        self._open()
+    
+    def get(self, store, key):
+        """Return (body, headers, stored_at) or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, headers, stored_at FROM responses WHERE store = ? AND key = ?",
+                (store, key)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+    
+    def put(self, store, key, endpoint, body, headers, stored_at):
+        """Store a response"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (store, key, endpoint, body, json.dumps(headers), stored_at)
+            )
+            self._db.commit()
+    
+    def delete(self, store, exact, prefixes):
+        """Delete the entries of the given endpoints"""
+        clauses = []
+        args = [store]
+        for endpoint in exact:
+            clauses.append("endpoint = ?")
+            args.append(endpoint)
+        for endpoint in prefixes:
+            clauses.append("endpoint = ? OR endpoint LIKE ? ESCAPE '!'")
+            escaped = endpoint.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+            args.extend([endpoint, escaped + '/%'])
+        if not clauses:
+            return
+        
+        with self._lock:
+            self._db.execute(f"DELETE FROM responses WHERE store = ? AND ({' OR '.join(clauses)})", args)
+            self._db.commit()
+    
+    def clear(self, store):
+        """Delete every entry of a store"""
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE store = ?", (store,))
+            self._db.commit()
+
+class ResponseCache:
+    """
+    Two-tier cache of WooCommerce GET responses for one store
+    
+    Entries live in an in-memory LRU for `ttl` seconds; with a disk tier
+    they are also written to SQLite so they survive restarts. Once an entry
+    is stale but carries an ETag or Last-Modified header, the client
+    revalidates it with a conditional request instead of refetching.
+    Requests with a `_fields` projection have entries of their own, and are
+    also answered from a fresh entry of the same request without `_fields`.
+    
+    Writes through the client invalidate exactly the endpoints they touch
+    (the item, its sub-resources and the lists of its collection). Other
+    processes' memory tiers learn about webhook deliveries through the
+    change feed (see modules.woocommerce.changes), checked on lookup; they
+    are not notified of the client's own writes, so they may serve such a
+    changed resource for up to `ttl` seconds.
+    """
+    
+    def __init__(self, store_url, ttl=None, max_entries=None, disk=None):
+        """
+        Initialize the response cache
+        
+        Args:
+            store_url (str): Store URL (namespaces the disk tier)
+            ttl (float, optional): Seconds an entry is served without revalidation
+            max_entries (int, optional): Maximum entries in memory
+            disk (DiskTier, optional): Persistent tier
+        """
+        self.store_url = store_url
+        self.ttl = ttl if ttl is not None else Config.WOOCOMMERCE_CACHE_TTL
+        self.max_entries = max_entries or Config.WOOCOMMERCE_CACHE_MAX_ENTRIES
+        self.disk = disk
+        self._entries = OrderedDict()
+        self._by_endpoint = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; responses fetched before it aren't stored
+        self.generation = 0
+        self.counters = {'hits': 0, 'disk_hits': 0, 'projected_hits': 0, 'misses': 0, 'revalidated': 0, 'invalidated': 0}
+    
+    def lookup(self, key):
+        """
+        Look up a cached response
+        
+        Args:
+            key (str): Cache key (see make_cache_key)
+        
+        Returns:
+            tuple: (entry, fresh) - entry is None on a miss; a stale entry
+                can still be revalidated with conditional_headers()
+        """
+        entry, fresh, tier = self._find(key)
+        with self._lock:
+            self.counters[tier if fresh else 'misses'] += 1
+        return entry, fresh
+    
+    def lookup_projected(self, full_key, fields):
+        """
+        Answer a `_fields` request from a fresh unprojected entry
+        
+        Args:
+            full_key (str): Cache key of the same request without `_fields`
+            fields (str): Comma-separated field names
+        
+        Returns:
+            tuple: (projected data, headers), or None if there is no fresh entry
+        """
+        entry, fresh, _ = self._find(full_key)
+        if not fresh:
+            return None
+        with self._lock:
+            self.counters['projected_hits'] += 1
+        return project(json.loads(entry['body']), fields), entry['headers']
+    
+    def _find(self, key):
+        """Find an entry in memory, then on disk (without counting)"""
+        # Drop memory entries other workers' webhook deliveries made stale
+        poll_changes()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry['stored_at'] + self.ttl > now:
+                    return entry, True, 'hits'
+        
+        if entry is None and self.disk is not None:
+            row = self.disk.get(self.store_url, key)
+            if row is not None:
+                body, headers, stored_at = row
+                entry = self._remember(key, key.split('?', 1)[0], body, headers, stored_at)
+                if stored_at + self.ttl > now:
+                    return entry, True, 'disk_hits'
+        
+        return entry, False, None
+    
+    def conditional_headers(self, entry):
+        """
+        Build revalidation headers for a stale entry
+        
+        Args:
+            entry (dict): Entry returned by lookup()
+        
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers (may be empty)
+        """
+        headers = {}
+        if entry is None:
+            return headers
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+    
+    def revalidated(self, key, entry):
+        """Mark a stale entry as fresh again after a 304 Not Modified"""
+        entry['stored_at'] = time.time()
+        with self._lock:
+            self.counters['revalidated'] += 1
+        if self.disk is not None:
+            self.disk.put(self.store_url, key, entry['endpoint'], entry['body'], entry['headers'], entry['stored_at'])
+    
+    def store(self, key, endpoint, body, headers, generation=None):
+        """
+        Cache a response
+        
+        Args:
+            key (str): Cache key
+            endpoint (str): Endpoint of the request
+            body (bytes): Raw JSON body
+            headers (Mapping): Response headers (only CACHED_HEADERS are kept)
+            generation (int, optional): Value of `generation` when the request
+                was sent; the response is dropped if a write happened since
+        """
+        if generation is not None and generation != self.generation:
+            return
+        
+        kept = {name: headers[name] for name in CACHED_HEADERS if headers.get(name) is not None}
+        stored_at = time.time()
+        endpoint = normalize_endpoint(endpoint)
+        self._remember(key, endpoint, body, kept, stored_at)
+        if self.disk is not None:
+            self.disk.put(self.store_url, key, endpoint, body, kept, stored_at)
+    
+    def _remember(self, key, endpoint, body, headers, stored_at):
+        """Put an entry in the memory tier, evicting the least recently used"""
+        entry = {'endpoint': endpoint, 'body': body, 'headers': headers, 'stored_at': stored_at}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._by_endpoint.setdefault(endpoint, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._forget(old_key, old_entry['endpoint'])
+        return entry
+    
+    def _forget(self, key, endpoint):
+        """Drop a key from the endpoint index (caller holds the lock)"""
+        keys = self._by_endpoint.get(endpoint)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_endpoint[endpoint]
+    
+    def invalidate(self, endpoint, memory_only=False):
+        """
+        Drop the entries a write to `endpoint` makes stale
+        
+        Args:
+            endpoint (str): Endpoint of a POST, PUT or DELETE
+            memory_only (bool, optional): Leave the disk tier alone (another
+                process already updated it)
+        """
+        exact, prefixes = affected_endpoints(endpoint)
+        
+        with self._lock:
+            self.generation += 1
+            stale = [
+                cached for cached in self._by_endpoint
+                if cached in exact or any(cached == prefix or cached.startswith(prefix + '/') for prefix in prefixes)
+            ]
+            for cached in stale:
+                for key in self._by_endpoint.pop(cached):
+                    del self._entries[key]
+                    self.counters['invalidated'] += 1
+        
+        if self.disk is not None and not memory_only:
+            self.disk.delete(self.store_url, exact, prefixes)
+    
+    def clear(self):
+        """Drop every entry of this store"""
+        with self._lock:
+            self._entries.clear()
+            self._by_endpoint.clear()
+        if self.disk is not None:
+            self.disk.clear(self.store_url)
+    
+    def stats(self):
+        """
+        Get cache statistics
+        
+        Returns:
+            dict: Hit/miss counters, hit ratio and number of entries in memory
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+        served = stats['hits'] + stats['disk_hits'] + stats['projected_hits']
+        lookups = served + stats['misses']
+        stats['hit_ratio'] = round(served / lookups, 3) if lookups else 0.0
+        return stats
+
+# One cache per store, shared by every client of that store
+_caches = {}
+_caches_lock = threading.Lock()
+_disk_tier = None
+
+def get_store_cache(store_url):
+    """
+    Get the shared response cache of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        ResponseCache: The store's cache, or None if caching is disabled
+    """
+    global _disk_tier
+    
+    if Config.WOOCOMMERCE_CACHE_TTL <= 0:
+        return None
+    
+    with _caches_lock:
+        cache = _caches.get(store_url)
+        if cache is None:
+            if _disk_tier is None and Config.WOOCOMMERCE_CACHE_DISK_PATH:
+                _disk_tier = DiskTier(Config.WOOCOMMERCE_CACHE_DISK_PATH, Config.WOOCOMMERCE_CACHE_DISK_MAX_AGE)
+            cache = ResponseCache(store_url, disk=_disk_tier)
+            _caches[store_url] = cache
+        return cache
+
+def _after_fork_in_child():
+    """Replace locks that may have been held by another thread at fork time"""
+    global _caches_lock
+    _caches_lock = threading.Lock()
+    for cache in _caches.values():
+        cache._lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,5 +1,10 @@
-from modules.woocommerce.client import WooCommerceClient
+from modules.woocommerce.pool import PooledClientMixin
 from modules.woocommerce.media import MediaManager
+from modules.woocommerce.paging import iter_pages
+from modules.woocommerce.fields import with_fields
+from modules.woocommerce.batch import BatchWriter
+from modules.woocommerce.mirror import mirror_page, mirror_item
+from modules.woocommerce.reorder import plan_reorder
 from config import Config
 # Added imports for Blueprint and route handling
 from flask import Blueprint, render_template, request, redirect, url_for, flash
@@ -8,7 +13,7 @@ from flask_login import login_required
 # Define the blueprint
 categories_bp = Blueprint('categories', __name__)
 
-class CategoryManager:
+class CategoryManager(PooledClientMixin):
     """
     Manager for WooCommerce product category operations
     """
@@ -20,16 +25,17 @@ class CategoryManager:
         Args:
             wc_client (WooCommerceClient, optional): WooCommerce client instance
         """
-        self.client = wc_client or WooCommerceClient()
-        self.media_manager = MediaManager(self.client)
+        self._client = wc_client
+        self.media_manager = MediaManager(wc_client)
     
-    def get_categories(self, page=1, per_page=None, **filters):
+    def get_categories(self, page=1, per_page=None, fields=None, **filters):
         """
         Get a list of product categories with optional filtering
         
         Args:
             page (int, optional): Page number
             per_page (int, optional): Items per page
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
             **filters: Additional filters (parent, order, etc.)
             
         Returns:
@@ -39,6 +45,11 @@ class CategoryManager:
         if per_page is None:
             per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
         
+        # Serve from the catalog mirror when it is fresh
+        mirrored = mirror_page(self.client, 'categories', page, per_page, fields, filters)
+        if mirrored is not None:
+            return mirrored.items
+        
         # Build query parameters
         params = {
             'page': page,
@@ -47,7 +58,55 @@ class CategoryManager:
         }
         
         # Make the API request
-        return self.client.get('products/categories', params=params)
+        return self.client.get('products/categories', params=with_fields(params, 'terms', fields))
+    
+    def get_categories_page(self, page=1, per_page=None, fields=None, **filters):
+        """
+        Get a page of product categories together with the total counts
+        
+        Args:
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
+            **filters: Additional filters (parent, order, etc.)
+            
+        Returns:
+            PagedResult: Categories plus total and total_pages
+        """
+        mirrored = mirror_page(self.client, 'categories', page, per_page or Config.WOOCOMMERCE_ITEMS_PER_PAGE, fields, filters)
+        if mirrored is not None:
+            return mirrored
+        
+        return self.client.get_page('products/categories', page=page, per_page=per_page, params=with_fields(filters, 'terms', fields))
+    
+    def iter_all(self, per_page=100, max_workers=None, fields=None, **filters):
+        """
+        Iterate over every category in the store
+        
+        Read from the catalog mirror when it is fresh; otherwise pages are
+        fetched concurrently and bypass the response cache, and categories
+        are yielded as their page arrives, so the order across pages is
+        not guaranteed.
+        
+        Args:
+            per_page (int, optional): Page size (WooCommerce allows up to 100)
+            max_workers (int, optional): Pages fetched concurrently
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
+            **filters: Additional filters (parent, order, etc.)
+            
+        Yields:
+            dict: Category data
+        """
+        mirrored = mirror_page(self.client, 'categories', 1, None, fields, filters)
+        if mirrored is not None:
+            return iter(mirrored.items)
+        
+        params = with_fields(filters, 'terms', fields)
+        
+        def fetch_page(page, size):
+            return self.client.get_page('products/categories', page=page, per_page=size, params=params, use_cache=False)
+        
+        return iter_pages(fetch_page, per_page=per_page, max_workers=max_workers)
     
     def get_category(self, category_id):
         """
@@ -59,6 +118,10 @@ class CategoryManager:
         Returns:
             dict: Category data
         """
+        mirrored = mirror_item(self.client, 'categories', category_id)
+        if mirrored is not None:
+            return mirrored
+        
         return self.client.get(f'products/categories/{category_id}')
     
     def create_category(self, category_data):
@@ -153,37 +216,53 @@ class CategoryManager:
         
         return self.get_category(category_id)
     
+    def get_category_tree(self):
+        """
+        Get the store's cached category tree
+        
+        Loaded once with every category (see modules.woocommerce.category_tree)
+        and kept current by category writes, so subtree and ancestor
+        questions don't need a round trip.
+        
+        Returns:
+            CategoryTree: Indexed snapshot of the tree
+        """
+        return self.client.category_tree.get(self.client)
+    
     def get_category_hierarchy(self):
         """
         Get the category hierarchy as a nested structure
         
         Returns:
-            list: Hierarchical list of categories
+            list: Hierarchical list of categories (each with a 'children' list), ordered by menu_order
         """
-        # Get all categories
-        categories = self.get_categories(per_page=100)
-        
-        # Create a dictionary with category ID as key
-        cat_dict = {cat['id']: {**cat, 'children': []} for cat in categories}
-        
-        # Build the hierarchy
-        root_categories = []
-        for cat_id, cat in cat_dict.items():
-            parent_id = cat.get('parent')
-            if parent_id == 0:
-                # Top-level category
-                root_categories.append(cat)
-            elif parent_id in cat_dict:
-                # Add as child to parent
-                cat_dict[parent_id]['children'].append(cat)
-        
-        # Sort by menu order
-        for cat in cat_dict.values():
-            cat['children'].sort(key=lambda x: x.get('menu_order', 0))
+        return self.get_category_tree().nested()
+    
+    def get_subcategory_ids(self, category_id, include_self=True):
+        """
+        Get the IDs of every category under a category
         
-        root_categories.sort(key=lambda x: x.get('menu_order', 0))
+        Args:
+            category_id (int): Category ID
+            include_self (bool, optional): Include the category itself
+            
+        Returns:
+            list: Category IDs in tree order
+        """
+        return self.get_category_tree().subtree_ids(category_id, include_self)
+    
+    def get_category_ancestors(self, category_id):
+        """
+        Get the ancestors of a category
         
-        return root_categories
+        Args:
+            category_id (int): Category ID
+            
+        Returns:
+            list: Ancestor categories, top-level first
+        """
+        tree = self.get_category_tree()
+        return [tree.get(ancestor_id) for ancestor_id in tree.ancestors(category_id)]
     
     def reorder_categories(self, category_orders):
         """
@@ -194,15 +273,43 @@ class CategoryManager:
             
         Returns:
             list: List of updated categories
+            
+        Raises:
+            BatchError: If some categories could not be updated
         """
-        updated_categories = []
-        
-        # Update each category
+        # One batch request per 100 categories instead of one PUT each
+        writer = BatchWriter(self.client, 'products/categories')
         for category_id, menu_order in category_orders.items():
-            updated_cat = self.update_category(category_id, {'menu_order': menu_order})
-            updated_categories.append(updated_cat)
+            writer.update(category_id, {'menu_order': menu_order})
+        
+        return [op.result for op in writer.flush(raise_on_error=True)]
+    
+    def apply_category_order(self, ordered_ids, current_orders=None):
+        """
+        Put categories in the given order with as few menu_order writes as possible
+        
+        Only categories whose position actually changed are written (see
+        modules.woocommerce.reorder), so moving one category in a long list
+        usually updates just that category.
+        
+        Args:
+            ordered_ids (list): Category IDs in the desired order
+            current_orders (dict, optional): Category ID -> current menu_order
+                (fetched from the store if not given)
+            
+        Returns:
+            dict: Category ID -> new menu_order for the categories that were updated
+        """
+        if current_orders is None:
+            current_orders = {
+                term['id']: term.get('menu_order', 0)
+                for term in self.iter_all(fields='id,menu_order')
+            }
         
-        return updated_categories 
+        changes = plan_reorder(current_orders, ordered_ids)
+        if changes:
+            self.reorder_categories(changes)
+        return changes
 
 # Initialize CategoryManager instance (can be shared)
 category_manager = CategoryManager()
@@ -217,16 +324,17 @@ def index():
     per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
     
     try:
-        categories = category_manager.get_categories(page=page, per_page=per_page)
-        # Note: WooCommerce API doesn't easily provide total category count via headers like products
-        # We might need a separate call or handle pagination differently if needed.
-        # For simplicity, we'll assume we get all or enough categories for display.
+        # The page carries the totals from the X-WP-Total/X-WP-TotalPages headers
+        categories = category_manager.get_categories_page(page=page, per_page=per_page)
+        total_pages = categories.total_pages or page
     except Exception as e:
         flash(f"Error fetching categories: {str(e)}", "error")
         categories = []
+        total_pages = 0
         
     return render_template('categories/list.html', 
                            categories=categories, 
-                           current_page=page)
+                           current_page=page,
+                           total_pages=total_pages)
 
 # Add other category-related routes here (e.g., create, edit, delete) if needed 
\ No newline at end of file
@@ -0,0 +1,402 @@
+"""
+Cached category tree
+
+CategoryTree is an immutable snapshot of a store's categories with the
+indexes subtree and ancestor questions need:
+
+- a preorder (Euler tour) numbering: node X's subtree is the contiguous
+  range order[enter[X]:leave[X]], so "is Y under X" is two comparisons and
+  "every category under X" is a slice;
+- the materialized path (root .. node) of every category, so ancestors,
+  depth and breadcrumb names are dict lookups.
+
+CategoryTreeService keeps one snapshot per store. It is loaded with every
+category page (iter_all, concurrently or from the catalog mirror), rebuilt
+in the background after WOOCOMMERCE_CATEGORY_TREE_TTL, and updated from the
+responses of category writes made through WooCommerceClient; each change
+swaps in a new snapshot with the next version number, so readers never see
+a half-updated tree.
+"""
+
+import os
+import time
+import logging
+import threading
+from config import Config
+from modules.woocommerce.mirror import write_target
+
+class CategoryTree:
+    """
+    Immutable, indexed snapshot of a category tree
+    """
+    
+    def __init__(self, categories, version=1):
+        """
+        Build the tree
+        
+        Categories whose parent is missing are treated as top-level, so a
+        partial list never loses categories.
+        
+        Args:
+            categories (iterable): Category dicts (id, parent, menu_order, name...)
+            version (int, optional): Snapshot version
+        """
+        self.version = version
+        self.nodes = {category['id']: category for category in categories}
+        self._index()
+    
+    def _index(self):
+        """Compute children, the preorder numbering and materialized paths"""
+        sort_key = lambda category_id: (self.nodes[category_id].get('menu_order') or 0, category_id)
+        
+        children = {category_id: [] for category_id in self.nodes}
+        roots = []
+        for category_id, category in self.nodes.items():
+            parent = category.get('parent') or 0
+            if parent in children and parent != category_id:
+                children[parent].append(category_id)
+            else:
+                roots.append(category_id)
+        for ids in children.values():
+            ids.sort(key=sort_key)
+        roots.sort(key=sort_key)
+        
+        order, enter, leave, paths = [], {}, {}, {}
+        # Iterative DFS: (id, path of its parent, leaving?)
+        stack = [(category_id, (), False) for category_id in reversed(roots)]
+        while stack:
+            category_id, parent_path, leaving = stack.pop()
+            if leaving:
+                leave[category_id] = len(order)
+                continue
+            if category_id in enter:
+                # Parent loop in the data: keep the first placement
+                continue
+            enter[category_id] = len(order)
+            order.append(category_id)
+            paths[category_id] = parent_path + (category_id,)
+            stack.append((category_id, parent_path, True))
+            stack.extend((child, paths[category_id], False) for child in reversed(children[category_id]))
+        
+        # Categories only reachable through a loop become top-level
+        for category_id in self.nodes:
+            if category_id not in enter:
+                roots.append(category_id)
+                enter[category_id] = len(order)
+                order.append(category_id)
+                paths[category_id] = (category_id,)
+                leave[category_id] = len(order)
+        
+        self.roots = roots
+        self.children = children
+        self.order = order
+        self.enter = enter
+        self.leave = leave
+        self.paths = paths
+    
+    def __contains__(self, category_id):
+        return category_id in self.nodes
+    
+    def __len__(self):
+        return len(self.nodes)
+    
+    def get(self, category_id):
+        """
+        Get a category
+        
+        Args:
+            category_id (int): Category ID
+        
+        Returns:
+            dict: The category, or None if unknown
+        """
+        return self.nodes.get(category_id)
+    
+    def is_descendant(self, category_id, ancestor_id):
+        """
+        Check whether a category is in another's subtree (itself included)
+        
+        Args:
+            category_id (int): Category ID
+            ancestor_id (int): Possible ancestor
+        
+        Returns:
+            bool: True if category_id is ancestor_id or below it
+        """
+        if category_id not in self.enter or ancestor_id not in self.enter:
+            return False
+        return self.enter[ancestor_id] <= self.enter[category_id] < self.leave[ancestor_id]
+    
+    def subtree_ids(self, category_id, include_self=True):
+        """
+        IDs of every category under a category, in tree order
+        
+        Args:
+            category_id (int): Category ID
+            include_self (bool, optional): Include the category itself
+        
+        Returns:
+            list: Category IDs (empty if unknown)
+        """
+        if category_id not in self.enter:
+            return []
+        start = self.enter[category_id] + (0 if include_self else 1)
+        return self.order[start:self.leave[category_id]]
+    
+    def ancestors(self, category_id):
+        """
+        Ancestors of a category, top-level first
+        
+        Args:
+            category_id (int): Category ID
+        
+        Returns:
+            list: Ancestor IDs (empty for top-level or unknown categories)
+        """
+        return list(self.paths.get(category_id, ())[:-1])
+    
+    def depth(self, category_id):
+        """Depth of a category (0 for top-level), or None if unknown"""
+        path = self.paths.get(category_id)
+        return len(path) - 1 if path else None
+    
+    def path_names(self, category_id, separator=' > '):
+        """
+        Breadcrumb of a category ('Electronics > Phones > Cases')
+        
+        Args:
+            category_id (int): Category ID
+            separator (str, optional): Text between names
+        
+        Returns:
+            str: Names from the top-level category down (empty if unknown)
+        """
+        return separator.join(self.nodes[ancestor].get('name', '') for ancestor in self.paths.get(category_id, ()))
+    
+    def in_subtree(self, product, category_id):
+        """
+        Check whether a product is assigned to a category or any category under it
+        
+        Args:
+            product (dict): Product with its 'categories' field
+            category_id (int): Category ID
+        
+        Returns:
+            bool: True if one of the product's categories is in the subtree
+        """
+        return any(self.is_descendant(term.get('id'), category_id) for term in product.get('categories') or [])
+    
+    def nested(self):
+        """
+        The tree as nested dicts (each category plus a 'children' list), ordered by menu_order
+        
+        Returns:
+            list: Top-level categories
+        """
+        def build(category_id):
+            return {**self.nodes[category_id], 'children': [build(child) for child in self.children[category_id]]}
+        
+        return [build(category_id) for category_id in self.roots]
+    
+    def with_changes(self, upserted=(), removed=()):
+        """
+        Snapshot with categories added, replaced or removed
+        
+        Replacements that keep the parent and menu_order reuse the indexes;
+        structural changes re-index in memory (no store request). Deleting a
+        category moves its children up to its nearest remaining ancestor, as
+        WordPress does.
+        
+        Args:
+            upserted (list, optional): Category dicts written
+            removed (list, optional): Category IDs deleted
+        
+        Returns:
+            CategoryTree: The new snapshot (next version)
+        """
+        nodes = dict(self.nodes)
+        removed = set(removed)
+        structural = False
+        for category_id in removed:
+            if nodes.pop(category_id, None) is None:
+                continue
+            structural = True
+            parent, seen = self.nodes[category_id].get('parent') or 0, {category_id}
+            while parent in removed and parent in self.nodes and parent not in seen:
+                seen.add(parent)
+                parent = self.nodes[parent].get('parent') or 0
+            for child in self.children[category_id]:
+                if child not in removed:
+                    nodes[child] = {**nodes[child], 'parent': parent}
+        for category in upserted:
+            old = nodes.get(category['id'])
+            if old is None or (old.get('parent') or 0) != (category.get('parent') or 0) \
+                    or (old.get('menu_order') or 0) != (category.get('menu_order') or 0):
+                structural = True
+            nodes[category['id']] = {**old, **category} if old is not None else category
+        
+        tree = CategoryTree.__new__(CategoryTree)
+        tree.version = self.version + 1
+        tree.nodes = nodes
+        if structural:
+            tree._index()
+        else:
+            for name in ('roots', 'children', 'order', 'enter', 'leave', 'paths'):
+                setattr(tree, name, getattr(self, name))
+        return tree
+
+class CategoryTreeService:
+    """
+    Cached category tree of one store
+    """
+    
+    def __init__(self, store_url, ttl=None):
+        """
+        Initialize the service
+        
+        Args:
+            store_url (str): WooCommerce store URL
+            ttl (float, optional): Seconds before the tree is reloaded
+        """
+        self.store_url = store_url
+        self.ttl = ttl or Config.WOOCOMMERCE_CATEGORY_TREE_TTL
+        self.tree = None
+        self._loaded_at = 0
+        self._refreshing = False
+        self._pending = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _after_fork_in_child(self):
+        """Locks may have been held at fork time, and refresh threads don't survive it"""
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._refreshing = False
+        self._pending = None
+    
+    def load(self, client):
+        """
+        Load every category and build a new snapshot
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+        
+        Returns:
+            CategoryTree: The new tree
+        """
+        from modules.woocommerce.categories import CategoryManager
+        
+        started = time.time()
+        with self._lock:
+            # Writes made while the pages are read are replayed onto the new tree
+            self._pending = []
+        try:
+            categories = list(CategoryManager(client).iter_all())
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        
+        with self._lock:
+            tree = CategoryTree(categories, version=self.tree.version + 1 if self.tree else 1)
+            for upserted, removed in self._pending or ():
+                tree = tree.with_changes(upserted, removed)
+            self._pending = None
+            self.tree = tree
+            self._loaded_at = started
+        return tree
+    
+    def get(self, client):
+        """
+        Get the tree, loading it on first use and reloading it in the background when stale
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+        
+        Returns:
+            CategoryTree: Current snapshot
+        """
+        with self._lock:
+            tree = self.tree
+            stale = tree is not None and time.time() - self._loaded_at > self.ttl and not self._refreshing
+            if stale:
+                self._refreshing = True
+        
+        if tree is None:
+            with self._build_lock:
+                tree = self.tree or self.load(client)
+        elif stale:
+            def run():
+                try:
+                    self.load(client)
+                except Exception as e:
+                    logging.warning(f"Category tree reload failed for {self.store_url}: {str(e)}")
+                finally:
+                    self._refreshing = False
+            
+            threading.Thread(target=run, name='wc-category-tree', daemon=True).start()
+        return tree
+    
+    def apply_write(self, method, endpoint, result):
+        """
+        Apply a successful category write's response to the tree
+        
+        Args:
+            method (str): POST, PUT or DELETE
+            endpoint (str): Endpoint written to (e.g. 'products/categories/12')
+            result (dict): Decoded response
+        """
+        kind, batch = write_target(endpoint)
+        if kind != 'categories' or not isinstance(result, dict):
+            return
+        
+        valid = lambda items: [item for item in items or [] if isinstance(item, dict) and 'id' in item and not item.get('error')]
+        if batch:
+            change = (valid(result.get('create')) + valid(result.get('update')), [item['id'] for item in valid(result.get('delete'))])
+        elif method == 'DELETE':
+            change = ([], [item['id'] for item in valid([result])])
+        else:
+            change = (valid([result]), [])
+        
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(change)
+            if self.tree is not None:
+                self.tree = self.tree.with_changes(*change)
+    
+    def invalidate(self):
+        """Drop the tree (reloaded on next use)"""
+        with self._lock:
+            self.tree = None
+
+# One service per store, shared by every client of that store
+_services = {}
+_services_lock = threading.Lock()
+
+def get_store_category_tree(store_url):
+    """
+    Get the category tree service of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        CategoryTreeService: The store's service
+    """
+    with _services_lock:
+        service = _services.get(store_url)
+        if service is None:
+            service = CategoryTreeService(store_url)
+            _services[store_url] = service
+        return service
+
+def _after_fork_in_child():
+    """Replace the registry lock, which may have been held at fork time"""
+    global _services_lock
+    _services_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,175 @@
+"""
+Cross-process change feed
+
+A webhook delivery reaches one worker process, but with gunicorn every
+worker keeps its own in-memory copies: the response cache's memory tier
+and the typeahead indexes (the disk tier and the catalog mirror are
+shared SQLite files and need nothing). The receiving process appends each
+applied change to a log in a shared SQLite file; every process checks the
+log's newest sequence number at most every WOOCOMMERCE_CHANGE_FEED_POLL
+seconds (from cache lookups and typeahead suggestions) and applies the
+changes made by other processes to its own memory.
+
+Setting WOOCOMMERCE_CHANGE_FEED_PATH to an empty value disables the feed;
+serve.py then warns when it forks several workers.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from config import Config
+
+class ChangeFeed:
+    """
+    Shared log of changes applied by webhook deliveries
+    """
+    
+    def __init__(self, path, poll_interval=None, max_age=None):
+        """
+        Initialize the change feed
+        
+        Args:
+            path (str): SQLite file path (shared by every worker)
+            poll_interval (float, optional): Seconds between checks of the log
+            max_age (float, optional): Seconds changes are kept in the log
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.path = path
+        self.poll_interval = poll_interval if poll_interval is not None else Config.WOOCOMMERCE_CHANGE_FEED_POLL
+        self.max_age = max_age or Config.WOOCOMMERCE_CHANGE_FEED_MAX_AGE
+        self._lock = threading.Lock()
+        self._next_poll = 0.0
+        self.counters = {'published': 0, 'applied': 0}
+        self._open()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS changes ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, origin INTEGER, store TEXT, method TEXT, "
+            "endpoint TEXT, result TEXT, created_at REAL)"
+        )
+        self._db.commit()
+        # Changes logged before this process started are already in what it loads
+        self._seen = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _open(self):
+        """Open the SQLite connection (shared by threads, guarded by the lock)"""
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+    
+    def _after_fork_in_child(self):
+        """SQLite connections must not cross a fork: reopen in the child (which has seen what the parent saw)"""
+        self._lock = threading.Lock()
+        self._open()
+    
+    def publish(self, store_url, method, endpoint, result):
+        """
+        Log a change this process has applied
+        
+        Args:
+            store_url (str): WooCommerce store URL
+            method (str): PUT or DELETE
+            endpoint (str): Endpoint changed (e.g. 'products/12')
+            result (dict): New version of the item ({'id'} for a delete)
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO changes (origin, store, method, endpoint, result, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (os.getpid(), store_url, method, endpoint, json.dumps(result), now)
+            )
+            self._db.execute("DELETE FROM changes WHERE created_at < ?", (now - self.max_age,))
+            self._db.commit()
+            # Applied here already
+            self._seen = max(self._seen, cursor.lastrowid)
+            self.counters['published'] += 1
+    
+    def poll(self):
+        """Apply changes other processes logged since the last check (at most once per poll_interval)"""
+        now = time.monotonic()
+        if now < self._next_poll or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_poll = now + self.poll_interval
+            rows = self._db.execute(
+                "SELECT seq, origin, store, method, endpoint, result FROM changes WHERE seq > ? ORDER BY seq",
+                (self._seen,)
+            ).fetchall()
+            if rows:
+                self._seen = rows[-1][0]
+        except sqlite3.Error as e:
+            logging.warning(f"Change feed poll failed: {str(e)}")
+            return
+        finally:
+            self._lock.release()
+        
+        pid = os.getpid()
+        for seq, origin, store_url, method, endpoint, result in rows:
+            if origin == pid:
+                continue
+            try:
+                self._apply(store_url, method, endpoint, json.loads(result))
+            except Exception as e:
+                logging.warning(f"Change {seq} ({method} {endpoint}) of {store_url} could not be applied: {str(e)}")
+                continue
+            with self._lock:
+                self.counters['applied'] += 1
+    
+    def _apply(self, store_url, method, endpoint, result):
+        """Bring this process's memory in line with a change made elsewhere"""
+        from modules.woocommerce.cache import get_store_cache
+        from modules.woocommerce.typeahead import get_store_typeahead
+        
+        cache = get_store_cache(store_url)
+        if cache is not None:
+            # The disk tier already holds the new version
+            cache.invalidate(endpoint, memory_only=True)
+        get_store_typeahead(store_url).apply_write(method, endpoint, result)
+    
+    def stats(self):
+        """
+        Get change feed statistics
+        
+        Returns:
+            dict: Last sequence number seen and counters
+        """
+        with self._lock:
+            return {'seen': self._seen, **self.counters}
+
+_feed = None
+_feed_lock = threading.Lock()
+
+def get_change_feed():
+    """
+    Get the process's change feed
+    
+    Returns:
+        ChangeFeed: The feed, or None if disabled
+    """
+    global _feed
+    if _feed is None and Config.WOOCOMMERCE_CHANGE_FEED_PATH:
+        with _feed_lock:
+            if _feed is None:
+                _feed = ChangeFeed(Config.WOOCOMMERCE_CHANGE_FEED_PATH)
+    return _feed
+
+def poll_changes():
+    """Apply other processes' changes if the poll interval has passed (no-op when the feed is disabled)"""
+    feed = get_change_feed()
+    if feed is not None:
+        feed.poll()
+
+def _after_fork_in_child():
+    """Replace the lock, which may have been held at fork time"""
+    global _feed_lock
+    _feed_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,23 +1,137 @@
+import json
+import time
 import requests
+from json import dumps as jsonencode
+from urllib.parse import urlencode
+from requests.auth import HTTPBasicAuth
 from woocommerce import API
+from modules.woocommerce.cache import get_store_cache, make_cache_key
+from modules.woocommerce.coalesce import SingleFlight
+from modules.woocommerce.paging import PagedResult
+from modules.woocommerce.mirror import get_store_mirror
+from modules.woocommerce.typeahead import get_store_typeahead
+from modules.woocommerce.category_tree import get_store_category_tree
+from modules.woocommerce.terms import get_store_terms
+from modules.woocommerce.resilience import RetryPolicy, RETRY_STATUSES, CircuitOpenError, get_store_controller, get_store_breaker, in_bulk_requests
 from config import Config
 import logging
 
+def query_value(value):
+    """
+    Query string form of a parameter value
+    
+    requests turns True into 'True' and aiohttp (yarl) rejects bools and
+    lists outright, so both clients send every value through here.
+    
+    Args:
+        value: Parameter value (not None)
+    
+    Returns:
+        str: 'true'/'false' for bools, comma-joined items for lists and tuples, else str(value)
+    """
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, tuple)):
+        return ','.join(query_value(item) for item in value)
+    return str(value)
+
+class SessionAPI(API):
+    """
+    woocommerce.API variant that sends requests through a requests.Session
+    
+    The stock API calls requests.request() for every call, which opens a new
+    connection (DNS, TCP and TLS handshakes) each time. Sending through a
+    shared session reuses pooled keep-alive connections. Extra request
+    headers can be passed per call.
+    """
+    
+    def __init__(self, url, consumer_key, consumer_secret, session=None, **kwargs):
+        super().__init__(url, consumer_key, consumer_secret, **kwargs)
+        self.session = session or requests.Session()
+    
+    def build_request(self, method, endpoint, data=None, params=None, headers=None, **kwargs):
+        """
+        Build the arguments of a request the same way API.__request does
+        
+        Args:
+            method (str): HTTP method
+            endpoint (str): API endpoint
+            data (dict, optional): JSON body
+            params (dict, optional): Query parameters
+            headers (dict, optional): Extra request headers
+            **kwargs: Extra arguments (e.g. oauth_timestamp)
+        
+        Returns:
+            dict: url, params, auth, data and headers of the request
+        """
+        # String values only (None drops the parameter)
+        params = {key: query_value(value) for key, value in (params or {}).items() if value is not None}
+        url = self._API__get_url(endpoint)
+        auth = None
+        request_headers = {
+            "user-agent": f"{self.user_agent}",
+            "accept": "application/json"
+        }
+        if headers:
+            request_headers.update(headers)
+        
+        if self.is_ssl is True and self.query_string_auth is False:
+            auth = HTTPBasicAuth(self.consumer_key, self.consumer_secret)
+        elif self.is_ssl is True and self.query_string_auth is True:
+            params.update({
+                "consumer_key": self.consumer_key,
+                "consumer_secret": self.consumer_secret
+            })
+        else:
+            encoded_params = urlencode(params)
+            url = f"{url}?{encoded_params}"
+            url = self._API__get_oauth_url(url, method, **kwargs)
+            params = None
+        
+        if data is not None:
+            data = jsonencode(data, ensure_ascii=False).encode('utf-8')
+            request_headers["content-type"] = "application/json;charset=utf-8"
+        
+        return {
+            'url': url,
+            'params': params,
+            'auth': auth,
+            'data': data,
+            'headers': request_headers
+        }
+    
+    def _API__request(self, method, endpoint, data, params=None, headers=None, **kwargs):
+        """Same request as API.__request, sent through the session"""
+        oauth_kwargs = {'oauth_timestamp': kwargs.pop('oauth_timestamp')} if 'oauth_timestamp' in kwargs else {}
+        request = self.build_request(method, endpoint, data, params, headers, **oauth_kwargs)
+        
+        return self.session.request(
+            method=method,
+            verify=self.verify_ssl,
+            timeout=self.timeout,
+            **request,
+            **kwargs
+        )
+
 class WooCommerceClient:
     """
     Client for interacting with the WooCommerce REST API
     """
     
-    def __init__(self, store_url=None, consumer_key=None, consumer_secret=None, verify_ssl=None, timeout=None):
+    def __init__(self, store_url=None, consumer_key=None, consumer_secret=None, verify_ssl=None, timeout=None, session=None):
         """
         Initialize the WooCommerce client
         
+        Prefer modules.woocommerce.pool.get_client(), which returns a shared
+        client per store whose connections are reused across requests.
+        
         Args:
             store_url (str, optional): WooCommerce store URL
             consumer_key (str, optional): WooCommerce consumer key
             consumer_secret (str, optional): WooCommerce consumer secret
             verify_ssl (bool, optional): Whether to verify SSL certificates
             timeout (int, optional): Request timeout in seconds
+            session (requests.Session, optional): Session to send requests through
         """
         # Use provided values or fall back to configuration
         self.store_url = store_url or Config.WOOCOMMERCE_STORE_URL
@@ -27,35 +141,197 @@ class WooCommerceClient:
         self.timeout = timeout or Config.WOOCOMMERCE_TIMEOUT
         
         # Initialize WooCommerce API client
-        self.api = API(
+        self.api = SessionAPI(
             url=self.store_url,
             consumer_key=self.consumer_key,
             consumer_secret=self.consumer_secret,
+            session=session,
             version="wc/v3",
             timeout=self.timeout,
             verify_ssl=self.verify_ssl,
             query_string_auth=True  # Force authentication via query string for problematic hosting
         )
+        self.session = self.api.session
+        
+        # GET responses are cached per store (None if caching is disabled)
+        self.cache = get_store_cache(self.store_url)
+        
+        # Local catalog copy, typeahead indexes, category tree and term cache kept current by this client's writes (mirror None if disabled)
+        self.mirror = get_store_mirror(self.store_url)
+        self.typeahead = get_store_typeahead(self.store_url)
+        self.category_tree = get_store_category_tree(self.store_url)
+        self.terms = get_store_terms(self.store_url)
+        
+        # Coalesces identical concurrent GETs
+        self.flights = SingleFlight()
         
-    def get(self, endpoint, params=None):
+        # Retries transient failures; the per-store controller bounds
+        # requests in flight and the breaker stops calling a store that is down
+        self.retry = RetryPolicy()
+        self.concurrency = get_store_controller(self.store_url)
+        self.breaker = get_store_breaker(self.store_url)
+        
+    def get(self, endpoint, params=None, use_cache=True):
         """
         Make a GET request to the WooCommerce API
         
         Args:
             endpoint (str): API endpoint (e.g., 'products')
             params (dict, optional): Query parameters
+            use_cache (bool, optional): Whether the response cache may answer
             
         Returns:
             dict or list: Response data
         """
+        data, _ = self.get_with_headers(endpoint, params=params, use_cache=use_cache)
+        return data
+    
+    def get_with_headers(self, endpoint, params=None, use_cache=True):
+        """
+        Make a GET request and also return the response headers
+        
+        Cached responses keep the pagination (X-WP-Total, X-WP-TotalPages)
+        and validator (ETag, Last-Modified) headers.
+        
+        Args:
+            endpoint (str): API endpoint (e.g., 'products')
+            params (dict, optional): Query parameters
+            use_cache (bool, optional): Whether the response cache may answer
+            
+        Returns:
+            tuple: (response data, headers)
+        """
+        cache = self.cache if use_cache else None
+        key = make_cache_key(endpoint, params)
         try:
-            response = self.api.get(endpoint, params=params)
-            self._check_response(response)
-            return response.json()
+            entry = None
+            if cache is not None:
+                # A projection can be cut from a cached full response
+                if params and params.get('_fields'):
+                    full_params = {name: value for name, value in params.items() if name != '_fields'}
+                    projected = cache.lookup_projected(make_cache_key(endpoint, full_params), params['_fields'])
+                    if projected is not None:
+                        return projected
+                
+                entry, fresh = cache.lookup(key)
+                if fresh:
+                    return json.loads(entry['body']), entry['headers']
+            
+            # Identical concurrent misses share one upstream call; a write
+            # bumps the cache generation so later callers don't join a
+            # request started before it
+            generation = cache.generation if cache is not None else 0
+            try:
+                body, headers = self.flights.do(
+                    (use_cache, generation, key),
+                    lambda: self._fetch(key, endpoint, params, cache, entry, generation)
+                )
+            except CircuitOpenError:
+                # The store is down: an expired response beats an error page
+                if entry is None:
+                    raise
+                self.breaker.served_stale()
+                body, headers = entry['body'], entry['headers']
+            return json.loads(body), headers
         except Exception as e:
             self._handle_error(e, endpoint, "GET", params)
             raise
     
+    def get_page(self, endpoint, page=1, per_page=None, params=None, use_cache=True):
+        """
+        Get one page of a list endpoint together with its totals
+        
+        Args:
+            endpoint (str): API endpoint (e.g., 'products')
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            params (dict, optional): Additional query parameters
+            use_cache (bool, optional): Whether the response cache may answer
+            
+        Returns:
+            PagedResult: Items, total, total_pages, page and headers
+        """
+        if per_page is None:
+            per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
+        
+        query = {**(params or {}), 'page': page, 'per_page': per_page}
+        items, headers = self.get_with_headers(endpoint, params=query, use_cache=use_cache)
+        return PagedResult.from_response(items, headers, page, per_page)
+    
+    def _fetch(self, key, endpoint, params, cache, entry, generation):
+        """
+        Send a GET upstream, revalidating a stale entry and storing the result
+        
+        Returns:
+            tuple: (raw JSON body, headers)
+        """
+        headers = cache.conditional_headers(entry) if cache is not None else None
+        response = self._send('GET', endpoint, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.revalidated(key, entry)
+            return entry['body'], entry['headers']
+        
+        self._check_response(response)
+        if cache is not None:
+            cache.store(key, endpoint, response.content, response.headers, generation=generation)
+        return response.content, response.headers
+    
+    def _send(self, method, endpoint, **kwargs):
+        """
+        Send a request within the store's concurrency limit, retrying
+        transient failures (429/502/503/504, failed connections)
+        while the store's circuit lets calls through
+        
+        Args:
+            method (str): HTTP method
+            endpoint (str): API endpoint
+            **kwargs: data, params and headers of the request
+            
+        Returns:
+            Response: The last response
+            
+        Raises:
+            CircuitOpenError: If the store's circuit is open
+        """
+        call = getattr(self.api, method.lower())
+        bulk = in_bulk_requests()
+        attempt = 0
+        self.breaker.before_call()
+        response = error = None
+        try:
+            while True:
+                response = error = None
+                started = self.concurrency.acquire(bulk)
+                try:
+                    response = call(endpoint, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                finally:
+                    self.concurrency.release(
+                        started,
+                        overloaded=error is not None or (response is not None and response.status_code in RETRY_STATUSES),
+                        bulk=bulk
+                    )
+                
+                # A read timeout already cost the full timeout: don't multiply it
+                if isinstance(error, requests.ReadTimeout) or not self.retry.should_retry(method, attempt, response, error):
+                    if error is not None:
+                        raise error
+                    return response
+                
+                # Back off outside the concurrency slot
+                delay = self.retry.delay(attempt, response)
+                logging.warning(f"WooCommerce {method} {endpoint} failed ({response.status_code if response is not None else error}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            # One outcome per call, from its last attempt: retries of one
+            # request must not count as several failures toward the threshold
+            if response is not None or error is not None:
+                self.breaker.record(response, error)
+            else:
+                self.breaker.cancel_probe()
+    
     def post(self, endpoint, data):
         """
         Make a POST request to the WooCommerce API
@@ -68,12 +344,16 @@ class WooCommerceClient:
             dict: Response data
         """
         try:
-            response = self.api.post(endpoint, data=data)
+            response = self._send('POST', endpoint, data=data)
             self._check_response(response)
-            return response.json()
+            result = response.json()
+            self._apply_write('POST', endpoint, result)
+            return result
         except Exception as e:
             self._handle_error(e, endpoint, "POST", data)
             raise
+        finally:
+            self._invalidate(endpoint)
     
     def put(self, endpoint, data):
         """
@@ -87,12 +367,16 @@ class WooCommerceClient:
             dict: Response data
         """
         try:
-            response = self.api.put(endpoint, data=data)
+            response = self._send('PUT', endpoint, data=data)
             self._check_response(response)
-            return response.json()
+            result = response.json()
+            self._apply_write('PUT', endpoint, result)
+            return result
         except Exception as e:
             self._handle_error(e, endpoint, "PUT", data)
             raise
+        finally:
+            self._invalidate(endpoint)
     
     def delete(self, endpoint, params=None):
         """
@@ -106,12 +390,46 @@ class WooCommerceClient:
             dict: Response data
         """
         try:
-            response = self.api.delete(endpoint, params=params)
+            response = self._send('DELETE', endpoint, params=params)
             self._check_response(response)
-            return response.json()
+            result = response.json()
+            self._apply_write('DELETE', endpoint, result)
+            return result
         except Exception as e:
             self._handle_error(e, endpoint, "DELETE", params)
             raise
+        finally:
+            self._invalidate(endpoint)
+    
+    def stats(self):
+        """
+        Get response cache, request coalescing, concurrency and circuit statistics
+        
+        Returns:
+            dict: 'cache' (None if caching is disabled), 'coalescing', 'concurrency' and 'circuit'
+        """
+        return {
+            'cache': self.cache.stats() if self.cache is not None else None,
+            'coalescing': self.flights.stats(),
+            'concurrency': self.concurrency.stats(),
+            'circuit': self.breaker.stats()
+        }
+    
+    def _apply_write(self, method, endpoint, result):
+        """Apply a successful write to the store's local copies: mirror, typeahead, category tree, term cache (never fails the write)"""
+        for name, target in (('Catalog mirror', self.mirror), ('Typeahead', self.typeahead),
+                             ('Category tree', self.category_tree), ('Term cache', self.terms)):
+            if target is None:
+                continue
+            try:
+                target.apply_write(method, endpoint, result)
+            except Exception as e:
+                logging.warning(f"{name} update failed for {method} {endpoint}: {str(e)}")
+    
+    def _invalidate(self, endpoint):
+        """Drop cached responses made stale by a write to an endpoint"""
+        if self.cache is not None:
+            self.cache.invalidate(endpoint)
     
     def test_connection(self):
         """
@@ -122,7 +440,7 @@ class WooCommerceClient:
         """
         try:
             # Try to fetch a single product to test connection
-            self.get('products', {'per_page': 1})
+            self.get('products', {'per_page': 1}, use_cache=False)
             return True
         except Exception:
             return False
@@ -158,6 +476,11 @@ class WooCommerceClient:
             method (str): The HTTP method
             data (dict, optional): The request data
         """
+        # Fail-fast rejections would flood the log while a store is down
+        if isinstance(exception, CircuitOpenError):
+            logging.warning(f"WooCommerce {method} {endpoint} skipped: {exception}")
+            return
+        
         # Log the error
         logging.error(f"WooCommerce API Error: {method} {endpoint}")
         logging.error(f"Exception: {str(exception)}")
@@ -0,0 +1,79 @@
+import threading
+
+class _Flight:
+    """An upstream call in progress and its outcome"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one
+    
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is in flight wait and receive its result (or its
+    exception). Nothing is kept once the call completes, so this only
+    merges calls that overlap in time - the response cache covers the rest.
+    """
+    
+    def __init__(self):
+        """Initialize the single-flight group"""
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.counters = {'calls': 0, 'upstream_calls': 0, 'coalesced': 0}
+    
+    def do(self, key, func):
+        """
+        Run `func` once for all concurrent callers with the same key
+        
+        Args:
+            key (hashable): Identity of the call
+            func (callable): Function taking no arguments
+        
+        Returns:
+            object: The function's result
+        """
+        with self._lock:
+            self.counters['calls'] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.counters['upstream_calls'] += 1
+            else:
+                flight.waiters += 1
+                self.counters['coalesced'] += 1
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = func()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+    
+    def stats(self):
+        """
+        Get coalescing statistics
+        
+        Returns:
+            dict: Calls made, upstream calls actually sent, calls saved
+                (coalesced) and calls currently in flight
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['in_flight'] = len(self._flights)
+        return stats
@@ -0,0 +1,88 @@
+"""
+Field projection profiles
+
+WooCommerce returns every field of a resource (descriptions, meta_data,
+images, variations, _links...) unless the request names the fields it
+needs with the REST `_fields` parameter. The profiles below name the field
+sets the application uses, per resource kind.
+"""
+
+FIELD_PROFILES = {
+    'products': {
+        # Product list pages
+        'list': (
+            'id', 'name', 'slug', 'sku', 'type', 'status', 'permalink',
+            'price', 'regular_price', 'sale_price', 'stock_status',
+            'stock_quantity', 'images', 'categories', 'date_modified'
+        ),
+        # Prompt variables for AI content generation
+        'ai_context': (
+            'id', 'name', 'type', 'sku', 'description', 'short_description',
+            'attributes', 'categories', 'tags', 'brands', 'meta_data'
+        ),
+        # SEO editing
+        'seo': (
+            'id', 'name', 'slug', 'permalink', 'short_description', 'meta_data'
+        ),
+    },
+    'terms': {
+        'list': ('id', 'name', 'slug', 'parent', 'count', 'menu_order', 'image'),
+        'ai_context': ('id', 'name', 'slug', 'parent', 'description', 'count'),
+        'seo': ('id', 'name', 'slug', 'description', 'meta_data'),
+    },
+}
+
+def resolve_fields(kind, fields):
+    """
+    Turn a profile name or field list into a `_fields` value
+    
+    Args:
+        kind (str): 'products' or 'terms'
+        fields (str or list): Profile name, comma-separated field names,
+            or a list of field names
+    
+    Returns:
+        str: Comma-separated field names, or None for all fields
+    """
+    if not fields:
+        return None
+    
+    if isinstance(fields, str):
+        if fields not in FIELD_PROFILES[kind]:
+            return fields
+        fields = FIELD_PROFILES[kind][fields]
+    
+    return ','.join(fields)
+
+def with_fields(params, kind, fields):
+    """
+    Add a `_fields` parameter to query parameters
+    
+    Args:
+        params (dict): Query parameters (not modified)
+        kind (str): 'products' or 'terms'
+        fields (str or list): Profile name, or field names (None for all)
+    
+    Returns:
+        dict: Parameters including `_fields` when a projection was requested
+    """
+    resolved = resolve_fields(kind, fields)
+    if resolved is None:
+        return params
+    return {**params, '_fields': resolved}
+
+def project(data, fields):
+    """
+    Apply a `_fields` projection locally, as the REST API would
+    
+    Args:
+        data (dict or list): Full resource or list of resources
+        fields (str): Comma-separated field names
+    
+    Returns:
+        dict or list: Projected copy
+    """
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    if isinstance(data, list):
+        return [{name: item[name] for name in names if name in item} for item in data]
+    return {name: data[name] for name in names if name in data}
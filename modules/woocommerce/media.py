@@ -2,9 +2,9 @@ import os
 import base64
 import requests
 import mimetypes
-from modules.woocommerce.client import WooCommerceClient
+from modules.woocommerce.pool import PooledClientMixin
 
-class MediaManager:
+class MediaManager(PooledClientMixin):
     """
     Manager for WooCommerce media operations
     """
@@ -16,7 +16,7 @@ class MediaManager:
         Args:
             wc_client (WooCommerceClient, optional): WooCommerce client instance
         """
-        self.client = wc_client or WooCommerceClient()
+        self._client = wc_client
     
     def upload_image(self, image_path, alt_text=None, title=None, caption=None, description=None):
         """
@@ -0,0 +1,680 @@
+"""
+Local SQLite mirror of a store's catalog
+
+Products, categories, brands and tags are copied into SQLite so
+list pages, lookups and AI context reads don't have to go to the store:
+
+- The first sync of each kind copies everything (iter_pages through the
+  client); later product syncs only fetch what changed since
+  the newest date_modified seen (`modified_after`). Terms have no
+  modification dates and are simply re-read; a full resync every
+  WOOCOMMERCE_MIRROR_FULL_SYNC_INTERVAL also drops items deleted outside
+  this application.
+- Managers read from the mirror while its last sync is younger than
+  WOOCOMMERCE_MIRROR_MAX_AGE (or while the store's circuit is open); a
+  stale read goes live and schedules a background sync.
+- Writes made through WooCommerceClient (single and batch) are applied to
+  the mirror from the store's response.
+
+Product `search` uses an FTS5 index over name, SKU, slug and description
+(see modules.woocommerce.search); matches are ranked by bm25 unless
+another order is asked for. Requests whose filters or ordering the
+mirror can't reproduce always go live.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from modules.woocommerce.cache import normalize_endpoint
+from modules.woocommerce.fields import resolve_fields, project
+from modules.woocommerce.paging import PagedResult, iter_pages
+from modules.woocommerce.resilience import bulk_requests
+from modules.woocommerce.search import fts_query, search_text
+from config import Config
+
+# Mirrored kinds and the collection endpoint each is synced from
+KIND_ENDPOINTS = {
+    'products': 'products',
+    'categories': 'products/categories',
+    'brands': 'products/product_brand',
+    'tags': 'products/tags',
+}
+
+# Collection endpoints whose writes update the mirror
+ENDPOINT_KINDS = {endpoint: kind for kind, endpoint in KIND_ENDPOINTS.items()}
+ENDPOINT_KINDS['products/brands'] = 'brands'
+
+# Kinds that can be synced incrementally with `modified_after`
+INCREMENTAL_KINDS = ('products',)
+
+# Product fields holding term memberships, and the taxonomy of each
+MEMBERSHIP_FIELDS = {
+    'categories': 'product_cat',
+    'tags': 'product_tag',
+    'brands': 'product_brand',
+}
+
+# Product list filters answered from the mirror, mapped to membership taxonomies
+PRODUCT_TERM_FILTERS = {
+    'category': 'product_cat',
+    'tag': 'product_tag',
+    'brand': 'product_brand',
+    'product_brand': 'product_brand',
+}
+
+PRODUCT_ORDERBY = {
+    'date': 'date_created',
+    'modified': 'date_modified',
+    'id': 'id',
+    'title': 'name COLLATE NOCASE',
+    'slug': 'slug',
+}
+
+TERM_ORDERBY = {
+    'name': 'name COLLATE NOCASE',
+    'id': 'id',
+    'slug': 'slug',
+    'count': 'count',
+}
+
+TERM_TABLE = (
+    "CREATE TABLE IF NOT EXISTS {table} ("
+    "store TEXT, id INTEGER, slug TEXT, name TEXT, parent INTEGER, menu_order INTEGER, "
+    "count INTEGER, data TEXT, PRIMARY KEY (store, id))"
+)
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS products ("
+    "store TEXT, id INTEGER, sku TEXT, slug TEXT, name TEXT, type TEXT, status TEXT, "
+    "parent_id INTEGER, date_created TEXT, date_modified TEXT, data TEXT, PRIMARY KEY (store, id))",
+    "CREATE INDEX IF NOT EXISTS products_sku ON products (store, sku)",
+    "CREATE INDEX IF NOT EXISTS products_slug ON products (store, slug)",
+    "CREATE INDEX IF NOT EXISTS products_created ON products (store, date_created)",
+    "CREATE INDEX IF NOT EXISTS products_modified ON products (store, date_modified)",
+    "CREATE TABLE IF NOT EXISTS product_terms ("
+    "store TEXT, product_id INTEGER, taxonomy TEXT, term_id INTEGER, "
+    "PRIMARY KEY (store, product_id, taxonomy, term_id))",
+    "CREATE INDEX IF NOT EXISTS product_terms_term ON product_terms (store, taxonomy, term_id)",
+    # Full-text index of products; rowid = products.rowid
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "name, sku, slug, description, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    TERM_TABLE.format(table='categories'),
+    TERM_TABLE.format(table='brands'),
+    TERM_TABLE.format(table='tags'),
+    "CREATE INDEX IF NOT EXISTS categories_slug ON categories (store, slug)",
+    "CREATE INDEX IF NOT EXISTS categories_parent ON categories (store, parent)",
+    "CREATE INDEX IF NOT EXISTS brands_slug ON brands (store, slug)",
+    "CREATE INDEX IF NOT EXISTS tags_slug ON tags (store, slug)",
+    "CREATE TABLE IF NOT EXISTS sync_state ("
+    "store TEXT, kind TEXT, full_synced_at REAL, synced_at REAL, cursor TEXT, "
+    "PRIMARY KEY (store, kind))",
+    # Media was mirrored by earlier versions but never read from the mirror
+    "DROP TABLE IF EXISTS media",
+    "DELETE FROM sync_state WHERE kind = 'media'",
+]
+
+def write_target(endpoint):
+    """
+    Find the kind a write endpoint belongs to
+    
+    Args:
+        endpoint (str): Endpoint written to (e.g. 'products/12', 'products/tags/batch')
+    
+    Returns:
+        tuple: (kind or None, True for a batch endpoint)
+    """
+    parts = normalize_endpoint(endpoint).split('/')
+    batch = parts[-1] == 'batch'
+    if batch or parts[-1].isdigit():
+        parts = parts[:-1]
+    return ENDPOINT_KINDS.get('/'.join(parts)), batch
+
+def _id_list(value):
+    """Turn an ID filter (int, '1,2' or list) into a list of ints, or None if it isn't one"""
+    if isinstance(value, (list, tuple)):
+        values = value
+    else:
+        values = str(value).split(',')
+    try:
+        return [int(v) for v in values if str(v).strip()]
+    except ValueError:
+        return None
+
+class CatalogMirror:
+    """
+    SQLite mirror of one store's catalog
+    """
+    
+    def __init__(self, store_url, path, max_age=None, full_sync_interval=None):
+        """
+        Initialize the catalog mirror
+        
+        Args:
+            store_url (str): WooCommerce store URL
+            path (str): SQLite file path (shared by every store)
+            max_age (float, optional): Seconds after a sync during which reads use the mirror
+            full_sync_interval (float, optional): Seconds between full resyncs
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.store_url = store_url
+        self.path = path
+        self.max_age = max_age or Config.WOOCOMMERCE_MIRROR_MAX_AGE
+        self.full_sync_interval = full_sync_interval or Config.WOOCOMMERCE_MIRROR_FULL_SYNC_INTERVAL
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._syncing = False
+        self._attempted = {}
+        self._open()
+        with self._lock:
+            for statement in SCHEMA:
+                self._db.execute(statement)
+            self._rebuild_search_index()
+            self._db.commit()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _open(self):
+        """Open the SQLite connection (shared by threads, guarded by the lock)"""
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+    
+    def _after_fork_in_child(self):
+        """SQLite connections must not cross a fork: reopen in the child"""
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._syncing = False
+        self._open()
+    
+    def _rebuild_search_index(self):
+        """Fill the full-text index from products mirrored before it existed (caller holds the lock)"""
+        if self._db.execute("SELECT 1 FROM products_fts LIMIT 1").fetchone() is not None:
+            return
+        for rowid, data in self._db.execute("SELECT rowid, data FROM products").fetchall():
+            self._index_product(rowid, json.loads(data))
+    
+    def _index_product(self, rowid, item):
+        """Add a product to the full-text index (caller holds the lock)"""
+        self._db.execute(
+            "INSERT INTO products_fts (rowid, name, sku, slug, description) VALUES (?, ?, ?, ?, ?)",
+            (rowid, item.get('name') or '', item.get('sku') or '', item.get('slug') or '',
+             search_text(item.get('short_description')) + ' ' + search_text(item.get('description')))
+        )
+    
+    # ----- Sync -----
+    
+    def sync(self, client, kinds=None, full=False):
+        """
+        Bring the mirror up to date with the store
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kinds (list, optional): Kinds to sync (default: all of KIND_ENDPOINTS)
+            full (bool, optional): Re-read everything even if an incremental sync would do
+        
+        Returns:
+            dict: Kind -> number of items fetched, or None if that kind failed
+        """
+        results = {}
+        with self._sync_lock:
+            for kind in kinds or KIND_ENDPOINTS:
+                self._attempted[kind] = time.time()
+                state = self._state(kind)
+                incremental = (
+                    not full
+                    and kind in INCREMENTAL_KINDS
+                    and state is not None
+                    and state['cursor'] is not None
+                    and time.time() - state['full_synced_at'] < self.full_sync_interval
+                )
+                try:
+                    if incremental:
+                        results[kind] = self._sync_changes(client, kind, state)
+                    else:
+                        results[kind] = self._sync_all(client, kind)
+                except Exception as e:
+                    logging.warning(f"Catalog mirror sync of {kind} failed for {self.store_url}: {str(e)}")
+                    results[kind] = None
+        return results
+    
+    def sync_in_background(self, client, kinds=None):
+        """
+        Start a sync on a daemon thread unless one is already running
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kinds (list, optional): Kinds to sync (default: all)
+        """
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+        
+        def run():
+            try:
+                # Background copy: leave the reserved slots to users' requests
+                with bulk_requests():
+                    self.sync(client, kinds)
+            finally:
+                self._syncing = False
+        
+        threading.Thread(target=run, name='wc-mirror-sync', daemon=True).start()
+    
+    def _fetch(self, client, kind, params):
+        """Fetch every page of a kind's collection"""
+        endpoint = KIND_ENDPOINTS[kind]
+        
+        def fetch_page(page, size):
+            return client.get_page(endpoint, page=page, per_page=size, params=params, use_cache=False)
+        
+        return list(iter_pages(fetch_page, per_page=100))
+    
+    def _sync_all(self, client, kind):
+        """Replace a kind's rows with a fresh copy of the whole collection"""
+        started = time.time()
+        items = self._fetch(client, kind, {})
+        
+        with self._lock:
+            if kind == 'products':
+                self._db.execute("DELETE FROM products_fts WHERE rowid IN (SELECT rowid FROM products WHERE store = ?)", (self.store_url,))
+                self._db.execute("DELETE FROM product_terms WHERE store = ?", (self.store_url,))
+            self._db.execute(f"DELETE FROM {kind} WHERE store = ?", (self.store_url,))
+            self._upsert(kind, items)
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                (self.store_url, kind, started, started, self._cursor(kind, items, None))
+            )
+            self._db.commit()
+            # Refresh planner statistics so filters pick the membership and date indexes
+            self._db.execute("ANALYZE")
+        return len(items)
+    
+    def _sync_changes(self, client, kind, state):
+        """Fetch what changed since the last sync's newest modification"""
+        started = time.time()
+        # Overlap by a second: items modified within the cursor's second may be new
+        since = datetime.fromisoformat(state['cursor']) - timedelta(seconds=1)
+        items = self._fetch(client, kind, {'modified_after': since.isoformat(), 'dates_are_gmt': 'true'})
+        
+        with self._lock:
+            self._upsert(kind, items)
+            self._db.execute(
+                "UPDATE sync_state SET synced_at = ?, cursor = ? WHERE store = ? AND kind = ?",
+                (started, self._cursor(kind, items, state['cursor']), self.store_url, kind)
+            )
+            self._db.commit()
+        return len(items)
+    
+    def _cursor(self, kind, items, cursor):
+        """Newest GMT modification date among the items (or the previous cursor)"""
+        if kind not in INCREMENTAL_KINDS:
+            return None
+        dates = [item.get('date_modified_gmt') for item in items]
+        dates = [date for date in dates if date]
+        if cursor:
+            dates.append(cursor)
+        return max(dates) if dates else None
+    
+    def _state(self, kind):
+        """Sync state of a kind, or None if it was never synced"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT full_synced_at, synced_at, cursor FROM sync_state WHERE store = ? AND kind = ?",
+                (self.store_url, kind)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'full_synced_at': row[0], 'synced_at': row[1], 'cursor': row[2]}
+    
+    def ready(self, client, kind):
+        """
+        Check whether reads of a kind can be answered from the mirror
+        
+        A stale kind schedules a background sync and reads go live until it
+        finishes - unless the store's circuit is open, when any copy beats none.
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): Mirrored kind
+        
+        Returns:
+            bool: True if the mirror may answer
+        """
+        now = time.time()
+        state = self._state(kind)
+        if state is not None and now - state['synced_at'] <= self.max_age:
+            return True
+        
+        # Kinds the store doesn't serve (e.g. no brand taxonomy) are retried
+        # once per max_age, not on every read
+        if now - self._attempted.get(kind, 0) > self.max_age:
+            self.sync_in_background(client, [kind])
+        return state is not None and client.breaker.state == client.breaker.OPEN
+    
+    # ----- Writes -----
+    
+    def _upsert(self, kind, items):
+        """Insert or replace items (caller holds the lock and commits)"""
+        for item in items:
+            if not isinstance(item, dict) or 'id' not in item:
+                continue
+            data = json.dumps(item)
+            if kind == 'products':
+                self._unindex_products([item['id']])
+                cursor = self._db.execute(
+                    "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.store_url, item['id'], item.get('sku') or None, item.get('slug'), item.get('name'),
+                     item.get('type'), item.get('status'), item.get('parent_id') or 0,
+                     item.get('date_created_gmt') or item.get('date_created'),
+                     item.get('date_modified_gmt') or item.get('date_modified'), data)
+                )
+                self._index_product(cursor.lastrowid, item)
+                self._db.execute("DELETE FROM product_terms WHERE store = ? AND product_id = ?", (self.store_url, item['id']))
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO product_terms VALUES (?, ?, ?, ?)",
+                    [(self.store_url, item['id'], taxonomy, term['id'])
+                     for field, taxonomy in MEMBERSHIP_FIELDS.items()
+                     for term in item.get(field) or [] if isinstance(term, dict) and 'id' in term]
+                )
+            else:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {kind} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.store_url, item['id'], item.get('slug'), item.get('name'), item.get('parent') or 0,
+                     item.get('menu_order') or 0, item.get('count') or 0, data)
+                )
+    
+    def _unindex_products(self, product_ids):
+        """Drop products from the full-text index (caller holds the lock)"""
+        for product_id in product_ids:
+            self._db.execute(
+                "DELETE FROM products_fts WHERE rowid IN (SELECT rowid FROM products WHERE store = ? AND id = ?)",
+                (self.store_url, product_id)
+            )
+    
+    def _remove(self, kind, item_ids):
+        """Delete items (caller holds the lock and commits)"""
+        if kind == 'products':
+            self._unindex_products(item_ids)
+        for item_id in item_ids:
+            self._db.execute(f"DELETE FROM {kind} WHERE store = ? AND id = ?", (self.store_url, item_id))
+            if kind == 'products':
+                self._db.execute("DELETE FROM product_terms WHERE store = ? AND product_id = ?", (self.store_url, item_id))
+    
+    def apply_write(self, method, endpoint, result):
+        """
+        Apply a successful write's response to the mirror
+        
+        Args:
+            method (str): POST, PUT or DELETE
+            endpoint (str): Endpoint written to (e.g. 'products/12', 'products/batch')
+            result (dict): Decoded response
+        """
+        kind, batch = write_target(endpoint)
+        if kind is None or not isinstance(result, dict):
+            return
+        
+        with self._lock:
+            # Only kinds that were synced at least once are kept up to date
+            if self._db.execute("SELECT 1 FROM sync_state WHERE store = ? AND kind = ?", (self.store_url, kind)).fetchone() is None:
+                return
+            
+            if batch:
+                valid = lambda items: [item for item in items or [] if isinstance(item, dict) and not item.get('error')]
+                self._upsert(kind, valid(result.get('create')) + valid(result.get('update')))
+                self._remove(kind, [item['id'] for item in valid(result.get('delete')) if 'id' in item])
+            elif method == 'DELETE':
+                if 'id' in result:
+                    self._remove(kind, [result['id']])
+            else:
+                self._upsert(kind, [result])
+            self._db.commit()
+    
+    # ----- Reads -----
+    
+    def get(self, kind, item_id, fields=None):
+        """
+        Get one mirrored item
+        
+        Args:
+            kind (str): Mirrored kind
+            item_id (int): Item ID
+            fields (str, optional): Comma-separated fields to keep
+        
+        Returns:
+            dict: The item, or None if it isn't mirrored
+        """
+        with self._lock:
+            row = self._db.execute(f"SELECT data FROM {kind} WHERE store = ? AND id = ?", (self.store_url, int(item_id))).fetchone()
+        if row is None:
+            return None
+        item = json.loads(row[0])
+        return project(item, fields) if fields else item
+    
+    def query(self, kind, page=1, per_page=None, fields=None, filters=None):
+        """
+        Answer a list request from the mirror
+        
+        Args:
+            kind (str): 'products', 'categories', 'brands' or 'tags'
+            page (int, optional): Page number
+            per_page (int, optional): Items per page (None for all)
+            fields (str, optional): Comma-separated fields to keep
+            filters (dict, optional): WooCommerce list filters
+        
+        Returns:
+            PagedResult: The page, or None if the filters can't be answered locally
+        """
+        with self._lock:
+            built = self._build_query(kind, dict(filters or {}))
+            if built is None:
+                return None
+            source, where, args, order = built
+            
+            sql = f"SELECT {kind}.data FROM {source} WHERE {where} ORDER BY {order}"
+            page_args = []
+            if per_page:
+                sql += " LIMIT ? OFFSET ?"
+                page_args = [per_page, (page - 1) * per_page]
+            
+            total = self._db.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", args).fetchone()[0]
+            rows = self._db.execute(sql, args + page_args).fetchall()
+        
+        items = [json.loads(row[0]) for row in rows]
+        if fields:
+            items = project(items, fields)
+        per_page = per_page or max(total, 1)
+        return PagedResult(items, page, per_page, total=total, total_pages=(total + per_page - 1) // per_page)
+    
+    def _build_query(self, kind, filters):
+        """Turn list filters into (from, where, args, order by), or None if one isn't supported (caller holds the lock)"""
+        filters.pop('context', None)
+        orderby = filters.pop('orderby', None)
+        order = str(filters.pop('order', '')).upper()
+        source = kind
+        where = [f"{kind}.store = ?"]
+        args = [self.store_url]
+        
+        search = filters.pop('search', None)
+        match = fts_query(search) if search and kind == 'products' else None
+        if match:
+            # Drive the query from the full-text index
+            source = "products_fts CROSS JOIN products ON products.rowid = products_fts.rowid"
+            where.insert(0, "products_fts MATCH ?")
+            args.insert(0, match)
+        elif search and kind != 'products':
+            where.append(f"({kind}.name LIKE ? ESCAPE '!' OR {kind}.slug LIKE ? ESCAPE '!')")
+            pattern = '%' + str(search).replace('!', '!!').replace('%', '!%').replace('_', '!_') + '%'
+            args.extend([pattern, pattern])
+        
+        include = filters.pop('include', None)
+        if include:
+            ids = _id_list(include)
+            if ids is None:
+                return None
+            where.append(f"{kind}.id IN ({','.join('?' * len(ids))})")
+            args.extend(ids)
+        
+        if 'slug' in filters:
+            where.append(f"{kind}.slug = ?")
+            args.append(filters.pop('slug'))
+        
+        if kind == 'products':
+            if filters.get('status', 'any') != 'any':
+                where.append("products.status = ?")
+                args.append(filters['status'])
+            filters.pop('status', None)
+            for name in ('sku', 'type'):
+                if name in filters:
+                    where.append(f"products.{name} = ?")
+                    args.append(filters.pop(name))
+            # Upload date range (dates are stored in GMT)
+            filters.pop('dates_are_gmt', None)
+            for name, operator in (('after', '>'), ('before', '<')):
+                if name in filters:
+                    where.append(f"products.date_created {operator} ?")
+                    args.append(str(filters.pop(name)))
+            for name, taxonomy in PRODUCT_TERM_FILTERS.items():
+                if name not in filters:
+                    continue
+                ids = _id_list(filters.pop(name))
+                if ids is None:
+                    return None
+                # Stores without brand data in product responses can't answer brand filters
+                if taxonomy == 'product_brand' and self._db.execute(
+                        "SELECT 1 FROM product_terms WHERE store = ? AND taxonomy = ? LIMIT 1",
+                        (self.store_url, taxonomy)).fetchone() is None:
+                    return None
+                terms = ','.join('?' * len(ids))
+                term_args = ids
+                if taxonomy == 'product_cat':
+                    # Like the store, a category filter includes its subcategories
+                    terms = (
+                        f"WITH RECURSIVE sub(id) AS (VALUES {','.join(['(?)'] * len(ids))} "
+                        "UNION SELECT categories.id FROM categories JOIN sub ON categories.parent = sub.id "
+                        "WHERE categories.store = ?) SELECT id FROM sub"
+                    )
+                    term_args = [*ids, self.store_url]
+                where.append(
+                    "products.id IN (SELECT product_id FROM product_terms WHERE store = ? AND taxonomy = ? "
+                    f"AND term_id IN ({terms}))"
+                )
+                args.extend([self.store_url, taxonomy, *term_args])
+            if orderby == 'relevance' or (match and orderby is None):
+                if not match:
+                    return None
+                # bm25: lower is better; name weighs most, then SKU, slug, description
+                return source, ' AND '.join(where), args, "bm25(products_fts, 10.0, 5.0, 2.0, 1.0), products.date_created DESC"
+            column = PRODUCT_ORDERBY.get(orderby or 'date')
+            default_order = 'DESC'
+        else:
+            if 'parent' in filters:
+                where.append(f"{kind}.parent = ?")
+                args.append(int(filters.pop('parent')))
+            if str(filters.pop('hide_empty', '')).lower() in ('1', 'true'):
+                where.append(f"{kind}.count > 0")
+            column = TERM_ORDERBY.get(orderby or 'name')
+            default_order = 'ASC'
+        
+        if filters or column is None:
+            return None
+        
+        direction = order if order in ('ASC', 'DESC') else default_order
+        return source, ' AND '.join(where), args, f"{kind}.{column} {direction}, {kind}.id {direction}"
+    
+    def stats(self):
+        """
+        Get mirror statistics
+        
+        Returns:
+            dict: Kind -> item count and seconds since the last sync (None if never synced)
+        """
+        stats = {}
+        now = time.time()
+        for kind in KIND_ENDPOINTS:
+            state = self._state(kind)
+            with self._lock:
+                count = self._db.execute(f"SELECT COUNT(*) FROM {kind} WHERE store = ?", (self.store_url,)).fetchone()[0]
+            stats[kind] = {
+                'items': count,
+                'age': round(now - state['synced_at']) if state else None
+            }
+        return stats
+
+def mirror_page(client, kind, page, per_page, fields, filters, field_kind='terms'):
+    """
+    Answer a manager's list request from the client's mirror
+    
+    Args:
+        client (WooCommerceClient): Client of the store
+        kind (str): Mirrored kind
+        page (int): Page number (ignored when per_page is None)
+        per_page (int): Items per page (None for all)
+        fields (str or list): Field profile or field names
+        filters (dict): WooCommerce list filters
+        field_kind (str, optional): Profile family ('products' or 'terms')
+    
+    Returns:
+        PagedResult: The page, or None if the request has to go live
+    """
+    mirror = getattr(client, 'mirror', None)
+    if mirror is None or not mirror.ready(client, kind):
+        return None
+    return mirror.query(kind, page, per_page, resolve_fields(field_kind, fields), filters)
+
+def mirror_item(client, kind, item_id, fields=None, field_kind='terms'):
+    """
+    Answer a manager's single-item request from the client's mirror
+    
+    Args:
+        client (WooCommerceClient): Client of the store
+        kind (str): Mirrored kind
+        item_id (int): Item ID
+        fields (str or list, optional): Field profile or field names
+        field_kind (str, optional): Profile family ('products' or 'terms')
+    
+    Returns:
+        dict: The item, or None if the request has to go live
+    """
+    mirror = getattr(client, 'mirror', None)
+    if mirror is None or not mirror.ready(client, kind):
+        return None
+    return mirror.get(kind, item_id, resolve_fields(field_kind, fields))
+
+# One mirror per store, sharing the SQLite file
+_mirrors = {}
+_mirrors_lock = threading.Lock()
+
+def get_store_mirror(store_url):
+    """
+    Get the catalog mirror of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        CatalogMirror: The store's mirror, or None if mirroring is disabled
+    """
+    if not Config.WOOCOMMERCE_MIRROR_PATH or not store_url:
+        return None
+    
+    with _mirrors_lock:
+        mirror = _mirrors.get(store_url)
+        if mirror is None:
+            mirror = CatalogMirror(store_url, Config.WOOCOMMERCE_MIRROR_PATH)
+            _mirrors[store_url] = mirror
+        return mirror
+
+def _after_fork_in_child():
+    """Replace the registry lock, which may have been held at fork time"""
+    global _mirrors_lock
+    _mirrors_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,147 @@
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from config import Config
+from modules.woocommerce.resilience import bulk_requests
+
+class PagedResult:
+    """
+    One page of a WooCommerce list together with its totals
+    
+    Behaves like the list of items (iteration, len(), indexing), so code
+    written against the plain list keeps working.
+    """
+    
+    def __init__(self, items, page, per_page, total=None, total_pages=None, headers=None):
+        """
+        Initialize the paged result
+        
+        Args:
+            items (list): Items on this page
+            page (int): Page number (1-based)
+            per_page (int): Requested page size
+            total (int, optional): Total number of items (None if unknown)
+            total_pages (int, optional): Total number of pages (None if unknown)
+            headers (Mapping, optional): Raw response headers
+        """
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.total_pages = total_pages
+        self.headers = headers or {}
+    
+    @classmethod
+    def from_response(cls, items, headers, page, per_page):
+        """
+        Build a paged result from a list response and its headers
+        
+        Uses X-WP-Total / X-WP-TotalPages; when a host strips them, the
+        totals are still known if this page is the last one.
+        
+        Args:
+            items (list): Decoded response body
+            headers (Mapping): Response headers
+            page (int): Requested page
+            per_page (int): Requested page size
+        
+        Returns:
+            PagedResult: The page
+        """
+        total = _int_header(headers, 'X-WP-Total')
+        total_pages = _int_header(headers, 'X-WP-TotalPages')
+        
+        if total is None and len(items) < per_page:
+            total = (page - 1) * per_page + len(items)
+        if total_pages is None and total is not None:
+            total_pages = (total + per_page - 1) // per_page if per_page else 0
+        
+        return cls(items, page, per_page, total=total, total_pages=total_pages, headers=headers)
+    
+    @property
+    def has_next(self):
+        """True if a later page exists (or might, when totals are unknown)"""
+        if self.total_pages is None:
+            return len(self.items) >= self.per_page
+        return self.page < self.total_pages
+    
+    @property
+    def has_prev(self):
+        """True if an earlier page exists"""
+        return self.page > 1
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __getitem__(self, index):
+        return self.items[index]
+    
+    def __bool__(self):
+        return bool(self.items)
+    
+    def __repr__(self):
+        return f"<PagedResult page={self.page}/{self.total_pages} items={len(self.items)} total={self.total}>"
+
+def _int_header(headers, name):
+    """Read an integer header, or None if missing or malformed"""
+    value = headers.get(name) if headers else None
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _fetch_bulk(fetch_page, page, per_page):
+    """Fetch a page as a bulk request"""
+    with bulk_requests():
+        return fetch_page(page, per_page)
+
+def iter_pages(fetch_page, per_page=100, max_workers=None):
+    """
+    Stream every item of a list endpoint, fetching pages concurrently
+    
+    Page 1 is fetched first to learn X-WP-TotalPages; the remaining pages
+    are fetched on a bounded thread pool with at most `max_workers` pages
+    in flight, and items are yielded as each page arrives (so across
+    pages they come in completion order, not page order). Without a page
+    count the pages are walked one by one until a short page. Pages after
+    the first are bulk requests: the client's per-store concurrency
+    controller keeps slots free for interactive calls and may hold pages
+    back while the store is struggling.
+    
+    Args:
+        fetch_page (callable): fetch_page(page, per_page) -> PagedResult
+        per_page (int, optional): Page size (WooCommerce allows up to 100)
+        max_workers (int, optional): Pages fetched concurrently
+    
+    Yields:
+        dict: Items of every page
+    """
+    max_workers = max_workers or Config.WOOCOMMERCE_ITER_WORKERS
+    
+    first = fetch_page(1, per_page)
+    yield from first.items
+    
+    if first.total_pages is None:
+        # Headers stripped by the host: walk sequentially
+        result = first
+        while result.has_next:
+            result = _fetch_bulk(fetch_page, result.page + 1, per_page)
+            yield from result.items
+        return
+    
+    pages = iter(range(2, first.total_pages + 1))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wc-pages')
+    try:
+        in_flight = {executor.submit(_fetch_bulk, fetch_page, page, per_page) for page in islice(pages, max_workers)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                # Keep the window full before handing items to the caller
+                for page in pages:
+                    in_flight.add(executor.submit(_fetch_bulk, fetch_page, page, per_page))
+                    break
+                yield from future.result().items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,148 @@
+import os
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from modules.woocommerce.client import WooCommerceClient
+from config import Config
+
+class ClientRegistry:
+    """
+    Process-wide registry of WooCommerce clients keyed by store credentials
+    
+    Each (store_url, consumer_key) gets one client whose requests.Session
+    keeps a sized pool of keep-alive connections, so repeated calls to the
+    same store skip DNS, TCP and TLS handshakes. Stores that haven't been
+    used for `idle_ttl` seconds are evicted and their connections closed.
+    """
+    
+    def __init__(self, idle_ttl=None, pool_maxsize=None):
+        """
+        Initialize the client registry
+        
+        Args:
+            idle_ttl (float, optional): Seconds before an unused store is evicted
+            pool_maxsize (int, optional): Keep-alive connections kept per store
+        """
+        self.idle_ttl = idle_ttl or Config.WOOCOMMERCE_CLIENT_IDLE_TTL
+        self.pool_maxsize = pool_maxsize or Config.WOOCOMMERCE_POOL_MAXSIZE
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _create_session(self):
+        """Create a keep-alive session with a connection pool sized for concurrent use"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def get(self, store_url=None, consumer_key=None, consumer_secret=None):
+        """
+        Get the shared client for a store
+        
+        Args:
+            store_url (str, optional): WooCommerce store URL (defaults to Config)
+            consumer_key (str, optional): WooCommerce consumer key (defaults to Config)
+            consumer_secret (str, optional): WooCommerce consumer secret (defaults to Config)
+        
+        Returns:
+            WooCommerceClient: Shared client for the store
+        """
+        store_url = store_url or Config.WOOCOMMERCE_STORE_URL
+        consumer_key = consumer_key or Config.WOOCOMMERCE_CONSUMER_KEY
+        consumer_secret = consumer_secret or Config.WOOCOMMERCE_CONSUMER_SECRET
+        key = (store_url, consumer_key)
+        now = time.monotonic()
+        
+        with self._lock:
+            if now - self._last_sweep > min(self.idle_ttl, 60):
+                self._evict_idle(now)
+            
+            entry = self._clients.get(key)
+            if entry is not None and entry['client'].consumer_secret == consumer_secret:
+                entry['last_used'] = now
+                return entry['client']
+            
+            # New client for a new store, or for a rotated secret: the old
+            # client is only dropped, not closed, since other threads may be
+            # mid-request on its session (its sockets close once it's released)
+            client = WooCommerceClient(
+                store_url=store_url,
+                consumer_key=consumer_key,
+                consumer_secret=consumer_secret,
+                session=self._create_session()
+            )
+            self._clients[key] = {'client': client, 'last_used': now}
+            return client
+    
+    def _evict_idle(self, now):
+        """Close and drop clients idle for longer than idle_ttl (caller holds the lock)"""
+        self._last_sweep = now
+        for key, entry in list(self._clients.items()):
+            if now - entry['last_used'] > self.idle_ttl:
+                entry['client'].session.close()
+                del self._clients[key]
+    
+    def clear(self):
+        """Close and drop every client"""
+        with self._lock:
+            for entry in self._clients.values():
+                entry['client'].session.close()
+            self._clients.clear()
+    
+    def _after_fork_in_child(self):
+        """Start with no clients in a forked child (pooled sockets belong to the parent)"""
+        self._lock = threading.Lock()
+        self._clients = {}
+    
+    def stats(self):
+        """
+        Get registry statistics
+        
+        Returns:
+            dict: Number of stores and their idle times in seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'stores': len(self._clients),
+                'idle_seconds': {key[0]: round(now - entry['last_used'], 1) for key, entry in self._clients.items()}
+            }
+
+# Shared registry for this process
+client_registry = ClientRegistry()
+
+def get_client(store_url=None, consumer_key=None, consumer_secret=None):
+    """
+    Get the shared, connection-pooled client for a store
+    
+    Args:
+        store_url (str, optional): WooCommerce store URL (defaults to Config)
+        consumer_key (str, optional): WooCommerce consumer key (defaults to Config)
+        consumer_secret (str, optional): WooCommerce consumer secret (defaults to Config)
+    
+    Returns:
+        WooCommerceClient: Shared client for the store
+    """
+    return client_registry.get(store_url, consumer_key, consumer_secret)
+
+class PooledClientMixin:
+    """
+    `client` property for managers that take an optional WooCommerce client
+    
+    Without an explicit client (`self._client` is None) the pooled one is
+    resolved on every call, so module-level managers never hold a client
+    the pool evicted or one inherited across a fork.
+    """
+    
+    _client = None
+    
+    @property
+    def client(self):
+        """WooCommerce client: the one given, else the pool's current client for the default store"""
+        return self._client or get_client()
@@ -1,14 +1,22 @@
-from modules.woocommerce.client import WooCommerceClient
+import logging
+from modules.woocommerce.pool import PooledClientMixin
 from modules.woocommerce.media import MediaManager
+from modules.woocommerce.paging import iter_pages
+from modules.woocommerce.fields import with_fields
+from modules.woocommerce.batch import BatchWriter
+from modules.woocommerce.mirror import mirror_page, mirror_item
+from modules.woocommerce.search import ProductSearch
+from modules.woocommerce.typeahead import KINDS as TYPEAHEAD_KINDS
+from modules.woocommerce.webhooks import get_webhook_receiver
 from config import Config
 # Added imports for Blueprint and route handling
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required
 
 # Define the blueprint
 products_bp = Blueprint('products', __name__)
 
-class ProductManager:
+class ProductManager(PooledClientMixin):
     """
     Manager for WooCommerce product operations
     """
@@ -20,16 +28,17 @@ class ProductManager:
         Args:
             wc_client (WooCommerceClient, optional): WooCommerce client instance
         """
-        self.client = wc_client or WooCommerceClient()
-        self.media_manager = MediaManager(self.client)
-        
-    def get_products(self, page=1, per_page=None, **filters):
+        self._client = wc_client
+        self.media_manager = MediaManager(wc_client)
+    
+    def get_products(self, page=1, per_page=None, fields=None, **filters):
         """
         Get a list of products with optional filtering
         
         Args:
             page (int, optional): Page number
             per_page (int, optional): Items per page
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
             **filters: Additional filters (category, tag, search, etc.)
             
         Returns:
@@ -39,6 +48,11 @@ class ProductManager:
         if per_page is None:
             per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
         
+        # Serve from the catalog mirror when it is fresh
+        mirrored = mirror_page(self.client, 'products', page, per_page, fields, filters, 'products')
+        if mirrored is not None:
+            return mirrored.items
+        
         # Build query parameters
         params = {
             'page': page,
@@ -47,19 +61,72 @@ class ProductManager:
         }
         
         # Make the API request
-        return self.client.get('products', params=params)
+        return self.client.get('products', params=with_fields(params, 'products', fields))
+    
+    def get_products_page(self, page=1, per_page=None, fields=None, **filters):
+        """
+        Get a page of products together with the total counts
+        
+        Args:
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
+            **filters: Additional filters (category, tag, search, etc.)
+            
+        Returns:
+            PagedResult: Products plus total and total_pages
+        """
+        mirrored = mirror_page(self.client, 'products', page, per_page or Config.WOOCOMMERCE_ITEMS_PER_PAGE, fields, filters, 'products')
+        if mirrored is not None:
+            return mirrored
+        
+        return self.client.get_page('products', page=page, per_page=per_page, params=with_fields(filters, 'products', fields))
+    
+    def iter_all(self, per_page=100, max_workers=None, fields=None, **filters):
+        """
+        Iterate over every product in the store
+        
+        Read from the catalog mirror when it is fresh; otherwise pages are
+        fetched concurrently and bypass the response cache, and products
+        are yielded as their page arrives, so the order across pages is
+        not guaranteed.
+        
+        Args:
+            per_page (int, optional): Page size (WooCommerce allows up to 100)
+            max_workers (int, optional): Pages fetched concurrently
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
+            **filters: Additional filters (category, tag, search, etc.)
+            
+        Yields:
+            dict: Product data
+        """
+        mirrored = mirror_page(self.client, 'products', 1, None, fields, filters, 'products')
+        if mirrored is not None:
+            return iter(mirrored.items)
+        
+        params = with_fields(filters, 'products', fields)
+        
+        def fetch_page(page, size):
+            return self.client.get_page('products', page=page, per_page=size, params=params, use_cache=False)
+        
+        return iter_pages(fetch_page, per_page=per_page, max_workers=max_workers)
     
-    def get_product(self, product_id):
+    def get_product(self, product_id, fields=None):
         """
         Get a single product by ID
         
         Args:
             product_id (int): Product ID
+            fields (str or list, optional): Field profile ('list', 'ai_context', 'seo') or field names
             
         Returns:
             dict: Product data
         """
-        return self.client.get(f'products/{product_id}')
+        mirrored = mirror_item(self.client, 'products', product_id, fields, 'products')
+        if mirrored is not None:
+            return mirrored
+        
+        return self.client.get(f'products/{product_id}', params=with_fields({}, 'products', fields))
     
     def create_product(self, product_data):
         """
@@ -99,6 +166,40 @@ class ProductManager:
         """
         return self.client.delete(f'products/{product_id}', params={'force': force})
     
+    def update_products(self, product_updates, raise_on_error=False):
+        """
+        Update several products through the batch endpoint
+        
+        Args:
+            product_updates (dict): Dictionary mapping product IDs to product data
+            raise_on_error (bool, optional): Raise BatchError if any update failed
+            
+        Returns:
+            list: BatchOperations with each product's result or error
+        """
+        writer = BatchWriter(self.client, 'products')
+        for product_id, product_data in product_updates.items():
+            writer.update(product_id, product_data)
+        return writer.flush(raise_on_error=raise_on_error)
+    
+    def delete_products(self, product_ids, raise_on_error=False):
+        """
+        Permanently delete several products through the batch endpoint
+        
+        WooCommerce batch deletes always bypass the trash.
+        
+        Args:
+            product_ids (list): Product IDs
+            raise_on_error (bool, optional): Raise BatchError if any delete failed
+            
+        Returns:
+            list: BatchOperations with each product's result or error
+        """
+        writer = BatchWriter(self.client, 'products')
+        for product_id in product_ids:
+            writer.delete(product_id)
+        return writer.flush(raise_on_error=raise_on_error)
+    
     def upload_product_image(self, product_id, image_path, alt_text=None, title=None, caption=None, description=None):
         """
         Upload a main image for a product
@@ -191,6 +292,41 @@ class ProductManager:
             dict: Updated product data
         """
         # Build the meta data object
+        meta_data = self._seo_meta_data(focus_keyword, meta_title, meta_description)
+        
+        # Only update if we have meta data to update
+        if meta_data:
+            return self.update_product(product_id, {'meta_data': meta_data})
+        
+        return self.get_product(product_id)
+    
+    def update_products_seo(self, seo_updates, raise_on_error=False):
+        """
+        Update SEO fields of several products through the batch endpoint
+        
+        Args:
+            seo_updates (dict): Dictionary mapping product IDs to dicts with
+                focus_keyword, meta_title and/or meta_description
+            raise_on_error (bool, optional): Raise BatchError if any update failed
+            
+        Returns:
+            list: BatchOperations with each product's result or error
+        """
+        product_updates = {}
+        for product_id, fields in seo_updates.items():
+            meta_data = self._seo_meta_data(
+                fields.get('focus_keyword'),
+                fields.get('meta_title'),
+                fields.get('meta_description')
+            )
+            if meta_data:
+                product_updates[product_id] = {'meta_data': meta_data}
+        
+        return self.update_products(product_updates, raise_on_error=raise_on_error)
+    
+    @staticmethod
+    def _seo_meta_data(focus_keyword=None, meta_title=None, meta_description=None):
+        """Build the RankMath meta_data list for the given SEO fields (shared with the async managers)"""
         meta_data = []
         
         if focus_keyword:
@@ -202,11 +338,7 @@ class ProductManager:
         if meta_description:
             meta_data.append({'key': 'rank_math_description', 'value': meta_description})
         
-        # Only update if we have meta data to update
-        if meta_data:
-            return self.update_product(product_id, {'meta_data': meta_data})
-        
-        return self.get_product(product_id)
+        return meta_data
     
     def get_product_count(self, **filters):
         """
@@ -218,21 +350,13 @@ class ProductManager:
         Returns:
             int: Total product count
         """
-        # Request with limit=1 to minimize data transfer
-        params = {
-            'per_page': 1,
-            **filters
-        }
-        
-        response = self.client.get('products', params=params)
-        
-        # WooCommerce API returns X-WP-Total header with the total count
-        total = response.headers.get('X-WP-Total')
-        if total:
-            return int(total)
+        # Request a single item: the count comes from the X-WP-Total header
+        result = self.get_products_page(per_page=1, fields='id', **filters)
+        if result.total is not None:
+            return result.total
         
         # Fallback: make another request to count
-        return len(self.client.get('products', params={'per_page': 100, **filters})) 
+        return len(self.client.get('products', params={'per_page': 100, **filters}))
 
 # Initialize ProductManager instance (can be shared)
 product_manager = ProductManager()
@@ -245,16 +369,16 @@ def index():
     """Display the list of products"""
     page = request.args.get('page', 1, type=int)
     per_page = Config.WOOCOMMERCE_ITEMS_PER_PAGE
-    search_term = request.args.get('search', '')
     
-    filters = {}
-    if search_term:
-        filters['search'] = search_term
+    # Advanced search: text, ID, SKU, category, brand, tag and upload dates
+    search_criteria = ProductSearch.criteria_from_args(request.args)
+    search_term = search_criteria.get('text', '')
         
     try:
-        products = product_manager.get_products(page=page, per_page=per_page, **filters)
-        total_products = product_manager.get_product_count(**filters)
-        total_pages = (total_products + per_page - 1) // per_page
+        # Answered by the catalog mirror's search index when it is fresh,
+        # otherwise by the store; either way one call returns the totals
+        products = ProductSearch(product_manager).search(page=page, per_page=per_page, **search_criteria)
+        total_pages = products.total_pages or page
     except Exception as e:
         flash(f"Error fetching products: {str(e)}", "error")
         products = []
@@ -265,6 +389,52 @@ def index():
                            products=products, 
                            current_page=page, 
                            total_pages=total_pages,
-                           search_term=search_term)
+                           search_term=search_term,
+                           search_criteria=search_criteria)
+
+@products_bp.route('/typeahead')
+@login_required
+def typeahead():
+    """
+    Autocomplete suggestions for edit forms (JSON)
+    
+    Query args: type (products, categories, brands or tags), q (text typed
+    so far), limit (capped at WOOCOMMERCE_TYPEAHEAD_MAX_LIMIT). While the
+    kind's index is first built the answer is empty with `building: true`.
+    """
+    kind = request.args.get('type', 'products')
+    if kind not in TYPEAHEAD_KINDS:
+        return jsonify({'success': False, 'message': 'Invalid type'}), 400
+    
+    client = product_manager.client
+    try:
+        suggestions = client.typeahead.suggest(client, kind, request.args.get('q', ''), request.args.get('limit', type=int))
+    except Exception as e:
+        return jsonify({'success': False, 'message': f"Error fetching suggestions: {str(e)}"}), 502
+    
+    return jsonify({'success': True, 'type': kind, **suggestions})
+
+@products_bp.route('/webhook', methods=['POST'])
+def webhook():
+    """
+    Receive product.created/updated/deleted webhooks from the store
+    
+    No login: deliveries are authenticated by their HMAC signature.
+    """
+    # WooCommerce pings a new webhook's URL (form body, no topic) and needs a 2xx
+    topic = request.headers.get('X-WC-Webhook-Topic')
+    if not topic:
+        return jsonify({'success': True})
+    
+    receiver = get_webhook_receiver(product_manager.client.store_url)
+    if not receiver.verify(request.get_data(), request.headers.get('X-WC-Webhook-Signature')):
+        return jsonify({'success': False, 'message': 'Invalid signature'}), 401
+    
+    payload = request.get_json(silent=True)
+    if not receiver.receive(topic, payload):
+        # Acknowledge anyway so the store doesn't disable the webhook
+        logging.warning(f"Ignored WooCommerce webhook {topic}")
+    
+    return jsonify({'success': True}), 202
 
 # Add other product-related routes here (e.g., create, edit, delete) if needed 
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Minimal-move reorder planning
+
+Given the current menu_order of each term and the order the user wants,
+work out the fewest menu_order writes that produce it:
+
+1. The longest subsequence of the desired order whose current menu_order
+   values are already strictly increasing stays where it is.
+2. Every other term gets a new value between its kept neighbours,
+   spread evenly so later moves usually find room too.
+3. Where two neighbours have no free value between them, the gap is
+   widened by also renumbering the nearest neighbours, alternating sides,
+   until the run fits.
+
+Terms created with menu_order 0 all share one value, so the first reorder
+of such a list renumbers it with ORDER_GAP spacing; after that, moving one
+term typically rewrites only that term.
+"""
+
+from bisect import bisect_left
+
+# Spacing between consecutive menu_order values when renumbering
+ORDER_GAP = 1024
+
+def longest_increasing_subsequence(values):
+    """
+    Find a longest strictly increasing subsequence
+    
+    Args:
+        values (list): Numbers, or None for positions that can't be kept
+    
+    Returns:
+        set: Indexes of the subsequence's elements
+    """
+    tails = []       # smallest tail value of an increasing run of each length
+    tail_index = []  # index of that tail
+    previous = [-1] * len(values)
+    
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[length] = value
+            tail_index[length] = i
+        previous[i] = tail_index[length - 1] if length > 0 else -1
+    
+    keep = set()
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        keep.add(i)
+        i = previous[i]
+    return keep
+
+def _fits(low, high, count):
+    """True if `count` integers fit strictly between low and high"""
+    if high is None:
+        return True
+    return high - (low if low is not None else -1) - 1 >= count
+
+def _spread(low, high, count, gap):
+    """Spread `count` integers strictly between low and high (high None = unbounded)"""
+    if high is None:
+        base = low if low is not None else -gap
+        return [base + gap * (n + 1) for n in range(count)]
+    
+    low = low if low is not None else -1
+    step = (high - low) // (count + 1)
+    return [low + step * (n + 1) for n in range(count)]
+
+def plan_reorder(current_orders, ordered_ids, gap=ORDER_GAP):
+    """
+    Plan the menu_order writes that put terms in the desired order
+    
+    Args:
+        current_orders (dict): Term ID -> current menu_order (missing IDs count as new)
+        ordered_ids (list): Term IDs in the desired order
+        gap (int, optional): Spacing used when values have to be renumbered
+    
+    Returns:
+        dict: Term ID -> new menu_order, only for terms whose value changes
+    """
+    values = [current_orders.get(term_id) for term_id in ordered_ids]
+    keep = longest_increasing_subsequence(values)
+    count = len(ordered_ids)
+    
+    start = 0
+    while start < count:
+        if start in keep:
+            start += 1
+            continue
+        
+        # Run of terms to place: [start, end)
+        end = start
+        while end < count and end not in keep:
+            end += 1
+        
+        widen_left = True
+        while True:
+            low = values[start - 1] if start > 0 else None
+            high = values[end] if end < count else None
+            if _fits(low, high, end - start):
+                break
+            # No room: renumber a neighbour too, alternating sides
+            if (widen_left and start > 0) or end >= count:
+                start -= 1
+                keep.discard(start)
+            else:
+                keep.discard(end)
+                end += 1
+                while end < count and end not in keep:
+                    end += 1
+            widen_left = not widen_left
+        
+        values[start:end] = _spread(low, high, end - start, gap)
+        start = end
+    
+    return {
+        term_id: value
+        for term_id, value in zip(ordered_ids, values)
+        if current_orders.get(term_id) != value
+    }
@@ -0,0 +1,442 @@
+"""
+Retry, adaptive concurrency and circuit breaking for WooCommerce calls
+
+- RetryPolicy retries idempotent calls on 429/502/503/504 and connection
+  errors with full-jitter exponential backoff, honoring Retry-After.
+  Read timeouts are not retried: each already waited WOOCOMMERCE_TIMEOUT.
+- AIMDController bounds the requests in flight to one store: it adds
+  one slot per window of healthy responses and halves the limit when the
+  store answers with overload statuses, times out or gets slow. Bulk
+  requests (sent inside bulk_requests(): iter_all pages, batch chunks,
+  mirror syncs) leave WOOCOMMERCE_CONCURRENCY_RESERVED slots to
+  interactive calls and wait while one is queued.
+- CircuitBreaker stops calling a store that keeps failing: after
+  WOOCOMMERCE_BREAKER_THRESHOLD consecutive failures calls fail fast (or
+  are answered from the cache) for WOOCOMMERCE_BREAKER_COOLDOWN seconds,
+  then a single probe decides whether the store is back.
+
+Every request of a WooCommerceClient goes through all three, so bulk work
+(iter_all pages, batch chunks) runs as fast as each store tolerates.
+AsyncWooCommerceClient applies the retry policy and the breaker; its own
+semaphore bounds its concurrency.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from config import Config
+
+# Statuses that mean "try again later" rather than "this request is wrong"
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Statuses that mean the store (or the host in front of it) is down
+FAILURE_STATUSES = frozenset({502, 503, 504})
+
+# Methods safe to resend after an unknown outcome
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header
+    
+    Args:
+        value (str): Seconds or an HTTP date
+    
+    Returns:
+        float: Seconds to wait, or None if missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RetryPolicy:
+    """
+    Decides whether and when to resend a failed WooCommerce call
+    """
+    
+    def __init__(self, max_retries=None, backoff=None, max_delay=None):
+        """
+        Initialize the retry policy
+        
+        Args:
+            max_retries (int, optional): Retries after the first attempt
+            backoff (float, optional): Base delay in seconds (doubled per attempt)
+            max_delay (float, optional): Longest wait; a longer Retry-After gives up
+        """
+        self.max_retries = max_retries if max_retries is not None else Config.WOOCOMMERCE_MAX_RETRIES
+        self.backoff = backoff if backoff is not None else Config.WOOCOMMERCE_RETRY_BACKOFF
+        self.max_delay = max_delay if max_delay is not None else Config.WOOCOMMERCE_RETRY_MAX_DELAY
+    
+    def should_retry(self, method, attempt, response=None, error=None):
+        """
+        Check whether a call should be resent
+        
+        Args:
+            method (str): HTTP method
+            attempt (int): Retries already made
+            response (Response, optional): The response, if one arrived
+            error (Exception, optional): The connection error, if none did
+        
+        Returns:
+            bool: True to retry
+        """
+        if attempt >= self.max_retries:
+            return False
+        
+        if response is not None:
+            if response.status_code not in RETRY_STATUSES:
+                return False
+            # A 429 was rejected before processing, so even POSTs are safe
+            if method not in IDEMPOTENT_METHODS and response.status_code != 429:
+                return False
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            return retry_after is None or retry_after <= self.max_delay
+        
+        return error is not None and method in IDEMPOTENT_METHODS
+    
+    def delay(self, attempt, response=None):
+        """
+        Seconds to wait before the next attempt
+        
+        Args:
+            attempt (int): Retries already made
+            response (Response, optional): The last response (for Retry-After)
+        
+        Returns:
+            float: Delay in seconds
+        """
+        retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # Full jitter: spreads retries of concurrent callers apart
+        return random.uniform(0, min(self.max_delay, self.backoff * (2 ** attempt)))
+
+# Whether the current thread is sending bulk requests
+_bulk = threading.local()
+
+@contextmanager
+def bulk_requests():
+    """Mark the requests this thread sends inside the block as bulk work (see AIMDController)"""
+    previous = getattr(_bulk, 'active', False)
+    _bulk.active = True
+    try:
+        yield
+    finally:
+        _bulk.active = previous
+
+def in_bulk_requests():
+    """True if the current thread is inside bulk_requests()"""
+    return getattr(_bulk, 'active', False)
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease limit on requests in flight
+    
+    Callers wrap each request in acquire()/release(). A healthy response
+    adds 1/limit to the limit (about one slot per window of responses); an
+    overloaded one multiplies it by `decrease`. Requests sent before the
+    last decrease don't trigger another one, so a burst of failures from
+    one window counts once.
+    
+    Bulk requests may fill at most `limit - reserved` slots (at least one)
+    and yield to queued interactive requests, so a page walk or batch
+    flush can't push a user's request to the back of the queue.
+    """
+    
+    def __init__(self, initial=None, minimum=1, maximum=None, latency_target=None, decrease=0.5, reserved=None):
+        """
+        Initialize the controller
+        
+        Args:
+            initial (int, optional): Starting limit
+            minimum (int, optional): Lowest limit
+            maximum (int, optional): Highest limit
+            latency_target (float, optional): Seconds above which a response counts as overloaded
+            decrease (float, optional): Factor applied on overload
+            reserved (int, optional): Slots bulk requests leave to interactive ones
+        """
+        self.minimum = minimum
+        self.maximum = maximum or Config.WOOCOMMERCE_CONCURRENCY_MAX
+        self.limit = float(min(self.maximum, initial or Config.WOOCOMMERCE_CONCURRENCY_INITIAL))
+        self.latency_target = latency_target or Config.WOOCOMMERCE_LATENCY_TARGET
+        self.decrease = decrease
+        self.reserved = Config.WOOCOMMERCE_CONCURRENCY_RESERVED if reserved is None else reserved
+        self.in_flight = 0
+        self.bulk_in_flight = 0
+        self._interactive_waiting = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self.counters = {'requests': 0, 'overloaded': 0, 'decreases': 0, 'waits': 0}
+    
+    def _full(self, bulk):
+        """Whether a request must wait for a slot (caller holds the condition)"""
+        if self.in_flight >= int(self.limit):
+            return True
+        return bulk and (self._interactive_waiting > 0 or self.bulk_in_flight >= max(1, int(self.limit) - self.reserved))
+    
+    def acquire(self, bulk=False):
+        """
+        Wait for a free slot
+        
+        Args:
+            bulk (bool, optional): Bulk request (limited to the non-reserved slots)
+        
+        Returns:
+            float: Start time, to pass to release()
+        """
+        with self._condition:
+            if self._full(bulk):
+                self.counters['waits'] += 1
+                if not bulk:
+                    self._interactive_waiting += 1
+                try:
+                    while self._full(bulk):
+                        self._condition.wait()
+                finally:
+                    if not bulk:
+                        self._interactive_waiting -= 1
+            self.in_flight += 1
+            if bulk:
+                self.bulk_in_flight += 1
+        return time.monotonic()
+    
+    def release(self, started, overloaded=False, bulk=False):
+        """
+        Free a slot and adjust the limit
+        
+        Args:
+            started (float): Value returned by acquire()
+            overloaded (bool, optional): True for overload statuses, timeouts and connection errors
+            bulk (bool, optional): Value passed to acquire()
+        """
+        now = time.monotonic()
+        overloaded = overloaded or now - started > self.latency_target
+        
+        with self._condition:
+            self.in_flight -= 1
+            if bulk:
+                self.bulk_in_flight -= 1
+            self.counters['requests'] += 1
+            if overloaded:
+                self.counters['overloaded'] += 1
+                if started >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+                    self.counters['decreases'] += 1
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+    
+    def stats(self):
+        """
+        Get controller statistics
+        
+        Returns:
+            dict: Current limit, requests in flight (all and bulk) and counters
+        """
+        with self._condition:
+            return {'limit': round(self.limit, 2), 'in_flight': self.in_flight, 'bulk_in_flight': self.bulk_in_flight, **self.counters}
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a store whose circuit is open
+    """
+    
+    def __init__(self, store_url, retry_in):
+        self.store_url = store_url
+        self.retry_in = retry_in
+        super().__init__(f"WooCommerce store {store_url} is unreachable; retrying in {retry_in:.0f}s")
+
+class CircuitBreaker:
+    """
+    Per-store circuit breaker
+    
+    - closed: calls go through; consecutive failures (timeouts, dropped
+      connections, 502/503/504) are counted and `threshold` of them open it.
+    - open: calls raise CircuitOpenError without touching the network
+      until `cooldown` seconds have passed.
+    - half_open: one probe call goes through; success closes the circuit,
+      failure opens it for another cool-down. Other calls keep failing fast
+      while the probe is out.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, store_url, threshold=None, cooldown=None):
+        """
+        Initialize the circuit breaker
+        
+        Args:
+            store_url (str): WooCommerce store URL
+            threshold (int, optional): Consecutive failures that open the circuit
+            cooldown (float, optional): Seconds the circuit stays open
+        """
+        self.store_url = store_url
+        self.threshold = threshold or Config.WOOCOMMERCE_BREAKER_THRESHOLD
+        self.cooldown = cooldown or Config.WOOCOMMERCE_BREAKER_COOLDOWN
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._probing = False
+        self._lock = threading.Lock()
+        self.counters = {'opened': 0, 'rejected': 0, 'stale_served': 0}
+    
+    def before_call(self):
+        """
+        Let a call through or fail it fast
+        
+        Raises:
+            CircuitOpenError: If the circuit is open (or half-open with a probe out)
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            retry_in = self.opened_at + self.cooldown - time.monotonic()
+            if self.state == self.OPEN and retry_in <= 0:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.counters['rejected'] += 1
+        raise CircuitOpenError(self.store_url, max(0.0, retry_in))
+    
+    def record_success(self):
+        """Record a call that reached a working store"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logging.warning(f"WooCommerce store {self.store_url} is reachable again, closing circuit")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+    
+    def record_failure(self, error):
+        """
+        Record a call that found the store unreachable
+        
+        Args:
+            error (str): Description of the failure
+        """
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self._probing = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.counters['opened'] += 1
+                logging.error(f"WooCommerce store {self.store_url} failed {self.failures} times ({error}), opening circuit for {self.cooldown}s")
+    
+    def record(self, response=None, error=None):
+        """
+        Record the outcome of a call
+        
+        Args:
+            response (Response, optional): The response, if one arrived
+            error (Exception, optional): The connection error, if none did
+        """
+        if error is not None:
+            self.record_failure(str(error) or type(error).__name__)
+        elif response.status_code in FAILURE_STATUSES:
+            self.record_failure(f"status {response.status_code}")
+        else:
+            self.record_success()
+    
+    def cancel_probe(self):
+        """Release the probe slot of a call that never reached the store"""
+        with self._lock:
+            self._probing = False
+    
+    def served_stale(self):
+        """Count a call answered from the cache while the circuit was open"""
+        with self._lock:
+            self.counters['stale_served'] += 1
+    
+    def stats(self):
+        """
+        Get circuit statistics
+        
+        Returns:
+            dict: State, consecutive failures, seconds until the next probe,
+                last error and counters
+        """
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0, round(self.opened_at + self.cooldown - time.monotonic()))
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'threshold': self.threshold,
+                'retry_in': retry_in,
+                'last_error': self.last_error,
+                **self.counters
+            }
+
+# One controller and one breaker per store, shared by every client of that store
+_controllers = {}
+_breakers = {}
+_controllers_lock = threading.Lock()
+
+def get_store_controller(store_url):
+    """
+    Get the shared concurrency controller of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        AIMDController: The store's controller
+    """
+    with _controllers_lock:
+        controller = _controllers.get(store_url)
+        if controller is None:
+            controller = AIMDController()
+            _controllers[store_url] = controller
+        return controller
+
+def get_store_breaker(store_url):
+    """
+    Get the shared circuit breaker of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        CircuitBreaker: The store's breaker
+    """
+    with _controllers_lock:
+        breaker = _breakers.get(store_url)
+        if breaker is None:
+            breaker = CircuitBreaker(store_url)
+            _breakers[store_url] = breaker
+        return breaker
+
+def _after_fork_in_child():
+    """Requests in flight belong to the parent: start the child's controllers and probes empty"""
+    global _controllers_lock
+    _controllers_lock = threading.Lock()
+    for controller in _controllers.values():
+        controller._condition = threading.Condition()
+        controller.in_flight = 0
+        controller.bulk_in_flight = 0
+        controller._interactive_waiting = 0
+    for breaker in _breakers.values():
+        breaker._lock = threading.Lock()
+        breaker._probing = False
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, session, render_template, redirect, url_for, flash
 from flask_login import login_required, current_user
+from modules.woocommerce.pool import get_client
 from modules.woocommerce.client import WooCommerceClient
 from modules.woocommerce.products import ProductManager
 from modules.woocommerce.categories import CategoryManager
@@ -11,13 +12,29 @@ woocommerce_bp = Blueprint('woocommerce', __name__)
 
 # Helper function to get WooCommerce client
 def get_wc_client():
-    """Get a WooCommerce client using the current credentials"""
-    return WooCommerceClient(
+    """Get the shared WooCommerce client for the current credentials"""
+    return get_client(
         store_url=session.get('woocommerce_store_url', Config.WOOCOMMERCE_STORE_URL),
         consumer_key=session.get('woocommerce_consumer_key', Config.WOOCOMMERCE_CONSUMER_KEY),
         consumer_secret=session.get('woocommerce_consumer_secret', Config.WOOCOMMERCE_CONSUMER_SECRET)
     )
 
+def test_credentials(store_url, consumer_key, consumer_secret):
+    """
+    Test typed-in credentials on a standalone client
+    
+    Unverified credentials must not go through the client registry: a wrong
+    secret would replace the store's working pooled client.
+    
+    Returns:
+        bool: True if the store accepted the credentials
+    """
+    client = WooCommerceClient(store_url=store_url, consumer_key=consumer_key, consumer_secret=consumer_secret)
+    try:
+        return client.test_connection()
+    finally:
+        client.session.close()
+
 # ============= API Configuration Routes =============
 
 @woocommerce_bp.route('/configure', methods=['GET', 'POST'])
@@ -36,13 +53,7 @@ def configure():
             return render_template('woocommerce/configure.html')
         
         # Test connection
-        client = WooCommerceClient(
-            store_url=store_url,
-            consumer_key=consumer_key,
-            consumer_secret=consumer_secret
-        )
-        
-        if client.test_connection():
+        if test_credentials(store_url, consumer_key, consumer_secret):
             # Save to session
             session['woocommerce_store_url'] = store_url
             session['woocommerce_consumer_key'] = consumer_key
@@ -72,7 +83,7 @@ def status():
     # Get WooCommerce client
     client = get_wc_client()
     
-    # Check connection
+    # Check connection (fails fast while the store's circuit is open)
     connection_status = client.test_connection()
     
     # Get store information
@@ -83,21 +94,18 @@ def status():
     
     if connection_status:
         try:
-            # Get simple product count for status display
+            # Counts come from the X-WP-Total header of a one-item page
             product_manager = ProductManager(client)
-            products = product_manager.get_products(per_page=1)
-            product_count = products.headers.get('X-WP-Total', 0) if hasattr(products, 'headers') else 0
+            product_count = product_manager.get_products_page(per_page=1, fields='id').total or 0
             
             # Get category count
             category_manager = CategoryManager(client)
-            categories = category_manager.get_categories(per_page=1)
-            category_count = categories.headers.get('X-WP-Total', 0) if hasattr(categories, 'headers') else 0
+            category_count = category_manager.get_categories_page(per_page=1, fields='id').total or 0
             
             # Get brand count
             try:
                 brand_manager = BrandManager(client)
-                brands = brand_manager.get_brands(per_page=1)
-                brand_count = brands.headers.get('X-WP-Total', 0) if hasattr(brands, 'headers') else 0
+                brand_count = brand_manager.get_brands_page(per_page=1, fields='id').total or 0
             except:
                 # Brand taxonomy might not exist
                 brand_count = 0
@@ -110,7 +118,8 @@ def status():
         store_url=client.store_url,
         product_count=product_count,
         category_count=category_count,
-        brand_count=brand_count
+        brand_count=brand_count,
+        circuit=client.breaker.stats()
     )
 
 # ============= API Endpoints =============
@@ -133,13 +142,7 @@ def test_connection():
         }), 400
     
     # Test connection
-    client = WooCommerceClient(
-        store_url=store_url,
-        consumer_key=consumer_key,
-        consumer_secret=consumer_secret
-    )
-    
-    success = client.test_connection()
+    success = test_credentials(store_url, consumer_key, consumer_secret)
     
     if success:
         return jsonify({
@@ -0,0 +1,160 @@
+"""
+Product search
+
+ProductSearch turns the advanced search form (text, ID, SKU, category,
+brand, tag, upload date range) into WooCommerce list filters. The catalog
+mirror answers them with its FTS5 index over name, SKU, slug and
+description (prefix matching, ranked by bm25) plus indexed membership and
+date filters; when the mirror isn't ready the same filters go to the store.
+"""
+
+import re
+import html
+from datetime import date, timedelta
+from config import Config
+
+# Longest search text accepted (longer input is cut)
+MAX_QUERY_LENGTH = 200
+
+_TAGS = re.compile(r'<[^>]+>')
+_TOKENS = re.compile(r'\w+', re.UNICODE)
+
+def search_text(value):
+    """
+    Plain text of an HTML field, for the search index
+    
+    Args:
+        value (str): HTML (e.g. a product description)
+    
+    Returns:
+        str: Text without tags and entities
+    """
+    if not value:
+        return ''
+    return html.unescape(_TAGS.sub(' ', value))
+
+def fts_query(text):
+    """
+    Build an FTS5 MATCH expression where every word must match as a prefix
+    
+    'blue shirt' -> '"blue"* "shirt"*'; punctuation only separates words,
+    so user input can't inject FTS5 syntax.
+    
+    Args:
+        text (str): User search text
+    
+    Returns:
+        str: MATCH expression, or None if the text has no words
+    """
+    tokens = _TOKENS.findall(str(text)[:MAX_QUERY_LENGTH])
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+def _parse_date(value):
+    """Parse a YYYY-MM-DD form value, or None"""
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+class ProductSearch:
+    """
+    Multi-field product search over the catalog mirror (or the store)
+    """
+    
+    # Form fields read by from_args()
+    FIELDS = ('search', 'id', 'sku', 'category', 'brand', 'tag', 'date_from', 'date_to')
+    
+    def __init__(self, product_manager):
+        """
+        Initialize the product search
+        
+        Args:
+            product_manager (ProductManager): Manager whose list requests run the search
+        """
+        self.product_manager = product_manager
+    
+    def build_filters(self, text=None, product_id=None, sku=None, category=None, brand=None, tag=None,
+                      date_from=None, date_to=None):
+        """
+        Turn search criteria into WooCommerce list filters
+        
+        Args:
+            text (str, optional): Words matched against name, SKU, slug and description
+            product_id (int, optional): Product ID
+            sku (str, optional): Exact SKU
+            category (int, optional): Category ID
+            brand (int, optional): Brand ID
+            tag (int, optional): Tag ID
+            date_from (str, optional): First upload date (YYYY-MM-DD)
+            date_to (str, optional): Last upload date (YYYY-MM-DD, inclusive)
+        
+        Returns:
+            dict: Filters for ProductManager.get_products_page
+        """
+        filters = {}
+        if text and fts_query(text):
+            # No orderby: the mirror ranks text matches by relevance, the store by date
+            filters['search'] = str(text)[:MAX_QUERY_LENGTH]
+        if product_id:
+            filters['include'] = [int(product_id)]
+        if sku:
+            filters['sku'] = sku
+        for name, value in (('category', category), ('brand', brand), ('tag', tag)):
+            if value:
+                filters[name] = int(value)
+        
+        start = _parse_date(date_from) if date_from else None
+        end = _parse_date(date_to) if date_to else None
+        if start or end:
+            filters['dates_are_gmt'] = 'true'
+        if start:
+            filters['after'] = f"{start.isoformat()}T00:00:00"
+        if end:
+            filters['before'] = f"{(end + timedelta(days=1)).isoformat()}T00:00:00"
+        return filters
+    
+    def search(self, page=1, per_page=None, fields='list', **criteria):
+        """
+        Run a search
+        
+        Args:
+            page (int, optional): Page number
+            per_page (int, optional): Items per page
+            fields (str or list, optional): Field profile or field names
+            **criteria: Arguments of build_filters()
+        
+        Returns:
+            PagedResult: Matching products plus totals
+        """
+        filters = self.build_filters(**criteria)
+        return self.product_manager.get_products_page(
+            page=page,
+            per_page=per_page or Config.WOOCOMMERCE_ITEMS_PER_PAGE,
+            fields=fields,
+            **filters
+        )
+    
+    @classmethod
+    def criteria_from_args(cls, args):
+        """
+        Read search criteria from request arguments
+        
+        Args:
+            args (MultiDict): request.args of the product list page
+        
+        Returns:
+            dict: Non-empty criteria keyed like build_filters() arguments
+        """
+        names = {'search': 'text', 'id': 'product_id'}
+        criteria = {}
+        for field in cls.FIELDS:
+            value = (args.get(field) or '').strip()
+            if not value:
+                continue
+            # IDs must be numeric; ignore anything else rather than fail the page
+            if field in ('id', 'category', 'brand', 'tag') and not value.isdigit():
+                continue
+            criteria[names.get(field, field)] = value
+        return criteria
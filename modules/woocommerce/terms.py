@@ -0,0 +1,374 @@
+"""
+Shared taxonomy term cache
+
+TermCache keeps the categories, brands (BrandManager's taxonomy), tags and
+global attributes of a store in memory, indexed by id, slug and
+lower-cased name, so term IDs found on products can be turned into names
+(and names into IDs) without an API call:
+
+- Each kind is loaded on first use through its manager (every page, or
+  the catalog mirror when it is fresh) and reloaded in the background
+  after WOOCOMMERCE_TERM_CACHE_TTL; lookups keep using the old copy
+  meanwhile.
+- There is one cache per store, shared by every client and manager, and
+  term writes made through WooCommerceClient update it in place.
+"""
+
+import os
+import html
+import time
+import logging
+import threading
+from config import Config
+from modules.woocommerce.cache import normalize_endpoint
+from modules.woocommerce.mirror import write_target
+
+# Cached kinds and the fields kept for each term
+KINDS = ('categories', 'brands', 'tags', 'attributes')
+TERM_FIELDS = 'id,name,slug,parent'
+
+def iter_terms(client, kind, fields=TERM_FIELDS):
+    """
+    Read every term of a kind through its manager (mirror first, then the store)
+    
+    Args:
+        client (WooCommerceClient): Client of the store
+        kind (str): 'categories', 'brands', 'tags' or 'attributes'
+        fields (str, optional): Comma-separated fields to fetch
+    
+    Returns:
+        iterable: Term dicts
+    """
+    if kind == 'categories':
+        from modules.woocommerce.categories import CategoryManager
+        return CategoryManager(client).iter_all(fields=fields)
+    if kind == 'brands':
+        from modules.woocommerce.brands import BrandManager
+        return BrandManager(client).iter_all(fields=fields)
+    if kind == 'attributes':
+        # Global attributes are few and not paginated
+        return client.get('products/attributes', use_cache=False)
+    
+    # No tag manager: same mirror-then-store read the managers do
+    from modules.woocommerce.mirror import mirror_page
+    from modules.woocommerce.paging import iter_pages
+    mirrored = mirror_page(client, 'tags', 1, None, fields, {})
+    if mirrored is not None:
+        return iter(mirrored.items)
+    
+    def fetch_page(page, size):
+        return client.get_page('products/tags', page=page, per_page=size, params={'_fields': fields}, use_cache=False)
+    
+    return iter_pages(fetch_page)
+
+def _name_key(name):
+    """Lower-cased name without HTML entities (WooCommerce escapes '&' in term names)"""
+    return html.unescape(str(name or '')).strip().lower()
+
+class TermIndex:
+    """
+    Terms of one kind, indexed by id, slug and lower-cased name
+    """
+    
+    def __init__(self, terms=()):
+        """
+        Initialize the index
+        
+        Args:
+            terms (iterable, optional): Term dicts
+        """
+        self.by_id = {}
+        self.by_slug = {}
+        self.by_name = {}
+        for term in terms:
+            self.add(term)
+    
+    def add(self, term):
+        """
+        Add a term, replacing an earlier version of it
+        
+        Args:
+            term (dict): Term with at least 'id'
+        """
+        self.remove(term['id'])
+        term = {**term, 'name': html.unescape(str(term.get('name') or ''))}
+        self.by_id[term['id']] = term
+        if term.get('slug'):
+            self.by_slug[term['slug']] = term
+        if term['name']:
+            self.by_name.setdefault(_name_key(term['name']), term)
+    
+    def remove(self, term_id):
+        """
+        Remove a term
+        
+        Args:
+            term_id (int): Term ID
+        """
+        term = self.by_id.pop(term_id, None)
+        if term is None:
+            return
+        if self.by_slug.get(term.get('slug')) is term:
+            del self.by_slug[term['slug']]
+        key = _name_key(term['name'])
+        if self.by_name.get(key) is term:
+            del self.by_name[key]
+            # Another term may share the name
+            for other in self.by_id.values():
+                if _name_key(other['name']) == key:
+                    self.by_name[key] = other
+                    break
+    
+    def __len__(self):
+        return len(self.by_id)
+
+class TermCache:
+    """
+    Term indexes of one store
+    """
+    
+    def __init__(self, store_url, ttl=None):
+        """
+        Initialize the term cache
+        
+        Args:
+            store_url (str): WooCommerce store URL
+            ttl (float, optional): Seconds before a kind is reloaded
+        """
+        self.store_url = store_url
+        self.ttl = ttl or Config.WOOCOMMERCE_TERM_CACHE_TTL
+        self._indexes = {}
+        self._loaded_at = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _after_fork_in_child(self):
+        """Locks may have been held at fork time, and refresh threads don't survive it"""
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = set()
+    
+    def load(self, client, kind):
+        """
+        (Re)load the terms of a kind
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): One of KINDS
+        
+        Returns:
+            TermIndex: The new index
+        """
+        started = time.time()
+        index = TermIndex(term for term in iter_terms(client, kind) if isinstance(term, dict) and 'id' in term)
+        with self._lock:
+            self._indexes[kind] = index
+            self._loaded_at[kind] = started
+        return index
+    
+    def index(self, client, kind):
+        """
+        Get the index of a kind, loading it on first use and reloading it in the background when stale
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): One of KINDS
+        
+        Returns:
+            TermIndex: The index (empty if the first load failed)
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown term kind: {kind}")
+        
+        with self._lock:
+            index = self._indexes.get(kind)
+            stale = index is not None and time.time() - self._loaded_at[kind] > self.ttl and kind not in self._refreshing
+            if stale:
+                self._refreshing.add(kind)
+        
+        if index is None:
+            with self._load_lock:
+                index = self._indexes.get(kind)
+                if index is None:
+                    try:
+                        index = self.load(client, kind)
+                    except Exception as e:
+                        # Callers fall back to what the product carries; the next call retries
+                        logging.warning(f"Term cache load of {kind} failed for {self.store_url}: {str(e)}")
+                        return TermIndex()
+        elif stale:
+            def run():
+                try:
+                    self.load(client, kind)
+                except Exception as e:
+                    logging.warning(f"Term cache reload of {kind} failed for {self.store_url}: {str(e)}")
+                finally:
+                    with self._lock:
+                        self._refreshing.discard(kind)
+            
+            threading.Thread(target=run, name='wc-terms', daemon=True).start()
+        return index
+    
+    def get(self, client, kind, term_id):
+        """
+        Get a term by ID
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): One of KINDS
+            term_id (int or str): Term ID
+        
+        Returns:
+            dict: The term, or None if unknown
+        """
+        try:
+            term_id = int(term_id)
+        except (TypeError, ValueError):
+            return None
+        return self.index(client, kind).by_id.get(term_id)
+    
+    def find(self, client, kind, slug=None, name=None):
+        """
+        Get a term by slug or (case-insensitive) name
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): One of KINDS
+            slug (str, optional): Term slug
+            name (str, optional): Term name
+        
+        Returns:
+            dict: The term, or None if unknown
+        """
+        index = self.index(client, kind)
+        if slug:
+            return index.by_slug.get(slug)
+        if name:
+            return index.by_name.get(_name_key(name))
+        return None
+    
+    def names(self, client, kind, terms):
+        """
+        Names of the terms referenced by a product
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): One of KINDS
+            terms (list): Term references ({'id', 'name'} dicts, bare IDs or names)
+        
+        Returns:
+            list: Names (references without a known name are skipped)
+        """
+        names = []
+        for term in terms or []:
+            if isinstance(term, dict):
+                name = term.get('name') or (self.get(client, kind, term.get('id')) or {}).get('name')
+            elif isinstance(term, int) or str(term).strip().isdigit():
+                name = (self.get(client, kind, term) or {}).get('name')
+            else:
+                name = str(term).strip()
+            if name:
+                names.append(html.unescape(name))
+        return names
+    
+    def product_brands(self, client, product):
+        """
+        Brand names of a product
+        
+        Uses the product's 'brands' field (WooCommerce 9.6+), then the
+        `_product_brand` meta value of brand plugins (IDs or names).
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            product (dict): Product data
+        
+        Returns:
+            list: Brand names (empty if the product has no brand)
+        """
+        if product.get('brands'):
+            return self.names(client, 'brands', product['brands'])
+        
+        for item in product.get('meta_data') or []:
+            if item.get('key') == '_product_brand' and item.get('value'):
+                value = item['value']
+                if isinstance(value, str) and ',' in value:
+                    value = value.split(',')
+                return self.names(client, 'brands', value if isinstance(value, list) else [value])
+        return []
+    
+    def apply_write(self, method, endpoint, result):
+        """
+        Apply a successful term write's response to the loaded indexes
+        
+        Args:
+            method (str): POST, PUT or DELETE
+            endpoint (str): Endpoint written to (e.g. 'products/tags/12')
+            result (dict): Decoded response
+        """
+        parts = normalize_endpoint(endpoint).split('/')
+        if parts[:2] == ['products', 'attributes'] and len(parts) <= 3:
+            kind, batch = 'attributes', parts[-1] == 'batch'
+        else:
+            kind, batch = write_target(endpoint)
+        if kind not in KINDS or not isinstance(result, dict):
+            return
+        
+        valid = lambda items: [item for item in items or [] if isinstance(item, dict) and 'id' in item and not item.get('error')]
+        if batch:
+            written, removed = valid(result.get('create')) + valid(result.get('update')), valid(result.get('delete'))
+        elif method == 'DELETE':
+            written, removed = [], valid([result])
+        else:
+            written, removed = valid([result]), []
+        
+        with self._lock:
+            index = self._indexes.get(kind)
+            if index is None:
+                return
+            for term in removed:
+                index.remove(term['id'])
+            for term in written:
+                index.add(term)
+    
+    def stats(self):
+        """
+        Get term cache statistics
+        
+        Returns:
+            dict: Kind -> cached term count (None if not loaded)
+        """
+        with self._lock:
+            return {kind: len(self._indexes[kind]) if kind in self._indexes else None for kind in KINDS}
+
+# One cache per store, shared by every client and manager of that store
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_store_terms(store_url):
+    """
+    Get the term cache of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        TermCache: The store's term cache
+    """
+    with _caches_lock:
+        cache = _caches.get(store_url)
+        if cache is None:
+            cache = TermCache(store_url)
+            _caches[store_url] = cache
+        return cache
+
+def _after_fork_in_child():
+    """Replace the registry lock, which may have been held at fork time"""
+    global _caches_lock
+    _caches_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,356 @@
+"""
+In-memory typeahead for edit forms
+
+Autocomplete of products (by name or SKU), categories, brands and tags is
+answered from a sorted-prefix array per store and kind instead of a store
+request per keystroke:
+
+- Each item is indexed under its normalized name (lower-cased, accents
+  and HTML entities removed), every word-suffix of the name ('blue cotton
+  shirt', 'cotton shirt', 'shirt') and, for products, its SKU. A lookup is
+  a binary search for the prefix followed by a short forward scan.
+- An index is built in the background on first use from the manager list
+  reads (so from the catalog mirror when it is fresh); until it is ready,
+  lookups answer an empty list flagged `building` instead of waiting. It is
+  rebuilt in the background after WOOCOMMERCE_TYPEAHEAD_TTL, and lookups
+  keep using the old index meanwhile. Each kind builds independently.
+- Writes made through WooCommerceClient (single and batch) update built
+  indexes in place from the store's response, and so do product webhooks,
+  in every worker process (through the change feed, checked on lookup).
+"""
+
+import os
+import html
+import time
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from config import Config
+from modules.woocommerce.mirror import write_target
+from modules.woocommerce.terms import iter_terms
+from modules.woocommerce.changes import poll_changes
+
+# Kinds with a typeahead index
+KINDS = ('products', 'categories', 'brands', 'tags')
+
+# Fields fetched to build each kind's index
+KIND_FIELDS = {
+    'products': 'id,name,sku,status',
+    'categories': 'id,name,slug,parent',
+    'brands': 'id,name,slug',
+    'tags': 'id,name,slug',
+}
+
+# Longest query and label accepted (longer values are cut)
+MAX_QUERY_LENGTH = 100
+MAX_LABEL_LENGTH = 200
+
+def normalize(text):
+    """
+    Normalize text for prefix matching
+    
+    Args:
+        text (str): Name, SKU or query (may contain HTML entities)
+    
+    Returns:
+        str: Lower-cased text without accents and with single spaces
+    """
+    text = unicodedata.normalize('NFKD', html.unescape(str(text or '')))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.lower().split())
+
+class PrefixIndex:
+    """
+    Sorted array of (key, id) entries with prefix lookups
+    """
+    
+    def __init__(self, entries=None):
+        """
+        Initialize the index
+        
+        Args:
+            entries (iterable, optional): (item_id, label, keys) tuples to index
+        """
+        self.items = {}
+        self._keys = {}
+        self._entries = []
+        for item_id, label, keys in entries or ():
+            self.items[item_id] = label
+            self._keys[item_id] = keys
+            self._entries.extend((key, item_id) for key in keys)
+        self._entries.sort()
+    
+    def add(self, item_id, label, keys):
+        """
+        Add an item, replacing an earlier version of it
+        
+        Args:
+            item_id (int): Item ID
+            label (dict): Suggestion returned for the item
+            keys (list): Normalized keys the item is found under
+        """
+        self.remove(item_id)
+        self.items[item_id] = label
+        self._keys[item_id] = keys
+        for key in keys:
+            insort(self._entries, (key, item_id))
+    
+    def remove(self, item_id):
+        """
+        Remove an item
+        
+        Args:
+            item_id (int): Item ID
+        """
+        self.items.pop(item_id, None)
+        for key in self._keys.pop(item_id, ()):
+            position = bisect_left(self._entries, (key, item_id))
+            if position < len(self._entries) and self._entries[position] == (key, item_id):
+                del self._entries[position]
+    
+    def search(self, prefix, limit):
+        """
+        Find items with a key starting with a prefix
+        
+        Args:
+            prefix (str): Normalized prefix
+            limit (int): Most items returned
+        
+        Returns:
+            tuple: (labels in key order, True if more items matched)
+        """
+        found = {}
+        position = bisect_left(self._entries, (prefix,))
+        while position < len(self._entries):
+            key, item_id = self._entries[position]
+            if not key.startswith(prefix):
+                break
+            if item_id not in found:
+                if len(found) == limit:
+                    return list(found.values()), True
+                found[item_id] = self.items[item_id]
+            position += 1
+        return list(found.values()), False
+    
+    def __len__(self):
+        return len(self.items)
+
+def _entry(kind, item):
+    """Turn a product or term into an (id, label, keys) tuple, or None if it can't be suggested"""
+    if not isinstance(item, dict) or 'id' not in item or item.get('error'):
+        return None
+    if kind == 'products' and item.get('status') == 'trash':
+        return None
+    
+    name = html.unescape(str(item.get('name') or ''))[:MAX_LABEL_LENGTH]
+    label = {'id': item['id'], 'name': name}
+    if kind == 'products':
+        label['sku'] = item.get('sku') or ''
+    elif kind == 'categories':
+        label['parent'] = item.get('parent') or 0
+    
+    words = normalize(name).split()
+    keys = {' '.join(words[start:]) for start in range(len(words))}
+    if label.get('sku'):
+        keys.add(normalize(label['sku']))
+    return item['id'], label, sorted(keys)
+
+def _load(client, kind):
+    """Read every item of a kind through its manager (mirror first, then the store)"""
+    if kind == 'products':
+        from modules.woocommerce.products import ProductManager
+        return ProductManager(client).iter_all(fields=KIND_FIELDS[kind])
+    return iter_terms(client, kind, KIND_FIELDS[kind])
+
+class TypeaheadService:
+    """
+    Typeahead indexes of one store
+    """
+    
+    def __init__(self, store_url, ttl=None):
+        """
+        Initialize the typeahead service
+        
+        Args:
+            store_url (str): WooCommerce store URL
+            ttl (float, optional): Seconds before an index is rebuilt
+        """
+        self.store_url = store_url
+        self.ttl = ttl or Config.WOOCOMMERCE_TYPEAHEAD_TTL
+        self._indexes = {}
+        self._built_at = {}
+        self._building = set()
+        self._pending = {}
+        self._lock = threading.Lock()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _after_fork_in_child(self):
+        """The lock may have been held at fork time, and build threads don't survive it"""
+        self._lock = threading.Lock()
+        self._building = set()
+        self._pending = {}
+    
+    def build(self, client, kind):
+        """
+        (Re)build the index of a kind
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): One of KINDS
+        
+        Returns:
+            PrefixIndex: The new index
+        """
+        started = time.time()
+        with self._lock:
+            # Writes made while the items are read are replayed onto the new index
+            self._pending[kind] = []
+        try:
+            index = PrefixIndex(filter(None, (_entry(kind, item) for item in _load(client, kind))))
+        except Exception:
+            with self._lock:
+                self._pending.pop(kind, None)
+            raise
+        with self._lock:
+            for write in self._pending.pop(kind, []):
+                self._apply(index, kind, *write)
+            self._indexes[kind] = index
+            self._built_at[kind] = started
+        return index
+    
+    def _index(self, client, kind):
+        """Get a kind's index (None until first built), starting a background build when it is missing or stale"""
+        with self._lock:
+            index = self._indexes.get(kind)
+            # One build per kind at a time; other kinds build independently
+            start = kind not in self._building and (index is None or time.time() - self._built_at[kind] > self.ttl)
+            if start:
+                self._building.add(kind)
+        
+        if start:
+            def run():
+                try:
+                    self.build(client, kind)
+                except Exception as e:
+                    # A missing index is retried on the next lookup
+                    logging.warning(f"Typeahead build of {kind} failed for {self.store_url}: {str(e)}")
+                finally:
+                    with self._lock:
+                        self._building.discard(kind)
+            
+            threading.Thread(target=run, name='wc-typeahead', daemon=True).start()
+        return index
+    
+    def suggest(self, client, kind, query, limit=None):
+        """
+        Suggest items whose name (or product SKU) has a word starting with the query
+        
+        Args:
+            client (WooCommerceClient): Client of the store
+            kind (str): One of KINDS
+            query (str): Text typed so far
+            limit (int, optional): Most suggestions (capped at WOOCOMMERCE_TYPEAHEAD_MAX_LIMIT)
+        
+        Returns:
+            dict: 'results' (list of {'id', 'name', ...}), 'truncated'
+                (True if more items matched) and 'building' (True while the
+                kind's first index is built; results are empty meanwhile)
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown typeahead kind: {kind}")
+        
+        limit = max(1, min(limit or Config.WOOCOMMERCE_TYPEAHEAD_LIMIT, Config.WOOCOMMERCE_TYPEAHEAD_MAX_LIMIT))
+        prefix = normalize(str(query or '')[:MAX_QUERY_LENGTH])
+        if not prefix:
+            return {'results': [], 'truncated': False, 'building': False}
+        
+        poll_changes()
+        index = self._index(client, kind)
+        if index is None:
+            return {'results': [], 'truncated': False, 'building': True}
+        with self._lock:
+            results, truncated = index.search(prefix, limit)
+        return {'results': results, 'truncated': truncated, 'building': False}
+    
+    def apply_write(self, method, endpoint, result):
+        """
+        Apply a successful write's response to the built indexes
+        
+        Args:
+            method (str): POST, PUT or DELETE
+            endpoint (str): Endpoint written to (e.g. 'products/12', 'products/tags/batch')
+            result (dict): Decoded response
+        """
+        kind, batch = write_target(endpoint)
+        if kind not in KINDS or not isinstance(result, dict):
+            return
+        
+        with self._lock:
+            if kind in self._pending:
+                self._pending[kind].append((method, batch, result))
+            index = self._indexes.get(kind)
+            if index is not None:
+                self._apply(index, kind, method, batch, result)
+    
+    def _apply(self, index, kind, method, batch, result):
+        """Apply a write's response to an index (caller holds the lock)"""
+        if batch:
+            written = [item for key in ('create', 'update') for item in result.get(key) or []]
+            removed = result.get('delete') or []
+        elif method == 'DELETE':
+            written, removed = [], [result]
+        else:
+            written, removed = [result], []
+        
+        for item in removed:
+            if isinstance(item, dict) and 'id' in item and not item.get('error'):
+                index.remove(item['id'])
+        for item in written:
+            entry = _entry(kind, item)
+            if entry is not None:
+                index.add(*entry)
+            elif isinstance(item, dict) and 'id' in item and not item.get('error'):
+                # e.g. a product moved to the trash
+                index.remove(item['id'])
+    
+    def stats(self):
+        """
+        Get typeahead statistics
+        
+        Returns:
+            dict: Kind -> indexed item count (None if not built)
+        """
+        with self._lock:
+            return {kind: len(self._indexes[kind]) if kind in self._indexes else None for kind in KINDS}
+
+# One service per store, shared by every client of that store
+_services = {}
+_services_lock = threading.Lock()
+
+def get_store_typeahead(store_url):
+    """
+    Get the typeahead service of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        TypeaheadService: The store's service
+    """
+    with _services_lock:
+        service = _services.get(store_url)
+        if service is None:
+            service = TypeaheadService(store_url)
+            _services[store_url] = service
+        return service
+
+def _after_fork_in_child():
+    """Replace the registry lock, which may have been held at fork time"""
+    global _services_lock
+    _services_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
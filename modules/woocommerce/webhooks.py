@@ -0,0 +1,239 @@
+"""
+WooCommerce webhook receiver
+
+Push-based freshness for the response cache, the catalog mirror and the
+typeahead indexes: the store calls the receiver when a product is created,
+updated or deleted, so local copies can keep long TTLs and still change
+within seconds of an edit made in wp-admin or by another tool.
+
+- Deliveries are authenticated with the X-WC-Webhook-Signature header
+  (base64 HMAC-SHA256 of the raw body keyed with the webhook secret,
+  WOOCOMMERCE_WEBHOOK_SECRET).
+- Events are buffered per product for WOOCOMMERCE_WEBHOOK_DEBOUNCE seconds:
+  a save in wp-admin fires several product.updated deliveries, and only the
+  newest payload of a burst is applied.
+- The payload of product.created/updated is the full product (the same
+  body GET products/<id> returns), so the cached item is replaced in place
+  and the mirror and typeahead are updated without calling the store.
+- Each applied event is published to the change feed, so the other worker
+  processes drop their in-memory cache entries and update their typeahead
+  indexes too (the disk cache and the mirror are shared files).
+"""
+
+import os
+import hmac
+import json
+import base64
+import hashlib
+import logging
+import threading
+from config import Config
+from modules.woocommerce.cache import get_store_cache, make_cache_key
+from modules.woocommerce.mirror import get_store_mirror
+from modules.woocommerce.typeahead import get_store_typeahead
+from modules.woocommerce.changes import get_change_feed
+
+# Topics the receiver handles
+TOPICS = ('product.created', 'product.updated', 'product.deleted')
+
+def verify_signature(body, signature, secret):
+    """
+    Check a delivery's X-WC-Webhook-Signature
+    
+    Args:
+        body (bytes): Raw request body
+        signature (str): Header value
+        secret (str): Webhook secret
+    
+    Returns:
+        bool: True if the signature matches
+    """
+    if not secret or not signature:
+        return False
+    expected = base64.b64encode(hmac.new(secret.encode('utf-8'), body, hashlib.sha256).digest()).decode('ascii')
+    return hmac.compare_digest(expected, signature.strip())
+
+class WebhookReceiver:
+    """
+    Applies product webhooks of one store to its local copies
+    """
+    
+    def __init__(self, store_url, secret=None, debounce=None):
+        """
+        Initialize the receiver
+        
+        Args:
+            store_url (str): WooCommerce store URL
+            secret (str, optional): Webhook secret
+            debounce (float, optional): Seconds events are buffered before they are applied
+        """
+        self.store_url = store_url
+        self.secret = secret if secret is not None else Config.WOOCOMMERCE_WEBHOOK_SECRET
+        self.debounce = debounce if debounce is not None else Config.WOOCOMMERCE_WEBHOOK_DEBOUNCE
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        self.counters = {'received': 0, 'rejected': 0, 'coalesced': 0, 'applied': 0}
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _after_fork_in_child(self):
+        """Timers don't survive a fork, and the lock may have been held"""
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending = {}
+    
+    def verify(self, body, signature):
+        """
+        Check a delivery's signature against this store's secret
+        
+        Args:
+            body (bytes): Raw request body
+            signature (str): X-WC-Webhook-Signature header
+        
+        Returns:
+            bool: True if the delivery is authentic
+        """
+        valid = verify_signature(body, signature, self.secret)
+        if not valid:
+            with self._lock:
+                self.counters['rejected'] += 1
+        return valid
+    
+    def receive(self, topic, payload):
+        """
+        Buffer a verified product event
+        
+        Args:
+            topic (str): X-WC-Webhook-Topic header (e.g. 'product.updated')
+            payload (dict): Decoded body
+        
+        Returns:
+            bool: True if the event was accepted (False for unhandled topics)
+        """
+        if topic not in TOPICS or not isinstance(payload, dict) or not str(payload.get('id', '')).isdigit():
+            return False
+        
+        product_id = int(payload['id'])
+        with self._lock:
+            self.counters['received'] += 1
+            earlier = self._pending.get(product_id)
+            if earlier is not None:
+                self.counters['coalesced'] += 1
+                # Deliveries can arrive out of order: keep the newest version
+                if topic != 'product.deleted' and earlier[0] != 'product.deleted' and \
+                        str(payload.get('date_modified_gmt') or '') < str(earlier[1].get('date_modified_gmt') or ''):
+                    return True
+            self._pending[product_id] = (topic, payload)
+            
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return True
+    
+    def flush(self):
+        """Apply the buffered events (called by the debounce timer)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._timer = None
+        
+        cache = get_store_cache(self.store_url)
+        feed = get_change_feed()
+        targets = [target for target in (get_store_mirror(self.store_url), get_store_typeahead(self.store_url)) if target is not None]
+        for product_id, (topic, payload) in pending.items():
+            endpoint = f'products/{product_id}'
+            try:
+                if cache is not None:
+                    cache.invalidate(endpoint)
+                if topic == 'product.deleted':
+                    method, result = 'DELETE', {'id': product_id}
+                else:
+                    method, result = 'PUT', payload
+                    if cache is not None:
+                        cache.store(make_cache_key(endpoint), endpoint, json.dumps(payload).encode('utf-8'), {})
+                for target in targets:
+                    target.apply_write(method, endpoint, result)
+                if feed is not None:
+                    feed.publish(self.store_url, method, endpoint, result)
+            except Exception as e:
+                logging.warning(f"Webhook {topic} for product {product_id} of {self.store_url} could not be applied: {str(e)}")
+                continue
+            with self._lock:
+                self.counters['applied'] += 1
+    
+    def stats(self):
+        """
+        Get receiver statistics
+        
+        Returns:
+            dict: Events buffered and counters
+        """
+        with self._lock:
+            return {'pending': len(self._pending), **self.counters}
+
+def register_webhooks(client, delivery_url, secret=None, topics=TOPICS):
+    """
+    Create the product webhooks on the store (skipping ones that already exist)
+    
+    Args:
+        client (WooCommerceClient): Client of the store
+        delivery_url (str): Public URL of the receiver (e.g. https://example.com/products/webhook)
+        secret (str, optional): Webhook secret (default: WOOCOMMERCE_WEBHOOK_SECRET)
+        topics (iterable, optional): Topics to register
+    
+    Returns:
+        list: Webhooks created
+    """
+    secret = secret or Config.WOOCOMMERCE_WEBHOOK_SECRET
+    if not secret:
+        raise ValueError("A webhook secret is required (set WOOCOMMERCE_WEBHOOK_SECRET)")
+    
+    existing = {
+        (webhook.get('topic'), webhook.get('delivery_url'))
+        for webhook in client.get('webhooks', params={'per_page': 100}, use_cache=False)
+        if webhook.get('status') == 'active'
+    }
+    
+    created = []
+    for topic in topics:
+        if (topic, delivery_url) in existing:
+            continue
+        created.append(client.post('webhooks', data={
+            'name': f"Smart WooCommerce: {topic}",
+            'topic': topic,
+            'delivery_url': delivery_url,
+            'secret': secret,
+            'status': 'active'
+        }))
+    return created
+
+# One receiver per store
+_receivers = {}
+_receivers_lock = threading.Lock()
+
+def get_webhook_receiver(store_url):
+    """
+    Get the webhook receiver of a store
+    
+    Args:
+        store_url (str): WooCommerce store URL
+    
+    Returns:
+        WebhookReceiver: The store's receiver
+    """
+    with _receivers_lock:
+        receiver = _receivers.get(store_url)
+        if receiver is None:
+            receiver = WebhookReceiver(store_url)
+            _receivers[store_url] = receiver
+        return receiver
+
+def _after_fork_in_child():
+    """Replace the registry lock, which may have been held at fork time"""
+    global _receivers_lock
+    _receivers_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,116 @@
+"""
+Production entry point for Waleed Smart WooCommerce
+
+Serves the Flask app with a multi-threaded WSGI server instead of the
+debug server started by `python app.py`:
+
+- waitress (Windows and Linux): one process, SERVER_THREADS threads
+- gunicorn (Linux/macOS, when SERVER_WORKERS > 1): forked workers with
+  SERVER_THREADS threads each; the app is preloaded in the master
+
+Caches are prewarmed by the app's warm-up stage (see utils.warmup) before
+the server accepts traffic, then gc.freeze() moves everything loaded so far
+into the permanent generation so forked workers keep sharing those pages.
+Under gunicorn the per-process stages (the WooCommerce client, its mirror
+sync and term lists) run in each worker after the fork rather than in the
+master, so no connection, lock or thread is inherited across it.
+
+Usage:
+    python serve.py [--host 0.0.0.0] [--port 5000] [--threads 8] [--workers 1]
+"""
+
+import gc
+import sys
+import logging
+import argparse
+
+from config import Config
+
+logger = logging.getLogger('serve')
+
+def load_app(forking=False):
+    """
+    Import, initialize and warm up the application
+    
+    Args:
+        forking (bool, optional): Workers will be forked from this process, so
+            per-process warm-up stages are left for them
+    """
+    from app import app, init_db, warmup
+    
+    init_db()
+    
+    # Prompts, license verdict, WooCommerce term lists and AI SDKs, concurrently
+    report = warmup.run(defer_per_process=forking)
+    for name, result in sorted(report['stages'].items()):
+        logger.info(f"Warm-up {name}: {result['status']} {result.get('seconds', '')}")
+    if not report['ready']:
+        logger.warning(f"Warm-up missed its {warmup.deadline}s deadline; /readyz stays unavailable until it finishes")
+    
+    # Everything loaded so far is long-lived: keep the GC from scanning it
+    # (and from touching the pages, which would defeat copy-on-write after fork)
+    gc.collect()
+    gc.freeze()
+    
+    return app
+
+def run_waitress(app, host, port, threads):
+    """Serve with waitress (single process, thread pool)"""
+    from waitress import serve
+    
+    logger.info(f"Serving on http://{host}:{port} with waitress ({threads} threads)")
+    serve(app, host=host, port=port, threads=threads)
+
+def run_gunicorn(app, host, port, workers, threads):
+    """Serve with gunicorn (preforked workers sharing the preloaded app)"""
+    from gunicorn.app.base import BaseApplication
+
+    class PreloadedApplication(BaseApplication):
+        """gunicorn application wrapping the already-loaded Flask app"""
+        
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('preload_app', True)
+        
+        def load(self):
+            return app
+    
+    logger.info(f"Serving on http://{host}:{port} with gunicorn ({workers} workers x {threads} threads)")
+    PreloadedApplication().run()
+
+def main():
+    """Command-line interface for the production server"""
+    parser = argparse.ArgumentParser(description='Run Waleed Smart WooCommerce with a production WSGI server')
+    parser.add_argument('--host', default=Config.SERVER_HOST, help='Bind address')
+    parser.add_argument('--port', type=int, default=Config.SERVER_PORT, help='Port')
+    parser.add_argument('--threads', type=int, default=Config.SERVER_THREADS, help='Threads per worker')
+    parser.add_argument('--workers', type=int, default=Config.SERVER_WORKERS, help='Worker processes (Linux/macOS only)')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    
+    forking = args.workers > 1 and sys.platform != 'win32'
+    app = load_app(forking)
+    
+    if forking:
+        if not Config.WOOCOMMERCE_CHANGE_FEED_PATH:
+            logger.warning("WOOCOMMERCE_CHANGE_FEED_PATH is empty: webhook updates only reach the worker that receives them, "
+                           "the others serve cached products until WOOCOMMERCE_CACHE_TTL / WOOCOMMERCE_TYPEAHEAD_TTL expire")
+        try:
+            run_gunicorn(app, args.host, args.port, args.workers, args.threads)
+            return
+        except ImportError:
+            logger.warning("gunicorn is not installed; falling back to a single waitress process")
+            from app import warmup
+            warmup.start_deferred()
+    elif args.workers > 1:
+        logger.warning("Multiple workers are not supported on Windows; using a single waitress process")
+    
+    run_waitress(app, args.host, args.port, args.threads)
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,8 @@ if not exist "venv" (
     call venv\Scripts\activate.bat
 )
 
-:: Start the application
+:: Start the application (production server; use "python app.py" for the debug server)
 echo Starting the application...
-python app.py
+python serve.py
 
 pause 
\ No newline at end of file
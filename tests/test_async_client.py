@@ -0,0 +1,53 @@
+import os
+import json
+import asyncio
+
+# Keep the test off the on-disk cache and mirror
+os.environ['WOOCOMMERCE_CACHE_DISK_PATH'] = ''
+os.environ['WOOCOMMERCE_MIRROR_PATH'] = ''
+
+from yarl import URL
+from modules.woocommerce.async_client import AsyncWooCommerceClient
+from modules.woocommerce.async_managers import AsyncProductManager
+
+class FakeResponse:
+    """aiohttp response stand-in"""
+    
+    def __init__(self, body):
+        self.status = 200
+        self.headers = {}
+        self._body = body
+    
+    async def read(self):
+        return self._body
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    """Records requests, merging the query the way aiohttp does (yarl rejects non-str values)"""
+    
+    def __init__(self):
+        self.urls = []
+    
+    def request(self, method, url, params=None, **kwargs):
+        self.urls.append((method, url.update_query(params) if params else url))
+        return FakeResponse(json.dumps({'id': 42, 'status': 'trash'}).encode())
+
+def test_delete_product_over_https():
+    client = AsyncWooCommerceClient('https://shop.example.com', 'ck_test', 'cs_test')
+    session = FakeSession()
+    client._session = session
+    client._semaphore = asyncio.Semaphore(1)
+    
+    result = asyncio.run(AsyncProductManager(client).delete_product(42))
+    
+    assert result['id'] == 42
+    method, url = session.urls[0]
+    assert method == 'DELETE'
+    assert isinstance(url, URL) and url.path.endswith('/products/42')
+    assert url.query['force'] == 'false'
+    assert url.query['consumer_key'] == 'ck_test'
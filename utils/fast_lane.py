@@ -0,0 +1,212 @@
+"""
+Request fast lane
+
+Keeps per-request overhead low for high-frequency endpoints:
+
+- RouteClassifier decides once per endpoint which per-request checks
+  (license, session) it needs.
+- FastLaneSessionInterface skips cookie session decoding for endpoints
+  the classifier marks as not needing the session (static files, health
+  probes, webhooks). It remembers the endpoint of recent (method, path)
+  pairs, so the URL map is matched once per request (by Flask's routing).
+- IdentityCache keeps the logged-in user per login token so Flask-Login's
+  user_loader doesn't hit the database on every request.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from flask.sessions import SecureCookieSessionInterface
+from werkzeug.exceptions import HTTPException
+
+# Per-request checks
+CHECK_LICENSE = 'license'
+CHECK_SESSION = 'session'
+ALL_CHECKS = frozenset({CHECK_LICENSE, CHECK_SESSION})
+
+# Endpoint rules; an entry ending in '.' applies to a whole blueprint.
+# Endpoints without a matching rule get ALL_CHECKS.
+ROUTE_RULES = {
+    'static': frozenset(),
+    'healthz': frozenset(),
+    'readyz': frozenset(),
+    'auth.license': frozenset({CHECK_SESSION}),
+    # Called by the store, authenticated by its HMAC signature
+    'products.webhook': frozenset(),
+}
+
+class RouteClassifier:
+    """
+    Maps endpoints to the set of per-request checks they need
+    
+    Classification is computed on first sight of an endpoint and cached, so
+    the per-request cost is a single dict lookup.
+    """
+    
+    def __init__(self, rules=None):
+        """
+        Initialize the classifier
+        
+        Args:
+            rules (dict, optional): Extra endpoint rules merged over ROUTE_RULES
+        """
+        self.rules = dict(ROUTE_RULES)
+        self.rules.update(rules or {})
+        self._cache = {}
+    
+    def add_rule(self, endpoint, checks):
+        """
+        Add or replace a rule
+        
+        Args:
+            endpoint (str): Endpoint name, or 'blueprint.' for a whole blueprint
+            checks (iterable): Checks the endpoint needs
+        """
+        self.rules[endpoint] = frozenset(checks)
+        self._cache.clear()
+    
+    def checks_for(self, endpoint):
+        """
+        Get the checks for an endpoint
+        
+        Args:
+            endpoint (str): Endpoint name (None for unmatched URLs)
+        
+        Returns:
+            frozenset: Checks to run
+        """
+        checks = self._cache.get(endpoint)
+        if checks is None:
+            checks = self._classify(endpoint)
+            self._cache[endpoint] = checks
+        return checks
+    
+    def _classify(self, endpoint):
+        """Resolve an endpoint against the rules (exact match, then blueprint)"""
+        if endpoint is None:
+            return ALL_CHECKS
+        
+        if endpoint in self.rules:
+            return self.rules[endpoint]
+        
+        if '.' in endpoint:
+            blueprint = endpoint.rsplit('.', 1)[0] + '.'
+            if blueprint in self.rules:
+                return self.rules[blueprint]
+        
+        return ALL_CHECKS
+
+class FastLaneSessionInterface(SecureCookieSessionInterface):
+    """Cookie session interface that doesn't decode the session for endpoints without CHECK_SESSION"""
+    
+    def __init__(self, classifier, max_size=1024):
+        """
+        Initialize the session interface
+        
+        Args:
+            classifier (RouteClassifier): Classifier deciding which endpoints need the session
+            max_size (int, optional): Maximum number of (method, path) pairs whose endpoint is remembered
+        """
+        self.classifier = classifier
+        self.max_size = max_size
+        self._endpoints = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _endpoint(self, app, request):
+        """Endpoint of a request (the session is opened before Flask routes it)"""
+        key = (request.method, request.path)
+        with self._lock:
+            if key in self._endpoints:
+                self._endpoints.move_to_end(key)
+                return self._endpoints[key]
+        
+        try:
+            rule, _ = app.create_url_adapter(request).match(return_rule=True)
+            endpoint = rule.endpoint
+        except HTTPException:
+            # Not found, method not allowed or redirect: keep the full checks
+            endpoint = None
+        
+        with self._lock:
+            self._endpoints[key] = endpoint
+            while len(self._endpoints) > self.max_size:
+                self._endpoints.popitem(last=False)
+        return endpoint
+    
+    def open_session(self, app, request):
+        """Return a null session for endpoints the classifier runs without CHECK_SESSION"""
+        if CHECK_SESSION not in self.classifier.checks_for(self._endpoint(app, request)):
+            return self.make_null_session(app)
+        return super().open_session(app, request)
+    
+    def save_session(self, app, session, response):
+        """Never write a cookie for a null session"""
+        if self.is_null_session(session):
+            return
+        super().save_session(app, session, response)
+
+class IdentityCache:
+    """
+    Bounded TTL cache of logged-in users keyed by (login token, user id)
+    
+    The token is a random value stored in the user's session at login, so
+    two sessions never share an entry. Cached users are detached from the
+    database session and shared by concurrent requests: callers merge them
+    into the request's session (`session.merge(user, load=False)`) rather
+    than using them directly. Entries expire after `ttl` seconds and are
+    dropped on logout.
+    """
+    
+    def __init__(self, ttl=60, max_size=1024):
+        """
+        Initialize the identity cache
+        
+        Args:
+            ttl (float, optional): Seconds an entry stays valid
+            max_size (int, optional): Maximum number of entries
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_load(self, token, user_id, loader):
+        """
+        Get the user for a login, calling `loader` on a miss
+        
+        Args:
+            token (str): Login token from the session
+            user_id (str): User ID from the session
+            loader (callable): Loads the user (returns None if not found)
+        
+        Returns:
+            object: The user, or None
+        """
+        key = (token, user_id)
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        
+        user = loader()
+        if user is not None:
+            with self._lock:
+                self._entries[key] = (now + self.ttl, user)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return user
+    
+    def invalidate_user(self, user_id):
+        """Drop every entry for a user (e.g. on logout or profile change)"""
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == user_id]:
+                del self._entries[key]
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,145 @@
+"""
+Import-time report
+
+Runs a fresh interpreter with `-X importtime`, imports a module (the Flask
+app by default) and summarizes which imports dominate startup. Reports can
+be saved as JSON and compared against a previous run to catch regressions.
+
+Usage:
+    python -m utils.import_report [--module app] [--top 25]
+    python -m utils.import_report --save baseline.json
+    python -m utils.import_report --compare baseline.json
+"""
+
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+from config import Config
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def collect_import_times(module='app'):
+    """
+    Import a module in a fresh interpreter and collect per-import timings
+    
+    Args:
+        module (str, optional): Dotted name of the module to import
+    
+    Returns:
+        list: Dicts with 'module', 'self_us', 'cumulative_us' and 'depth', in import order
+    
+    Raises:
+        RuntimeError: If the import fails
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=Config.BASE_DIR,
+        capture_output=True,
+        text=True
+    )
+    
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append({
+                'module': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                'depth': len(match.group(3)) // 2,
+            })
+    
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    
+    return entries
+
+def summarize(entries, top=25):
+    """
+    Summarize import timings
+    
+    Args:
+        entries (list): Output of collect_import_times()
+        top (int, optional): Number of slowest imports to keep
+    
+    Returns:
+        dict: Total time, top-level packages by cumulative time and slowest imports by self time
+    """
+    # Top-level packages: cumulative time of the outermost import of each root package
+    packages = {}
+    for entry in entries:
+        if entry['depth'] == 0:
+            root = entry['module'].split('.')[0]
+            packages[root] = packages.get(root, 0) + entry['cumulative_us']
+    
+    return {
+        'total_us': sum(packages.values()),
+        'packages': sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top],
+        'slowest': sorted(
+            ((entry['module'], entry['self_us']) for entry in entries),
+            key=lambda item: item[1],
+            reverse=True
+        )[:top],
+    }
+
+def format_report(summary, baseline=None):
+    """
+    Format a summary as a text report
+    
+    Args:
+        summary (dict): Output of summarize()
+        baseline (dict, optional): A previously saved summary to compare against
+    
+    Returns:
+        str: The report
+    """
+    old_packages = dict(baseline['packages']) if baseline else {}
+    lines = [f"Total import time: {summary['total_us'] / 1000:.1f} ms"]
+    if baseline:
+        delta = (summary['total_us'] - baseline['total_us']) / 1000
+        lines[0] += f" ({delta:+.1f} ms vs baseline)"
+    
+    lines.append('')
+    lines.append('Top-level packages (cumulative ms):')
+    for name, cumulative in summary['packages']:
+        line = f"  {cumulative / 1000:10.1f}  {name}"
+        if baseline:
+            line += f"  ({(cumulative - old_packages.get(name, 0)) / 1000:+.1f})"
+        lines.append(line)
+    
+    lines.append('')
+    lines.append('Slowest single imports (self ms):')
+    for name, self_us in summary['slowest']:
+        lines.append(f"  {self_us / 1000:10.1f}  {name}")
+    
+    return '\n'.join(lines)
+
+def main():
+    """Command-line interface for the import-time report"""
+    parser = argparse.ArgumentParser(description='Report import times for application startup')
+    parser.add_argument('--module', default='app', help='Module to import (default: app)')
+    parser.add_argument('--top', type=int, default=25, help='Number of entries per section')
+    parser.add_argument('--save', help='Save the summary as JSON to this file')
+    parser.add_argument('--compare', help='Compare against a summary saved with --save')
+    
+    args = parser.parse_args()
+    
+    summary = summarize(collect_import_times(args.module), top=args.top)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    
+    print(format_report(summary, baseline))
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSummary saved to {args.save}")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,12 @@ import datetime
 import argparse
 import base64
 import hashlib
+import functools
+import csv
+import time
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -24,12 +30,23 @@ def derive_key(password):
     key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
     return key
 
+@functools.lru_cache(maxsize=8)
+def get_fernet(password):
+    """Get a Fernet instance for a password (the key is derived once per process)"""
+    return Fernet(derive_key(password))
+
 def encrypt_data(data, password):
     """Encrypt data using a password-derived key"""
-    key = derive_key(password)
-    f = Fernet(key)
+    f = get_fernet(password)
     return f.encrypt(json.dumps(data).encode()).decode()
 
+@functools.lru_cache(maxsize=4)
+def _hash_app_code(app_path, mtime_ns, size):
+    """Derive the license secret from app.py (cached per file version)"""
+    with open(app_path, 'rb') as f:
+        app_code = f.read()
+    return hashlib.sha256(app_code).hexdigest()[:32]
+
 def get_license_secret():
     """Get the secret used for license encryption"""
     # This would normally be a hardcoded value or fetched from somewhere secure
@@ -41,40 +58,61 @@ def get_license_secret():
         script_dir = os.path.dirname(os.path.abspath(__file__))
         app_path = os.path.join(os.path.dirname(script_dir), 'app.py')
         if os.path.exists(app_path):
-            app_code = open(app_path, 'rb').read()
-            secret = hashlib.sha256(app_code).hexdigest()[:32]
+            stat = os.stat(app_path)
+            secret = _hash_app_code(app_path, stat.st_mtime_ns, stat.st_size)
         else:
             raise ValueError("Could not determine license secret. Set LICENSE_SECRET environment variable.")
     return secret
 
-def generate_trial_key(machine_fingerprint, simple_fingerprint, name, email, days_valid=30):
+def build_license_data(license_type, machine_fingerprint, simple_fingerprint, name, email, days_valid=30):
     """
-    Generate a trial license key
+    Build the license payload that gets encrypted into a key
     
     Args:
+        license_type (str): 'trial' or 'full'
         machine_fingerprint (str): The machine fingerprint
         simple_fingerprint (str): The simplified machine fingerprint
         name (str): The user's name
         email (str): The user's email
-        days_valid (int): The number of days the trial is valid for
+        days_valid (int, optional): The number of days a trial is valid for
     
     Returns:
-        str: The encrypted license key
+        dict: License data
     """
-    # Create license data
     issue_date = datetime.datetime.now()
-    expiry_date = issue_date + datetime.timedelta(days=days_valid)
     
     license_data = {
         'fingerprint': machine_fingerprint,
         'simple_fingerprint': simple_fingerprint,
         'name': name,
         'email': email,
-        'type': 'trial',
+        'type': license_type,
         'issue_date': issue_date.isoformat(),
-        'expiry_date': expiry_date.isoformat(),
     }
     
+    if license_type == 'trial':
+        expiry_date = issue_date + datetime.timedelta(days=days_valid)
+        license_data['expiry_date'] = expiry_date.isoformat()
+    
+    return license_data
+
+def generate_trial_key(machine_fingerprint, simple_fingerprint, name, email, days_valid=30):
+    """
+    Generate a trial license key
+    
+    Args:
+        machine_fingerprint (str): The machine fingerprint
+        simple_fingerprint (str): The simplified machine fingerprint
+        name (str): The user's name
+        email (str): The user's email
+        days_valid (int): The number of days the trial is valid for
+    
+    Returns:
+        str: The encrypted license key
+    """
+    # Create license data
+    license_data = build_license_data('trial', machine_fingerprint, simple_fingerprint, name, email, days_valid)
+    
     # Encrypt the license data
     secret = get_license_secret()
     return encrypt_data(license_data, secret)
@@ -93,32 +131,167 @@ def generate_full_key(machine_fingerprint, simple_fingerprint, name, email):
         str: The encrypted license key
     """
     # Create license data
-    license_data = {
-        'fingerprint': machine_fingerprint,
-        'simple_fingerprint': simple_fingerprint,
-        'name': name,
-        'email': email,
-        'type': 'full',
-        'issue_date': datetime.datetime.now().isoformat(),
-    }
+    license_data = build_license_data('full', machine_fingerprint, simple_fingerprint, name, email)
     
     # Encrypt the license data
     secret = get_license_secret()
     return encrypt_data(license_data, secret)
 
+# ============= Bulk Generation =============
+
+BULK_FIELDS = ('name', 'email', 'fingerprint', 'simple_fingerprint', 'type', 'days')
+
+def read_license_requests(input_path):
+    """
+    Stream license requests from a CSV (with a header row) or JSONL file
+    
+    Args:
+        input_path (str): Path to a .csv or .jsonl file with the BULK_FIELDS columns
+    
+    Yields:
+        dict: Normalized request with keys from BULK_FIELDS
+    
+    Raises:
+        ValueError: If a row is missing a required field or has an invalid type
+    """
+    with open(input_path, 'r', newline='', encoding='utf-8') as f:
+        if input_path.lower().endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        
+        for line_number, row in enumerate(rows, start=1):
+            for field in ('name', 'email', 'fingerprint', 'simple_fingerprint'):
+                if not row.get(field):
+                    raise ValueError(f"Row {line_number}: missing '{field}'")
+            
+            license_type = (row.get('type') or 'trial').strip().lower()
+            if license_type not in ('trial', 'full'):
+                raise ValueError(f"Row {line_number}: invalid type '{license_type}'")
+            
+            yield {
+                'name': row['name'],
+                'email': row['email'],
+                'fingerprint': row['fingerprint'],
+                'simple_fingerprint': row['simple_fingerprint'],
+                'type': license_type,
+                'days': int(row.get('days') or 30),
+            }
+
+# Fernet instance of a bulk worker process, set once by _init_bulk_worker
+_bulk_fernet = None
+
+def _init_bulk_worker(key):
+    """Process pool initializer: receive the already-derived key"""
+    global _bulk_fernet
+    _bulk_fernet = Fernet(key)
+
+def _encrypt_bulk_chunk(rows):
+    """Encrypt a chunk of license requests in a worker process"""
+    results = []
+    for row in rows:
+        license_data = build_license_data(
+            row['type'],
+            row['fingerprint'],
+            row['simple_fingerprint'],
+            row['name'],
+            row['email'],
+            row['days']
+        )
+        license_key = _bulk_fernet.encrypt(json.dumps(license_data).encode()).decode()
+        results.append({'name': row['name'], 'email': row['email'], 'type': row['type'], 'license_key': license_key})
+    return results
+
+def _chunked(iterable, size):
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def generate_bulk_keys(input_path, output_path, workers=None, chunk_size=500):
+    """
+    Generate license keys for every request in a CSV/JSONL file
+    
+    The PBKDF2 key is derived once and handed to a pool of worker processes
+    (one per core by default). Chunks are kept in a bounded window and keys
+    are streamed to the output file in input order, so memory stays flat
+    regardless of the batch size.
+    
+    Args:
+        input_path (str): CSV or JSONL file of license requests
+        output_path (str): Output file; CSV if it ends in .csv, JSONL otherwise
+        workers (int, optional): Number of worker processes (default: CPU count)
+        chunk_size (int, optional): Requests per worker task
+    
+    Returns:
+        int: Number of keys written
+    """
+    key = derive_key(get_license_secret())
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    written = 0
+    
+    with open(output_path, 'w', newline='', encoding='utf-8') as out, \
+         ProcessPoolExecutor(max_workers=workers, initializer=_init_bulk_worker, initargs=(key,)) as executor:
+        if output_path.lower().endswith('.csv'):
+            writer = csv.DictWriter(out, fieldnames=['name', 'email', 'type', 'license_key'])
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = lambda result: out.write(json.dumps(result) + '\n')
+        
+        pending = collections.deque()
+        for chunk in _chunked(read_license_requests(input_path), chunk_size):
+            pending.append(executor.submit(_encrypt_bulk_chunk, chunk))
+            if len(pending) >= max_in_flight:
+                for result in pending.popleft().result():
+                    write(result)
+                    written += 1
+        
+        while pending:
+            for result in pending.popleft().result():
+                write(result)
+                written += 1
+    
+    return written
+
 def main():
     """Command-line interface for generating license keys"""
     parser = argparse.ArgumentParser(description='Generate license keys for Waleed Smart WooCommerce')
-    parser.add_argument('--type', choices=['trial', 'full'], required=True, help='License type')
-    parser.add_argument('--name', required=True, help='User\'s name')
-    parser.add_argument('--email', required=True, help='User\'s email')
+    parser.add_argument('--type', choices=['trial', 'full'], help='License type')
+    parser.add_argument('--name', help='User\'s name')
+    parser.add_argument('--email', help='User\'s email')
     parser.add_argument('--days', type=int, default=30, help='Days valid (for trial)')
-    parser.add_argument('--fingerprint', required=True, help='Machine fingerprint')
-    parser.add_argument('--simple-fingerprint', required=True, help='Simplified machine fingerprint')
+    parser.add_argument('--fingerprint', help='Machine fingerprint')
+    parser.add_argument('--simple-fingerprint', help='Simplified machine fingerprint')
     parser.add_argument('--output', help='Output file (if not provided, prints to stdout)')
+    parser.add_argument('--bulk', metavar='INPUT', help='CSV/JSONL file of (name, email, fingerprint, simple_fingerprint, type, days) rows')
+    parser.add_argument('--workers', type=int, help='Worker processes for --bulk (default: CPU count)')
     
     args = parser.parse_args()
     
+    # Bulk mode: one key per input row, streamed to the output file
+    if args.bulk:
+        if not args.output:
+            parser.error('--output is required with --bulk')
+        start = time.perf_counter()
+        count = generate_bulk_keys(args.bulk, args.output, workers=args.workers)
+        print(f"{count} license keys written to {args.output} in {time.perf_counter() - start:.1f}s")
+        return
+    
+    missing = [flag for flag, value in (
+        ('--type', args.type),
+        ('--name', args.name),
+        ('--email', args.email),
+        ('--fingerprint', args.fingerprint),
+        ('--simple-fingerprint', args.simple_fingerprint),
+    ) if not value]
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
+    
     # Generate the license key
     if args.type == 'trial':
         license_key = generate_trial_key(
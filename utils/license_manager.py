@@ -3,13 +3,16 @@ import json
 import base64
 import datetime
 import hashlib
+import logging
+import threading
+from collections import OrderedDict
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import secrets
 
 from config import Config
-from utils.machine_id import get_machine_fingerprint, get_simplified_fingerprint
+from utils.machine_id import get_machine_fingerprint, get_simplified_fingerprint, get_fingerprint_version, FingerprintUnavailable
 
 # Encryption key derivation constant (DO NOT CHANGE)
 # This is used to derive the encryption key from a secret
@@ -26,39 +29,94 @@ def _derive_key(password):
     key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
     return key
 
+# Derived Fernet instances keyed by password, most recently used last
+FERNET_CACHE_SIZE = 8
+_fernet_cache = OrderedDict()
+_fernet_lock = threading.Lock()
+
+def _get_fernet(password):
+    """
+    Get a Fernet instance for a password, deriving the key only once
+    
+    The PBKDF2 derivation runs under the lock so concurrent callers with the
+    same password never repeat it. Fernet instances are safe to share.
+    """
+    with _fernet_lock:
+        f = _fernet_cache.get(password)
+        if f is not None:
+            _fernet_cache.move_to_end(password)
+            return f
+        
+        f = Fernet(_derive_key(password))
+        _fernet_cache[password] = f
+        if len(_fernet_cache) > FERNET_CACHE_SIZE:
+            _fernet_cache.popitem(last=False)
+        return f
+
 def _encrypt_data(data, password):
     """Encrypt data using a password-derived key"""
-    key = _derive_key(password)
-    f = Fernet(key)
+    f = _get_fernet(password)
     return f.encrypt(json.dumps(data).encode()).decode()
 
 def _decrypt_data(encrypted_data, password):
     """Decrypt data using a password-derived key"""
     try:
-        key = _derive_key(password)
-        f = Fernet(key)
+        f = _get_fernet(password)
         decrypted = f.decrypt(encrypted_data.encode())
         return json.loads(decrypted.decode())
     except Exception:
         return None
 
+# Cached license secret: ((mtime, size) of app.py, secret)
+_secret_cache = None
+
 def _get_license_secret():
     """Get the secret used for license encryption"""
+    global _secret_cache
+    
     # This would normally be a hardcoded value or fetched from somewhere secure
     # For this application, we'll use a derived value from the app code itself
-    app_code = open(os.path.join(Config.BASE_DIR, 'app.py'), 'rb').read()
-    return hashlib.sha256(app_code).hexdigest()[:32]
+    app_path = os.path.join(Config.BASE_DIR, 'app.py')
+    stat = os.stat(app_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    
+    cached = _secret_cache
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
+    with open(app_path, 'rb') as f:
+        app_code = f.read()
+    secret = hashlib.sha256(app_code).hexdigest()[:32]
+    _secret_cache = (stamp, secret)
+    return secret
 
-def validate_license():
+def _license_file_stamp():
     """
-    Validate the installed license
+    Get a cheap change marker for the license verdict
     
     Returns:
-        bool: True if the license is valid, False otherwise
+        tuple: (mtime, size, fingerprint version), or None if the license file
+            is missing or the machine fingerprint is not available yet
     """
-    if not os.path.exists(Config.LICENSE_FILE):
-        return False
+    try:
+        stat = os.stat(Config.LICENSE_FILE)
+    except OSError:
+        return None
+    try:
+        version = get_fingerprint_version()
+    except FingerprintUnavailable as e:
+        logging.error(f"License validation failed: {e}")
+        return None
+    return (stat.st_mtime_ns, stat.st_size, version)
+
+def _check_license():
+    """
+    Run the full license check (decrypt, fingerprint match, expiry parse)
     
+    Returns:
+        tuple: (valid, expiry_date) where expiry_date is a datetime for trial
+            licenses and None otherwise, or None if the check could not complete
+    """
     try:
         # Read the license file
         with open(Config.LICENSE_FILE, 'r') as f:
@@ -69,7 +127,7 @@ def validate_license():
         license_data = _decrypt_data(encrypted_license, secret)
         
         if not license_data:
-            return False
+            return (False, None)
         
         # Check if the license matches this machine
         machine_fingerprint = get_machine_fingerprint()
@@ -77,17 +135,71 @@ def validate_license():
         
         if license_data.get('fingerprint') != machine_fingerprint and \
            license_data.get('simple_fingerprint') != simple_fingerprint:
-            return False
+            return (False, None)
         
-        # Check if the license is expired (trial licenses)
+        # Trial licenses carry an expiry date that is enforced on every call
+        expiry_date = None
         if license_data.get('type') == 'trial':
             expiry_date = datetime.datetime.fromisoformat(license_data.get('expiry_date'))
-            if expiry_date < datetime.datetime.now():
-                return False
         
-        return True
+        return (True, expiry_date)
     except Exception:
+        return None
+
+# Cached license verdict: {'stamp': (mtime, size, fingerprint version), 'valid': bool, 'expiry_date': datetime or None}
+_verdict = None
+_verdict_lock = threading.Lock()
+
+def validate_license(use_cache=True):
+    """
+    Validate the installed license
+    
+    The verdict is computed once and cached in-process. It is recomputed only
+    when the license file's mtime or size changes, when the machine fingerprint
+    changes, or after save/clear, while the trial expiry date is compared
+    against the clock on every call.
+    
+    Args:
+        use_cache (bool, optional): Set to False to force a full re-validation
+    
+    Returns:
+        bool: True if the license is valid, False otherwise
+    """
+    global _verdict
+    
+    stamp = _license_file_stamp()
+    if stamp is None:
         return False
+    
+    verdict = _verdict
+    if not use_cache or verdict is None or verdict['stamp'] != stamp:
+        with _verdict_lock:
+            verdict = _verdict
+            if not use_cache or verdict is None or verdict['stamp'] != stamp:
+                result = _check_license()
+                if result is None:
+                    # Unexpected failure (e.g. file being rewritten): don't cache it
+                    return False
+                
+                valid, expiry_date = result
+                verdict = {'stamp': stamp, 'valid': valid, 'expiry_date': expiry_date}
+                _verdict = verdict
+    
+    if not verdict['valid']:
+        return False
+    
+    # Check if the license is expired (trial licenses)
+    expiry_date = verdict['expiry_date']
+    if expiry_date is not None and expiry_date < datetime.datetime.now():
+        return False
+    
+    return True
+
+def invalidate_license_cache():
+    """Drop the cached license verdict so the next check re-validates"""
+    global _verdict
+    with _verdict_lock:
+        _verdict = None
 
 def get_license_info():
     """
@@ -151,6 +263,7 @@ def save_license(license_key):
         # Save the license key
         with open(Config.LICENSE_FILE, 'w') as f:
             f.write(license_key)
+        invalidate_license_cache()
         
         return True
     except Exception:
@@ -159,4 +272,5 @@ def save_license(license_key):
 def clear_license():
     """Remove the current license"""
     if os.path.exists(Config.LICENSE_FILE):
-        os.remove(Config.LICENSE_FILE) 
\ No newline at end of file
+        os.remove(Config.LICENSE_FILE)
+    invalidate_license_cache() 
\ No newline at end of file
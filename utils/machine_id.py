@@ -1,11 +1,52 @@
+import os
 import hashlib
 import socket
 import uuid
 import platform
-import psutil
-import win32com.client
-import win32api
+import importlib
+import threading
+import time
 import re
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from config import Config
+
+# Hardware probe providers by platform.system(), imported on first use
+PROBE_PROVIDERS = {
+    'Windows': 'utils.machine_probes.windows',
+}
+DEFAULT_PROBE_PROVIDER = 'utils.machine_probes.generic'
+
+_provider = None
+_provider_lock = threading.Lock()
+
+def register_probe_provider(system, module_path):
+    """
+    Register a hardware probe provider for a platform
+    
+    Args:
+        system (str): Platform name as returned by platform.system()
+        module_path (str): Dotted path of a module exposing get_cpu_id() and get_disk_serial()
+    """
+    global _provider
+    with _provider_lock:
+        PROBE_PROVIDERS[system] = module_path
+        _provider = None
+
+def _get_provider():
+    """Import and return the probe provider for this platform"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                module_path = PROBE_PROVIDERS.get(platform.system(), DEFAULT_PROBE_PROVIDER)
+                try:
+                    _provider = importlib.import_module(module_path)
+                except ImportError as e:
+                    logging.warning(f"Probe provider {module_path} unavailable ({e}), using generic probes")
+                    _provider = importlib.import_module(DEFAULT_PROBE_PROVIDER)
+    return _provider
 
 def get_mac_address():
     """Get the MAC address of the first network interface"""
@@ -17,38 +58,11 @@ def get_mac_address():
 
 def get_cpu_id():
     """Get CPU information to identify the machine"""
-    try:
-        # Use WMI to get CPU information
-        wmi = win32com.client.GetObject("winmgmts:")
-        cpu_info = ""
-        for cpu in wmi.InstancesOf("Win32_Processor"):
-            cpu_info += f"{cpu.ProcessorId.strip()}"
-        
-        if not cpu_info:
-            # Fallback to processor name if ID not available
-            cpu_info = platform.processor()
-        
-        return cpu_info
-    except Exception:
-        # Fallback to platform processor info
-        return platform.processor()
+    return _get_provider().get_cpu_id()
 
 def get_disk_serial():
     """Get the disk serial number"""
-    try:
-        # Get the system drive (usually C:)
-        system_drive = win32api.GetSystemDirectory()[:2]
-        
-        # Get disk information
-        wmi = win32com.client.GetObject("winmgmts:")
-        for disk in wmi.InstancesOf("Win32_DiskDrive"):
-            disk_info = str(disk.SerialNumber).strip()
-            if disk_info:
-                return disk_info
-        
-        return "UNKNOWN_DISK"
-    except Exception:
-        return "UNKNOWN_DISK"
+    return _get_provider().get_disk_serial()
 
 def get_hostname():
     """Get the hostname of the machine"""
@@ -57,39 +71,211 @@ def get_hostname():
     except Exception:
         return "UNKNOWN_HOST"
 
-def get_machine_fingerprint():
+class FingerprintUnavailable(RuntimeError):
+    """The probes did not finish within FINGERPRINT_FIRST_TIMEOUT, so no trustworthy fingerprint exists yet"""
+
+def get_memory_total():
+    """Get the total physical memory in bytes, as a string"""
+    import psutil
+    return str(psutil.virtual_memory().total)
+
+class FingerprintService:
     """
-    Combine multiple machine identifiers to create a unique fingerprint
-    This makes it harder to bypass the hardware lock
+    Computes the machine fingerprints once per process
+    
+    Each identifier is collected by its own probe, concurrently. The first
+    call waits for every probe (up to `first_timeout`), so the fingerprint
+    that is validated and displayed is never built from fallback values
+    standing in for slow probes; if a probe is still running by then, get()
+    raises FingerprintUnavailable until a background refresh sees every
+    probe finish. Background refreshes wait at most `probe_timeout`: probes that
+    time out or fail use their fallback value (a degraded result never
+    replaces a complete one), and a probe still running from an earlier
+    refresh is waited on again rather than started a second time.
     """
-    # Collect all identifiers
-    mac = get_mac_address()
-    cpu = get_cpu_id()
-    hostname = get_hostname()
-    disk = get_disk_serial()
     
-    # Additional identifiers to make fingerprint more unique
-    os_info = platform.platform()
-    memory = str(psutil.virtual_memory().total)
+    # name -> (probe, fallback value)
+    PROBES = {
+        'mac': (get_mac_address, "00:00:00:00:00:00"),
+        'cpu': (get_cpu_id, None),
+        'hostname': (get_hostname, "UNKNOWN_HOST"),
+        'disk': (get_disk_serial, "UNKNOWN_DISK"),
+        'os_info': (platform.platform, None),
+        'memory': (get_memory_total, "0"),
+    }
     
-    # Combine all identifiers
-    fingerprint_data = f"{mac}|{cpu}|{hostname}|{disk}|{os_info}|{memory}"
+    def __init__(self, probe_timeout=None, refresh_interval=None, first_timeout=None):
+        """
+        Initialize the fingerprint service
+        
+        Args:
+            probe_timeout (float, optional): Seconds to wait for the probes
+            refresh_interval (float, optional): Seconds between background refreshes
+            first_timeout (float, optional): Seconds the first computation waits for the probes
+        """
+        self.probe_timeout = probe_timeout or Config.FINGERPRINT_PROBE_TIMEOUT
+        self.first_timeout = first_timeout or Config.FINGERPRINT_FIRST_TIMEOUT
+        self.refresh_interval = refresh_interval or Config.FINGERPRINT_REFRESH_INTERVAL
+        self.version = 0
+        self._result = None
+        self._complete = False
+        # True once a run saw every probe finish (failed probes included)
+        self._settled = False
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._ready = threading.Event()
+        # One pool for every refresh; name -> future of the probe's latest run
+        self._executor = None
+        self._probes = {}
     
-    # Hash the combined data to create the fingerprint
-    fingerprint = hashlib.sha256(fingerprint_data.encode()).hexdigest()
+    def _fallback(self, name):
+        """Get the fallback value for a probe"""
+        fallback = self.PROBES[name][1]
+        if fallback is not None:
+            return fallback
+        return platform.processor() if name == 'cpu' else platform.platform()
     
-    return fingerprint
+    def _collect(self, timeout=None):
+        """
+        Run all probes concurrently
+        
+        Args:
+            timeout (float, optional): Seconds to wait for the probes (default: until they finish)
+        
+        Returns:
+            tuple: (identifiers dict, True if every probe succeeded in time, names of the probes still running)
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self.PROBES), thread_name_prefix='fingerprint-probe')
+            for name, (probe, _) in self.PROBES.items():
+                # A hung probe keeps its worker; don't queue another run behind it
+                if name not in self._probes or self._probes[name].done():
+                    self._probes[name] = self._executor.submit(probe)
+            futures = dict(self._probes)
+        
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        values = {}
+        complete = True
+        pending = []
+        for name, future in futures.items():
+            try:
+                values[name] = future.result(timeout=max(0, deadline - time.monotonic()) if deadline is not None else None)
+            except Exception as e:
+                if isinstance(e, FutureTimeoutError):
+                    pending.append(name)
+                logging.warning(f"Fingerprint probe '{name}' failed or timed out: {e!r}")
+                values[name] = self._fallback(name)
+                complete = False
+        
+        return values, complete, pending
+    
+    def refresh(self, wait=False):
+        """
+        Re-collect the identifiers and recompute both fingerprints
+        
+        Args:
+            wait (bool, optional): Wait up to `first_timeout` for every probe instead of `probe_timeout`
+        
+        Returns:
+            tuple: (machine fingerprint, simplified fingerprint)
+        """
+        values, complete, pending = self._collect(self.first_timeout if wait else self.probe_timeout)
+        
+        # Combine all identifiers
+        fingerprint_data = f"{values['mac']}|{values['cpu']}|{values['hostname']}|{values['disk']}|{values['os_info']}|{values['memory']}"
+        simple_data = f"{values['mac']}|{values['hostname']}|{values['os_info']}"
+        
+        # Hash the combined data to create the fingerprints
+        result = (
+            hashlib.sha256(fingerprint_data.encode()).hexdigest(),
+            hashlib.md5(simple_data.encode()).hexdigest()
+        )
+        
+        with self._lock:
+            # Never replace a complete result with a degraded one
+            if complete or not self._complete:
+                if result != self._result:
+                    self._result = result
+                    self.version += 1
+                self._complete = complete
+            if not pending:
+                self._settled = True
+            return self._result
+    
+    def get(self):
+        """
+        Get the fingerprints, computing them on first use
+        
+        Returns:
+            tuple: (machine fingerprint, simplified fingerprint)
+        
+        Raises:
+            FingerprintUnavailable: A probe has not finished since startup
+        """
+        if self._result is None:
+            with self._lock:
+                first = self._refresher is None
+                if first:
+                    self._refresher = threading.Thread(target=self._refresh_loop, name='fingerprint-refresh', daemon=True)
+            if first:
+                try:
+                    # Block until the probes finish (within first_timeout): a
+                    # fallback-based first fingerprint would fail validation or
+                    # be shown to the user
+                    self.refresh(wait=True)
+                finally:
+                    self._ready.set()
+                    # Keeps retrying a probe that outlived first_timeout
+                    self._refresher.start()
+            else:
+                # Another thread is computing the first result
+                self._ready.wait()
+        if not self._settled:
+            raise FingerprintUnavailable(
+                f"Machine fingerprint probes did not finish within {self.first_timeout}s; "
+                "the license cannot be validated until they do"
+            )
+        return self._result
+    
+    def _restart_refresher(self):
+        """Restart the background refresh in a forked child (threads don't survive fork)"""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._probes = {}
+        if self._refresher is not None and self._result is not None:
+            self._refresher = threading.Thread(target=self._refresh_loop, name='fingerprint-refresh', daemon=True)
+            self._refresher.start()
+    
+    def _refresh_loop(self):
+        """Refresh the fingerprints periodically (retries sooner after a degraded run)"""
+        while True:
+            time.sleep(self.refresh_interval if self._complete else self.probe_timeout)
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.warning(f"Fingerprint refresh failed: {e!r}")
+
+# Shared service for this process
+fingerprint_service = FingerprintService()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=fingerprint_service._restart_refresher)
+
+def get_fingerprint_version():
+    """Get a counter that changes whenever the computed fingerprints change"""
+    fingerprint_service.get()
+    return fingerprint_service.version
+
+def get_machine_fingerprint():
+    """
+    Combine multiple machine identifiers to create a unique fingerprint
+    This makes it harder to bypass the hardware lock
+    """
+    return fingerprint_service.get()[0]
 
 def get_simplified_fingerprint():
     """Get a simplified machine fingerprint (less secure but more portable)"""
-    # Use just the essential identifiers
-    mac = get_mac_address()
-    hostname = get_hostname()
-    os_info = platform.platform()
-    
-    # Combine and hash
-    data = f"{mac}|{hostname}|{os_info}"
-    return hashlib.md5(data.encode()).hexdigest()
+    return fingerprint_service.get()[1]
 
 if __name__ == "__main__":
     # When run directly, print out machine identifiers for diagnostics
@@ -98,4 +284,4 @@ if __name__ == "__main__":
     print(f"Hostname: {get_hostname()}")
     print(f"Disk Serial: {get_disk_serial()}")
     print(f"Machine Fingerprint: {get_machine_fingerprint()}")
-    print(f"Simplified Fingerprint: {get_simplified_fingerprint()}") 
\ No newline at end of file
+    print(f"Simplified Fingerprint: {get_simplified_fingerprint()}")
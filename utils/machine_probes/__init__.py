@@ -0,0 +1,7 @@
+"""
+Platform providers for hardware probes used by utils.machine_id
+
+Each provider module exposes get_cpu_id() and get_disk_serial(). Providers
+are imported lazily by utils.machine_id so platform-specific dependencies
+(e.g. pywin32 on Windows) are only loaded where they are used.
+"""
@@ -0,0 +1,17 @@
+"""
+Generic hardware probe provider
+
+Used on platforms without a dedicated provider. Returns the same fallback
+values the Windows provider uses when WMI is unavailable, so fingerprints
+stay stable across provider changes.
+"""
+
+import platform
+
+def get_cpu_id():
+    """Get CPU information to identify the machine"""
+    return platform.processor()
+
+def get_disk_serial():
+    """Get the disk serial number (not available on this platform)"""
+    return "UNKNOWN_DISK"
@@ -0,0 +1,47 @@
+"""
+Windows hardware probe provider (WMI through pywin32)
+
+Probes may run on worker threads, so COM is initialized per call.
+"""
+
+import platform
+import pythoncom
+import win32com.client
+
+def get_cpu_id():
+    """Get CPU information to identify the machine"""
+    pythoncom.CoInitialize()
+    try:
+        # Use WMI to get CPU information
+        wmi = win32com.client.GetObject("winmgmts:")
+        cpu_info = ""
+        for cpu in wmi.InstancesOf("Win32_Processor"):
+            cpu_info += f"{cpu.ProcessorId.strip()}"
+        
+        if not cpu_info:
+            # Fallback to processor name if ID not available
+            cpu_info = platform.processor()
+        
+        return cpu_info
+    except Exception:
+        # Fallback to platform processor info
+        return platform.processor()
+    finally:
+        pythoncom.CoUninitialize()
+
+def get_disk_serial():
+    """Get the disk serial number"""
+    pythoncom.CoInitialize()
+    try:
+        # Get disk information
+        wmi = win32com.client.GetObject("winmgmts:")
+        for disk in wmi.InstancesOf("Win32_DiskDrive"):
+            disk_info = str(disk.SerialNumber).strip()
+            if disk_info:
+                return disk_info
+        
+        return "UNKNOWN_DISK"
+    except Exception:
+        return "UNKNOWN_DISK"
+    finally:
+        pythoncom.CoUninitialize()
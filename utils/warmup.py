@@ -0,0 +1,162 @@
+"""
+Startup warm-up stage
+
+Runs cache initializers (prompts, license verdict, WooCommerce client and
+term lists, AI SDKs) concurrently on a thread pool with a deadline, records
+per-stage timings and marks the application ready once every stage has
+finished.
+
+Per-process stages (network clients, sockets, background sync threads) are
+not run in a preforking master: run(defer_per_process=True) leaves them
+pending and each forked worker runs them after the fork.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+class WarmupStage:
+    """
+    A set of named initializers run concurrently at startup
+    
+    Stages that miss the deadline keep running in the background; the stage
+    becomes ready (see `ready`) only when all of them have finished, whether
+    they succeeded or failed. Stages left pending or unfinished at a fork are
+    run again in the child.
+    """
+    
+    def __init__(self, deadline=30, max_workers=4):
+        """
+        Initialize the warm-up stage
+        
+        Args:
+            deadline (float, optional): Seconds run() waits for the stages
+            max_workers (int, optional): Thread pool size
+        """
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.stages = {}
+        self.per_process = set()
+        self.results = {}
+        self._started = False
+        self._pending = set()
+        self._deferred = set()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def add(self, name, func, per_process=False):
+        """
+        Register an initializer
+        
+        Args:
+            name (str): Stage name (used in reports)
+            func (callable): Initializer taking no arguments
+            per_process (bool, optional): The stage opens connections or starts
+                threads owned by the process, so it must run in each worker
+        """
+        self.stages[name] = func
+        if per_process:
+            self.per_process.add(name)
+    
+    @property
+    def ready(self):
+        """True once every stage has finished"""
+        return self._ready.is_set()
+    
+    def _run_stage(self, name):
+        """Run one stage and record its outcome"""
+        start = time.perf_counter()
+        try:
+            self.stages[name]()
+            result = {'status': 'ok'}
+        except Exception as e:
+            logging.warning(f"Warm-up stage '{name}' failed: {e!r}")
+            result = {'status': 'error', 'error': str(e)}
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        
+        with self._lock:
+            self.results[name] = result
+            self._pending.discard(name)
+            if not self._pending:
+                self._ready.set()
+    
+    def _submit(self, names):
+        """Submit stages to a fresh thread pool and return their futures"""
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='warmup')
+        futures = [executor.submit(self._run_stage, name) for name in names]
+        executor.shutdown(wait=False)
+        return futures
+    
+    def start(self, defer_per_process=False):
+        """
+        Start all stages in the background (idempotent)
+        
+        Args:
+            defer_per_process (bool, optional): Leave per-process stages pending
+                (preforking master: the workers run them after the fork)
+        
+        Returns:
+            list: Futures of the submitted stages (empty if already started)
+        """
+        with self._lock:
+            if self._started:
+                return []
+            self._started = True
+            self._pending = set(self.stages)
+            self._deferred = set(self.per_process) if defer_per_process else set()
+            if not self._pending:
+                self._ready.set()
+                return []
+        
+        return self._submit([name for name in self.stages if name not in self._deferred])
+    
+    def start_deferred(self):
+        """
+        Start the per-process stages left pending by start(defer_per_process=True)
+        
+        Returns:
+            list: Futures of the submitted stages
+        """
+        with self._lock:
+            names, self._deferred = list(self._deferred), set()
+        return self._submit(names) if names else []
+    
+    def run(self, defer_per_process=False):
+        """
+        Run all stages and wait for them up to the deadline
+        
+        Args:
+            defer_per_process (bool, optional): Leave per-process stages pending
+                (see start())
+        
+        Returns:
+            dict: Report (see report())
+        """
+        futures = self.start(defer_per_process)
+        wait(futures, timeout=self.deadline)
+        return self.report()
+    
+    def report(self):
+        """
+        Get the per-stage report
+        
+        Returns:
+            dict: {'ready': bool, 'stages': {name: {'status', 'seconds'[, 'error']}}}
+        """
+        with self._lock:
+            stages = {name: dict(result) for name, result in self.results.items()}
+            for name in self._pending:
+                stages[name] = {'status': 'running' if self._started and name not in self._deferred else 'pending'}
+        return {'ready': self.ready, 'stages': stages}
+    
+    def _after_fork_in_child(self):
+        """Run deferred and unfinished stages in a forked child (their threads didn't survive the fork)"""
+        self._lock = threading.Lock()
+        self._deferred = set()
+        if self._started and self._pending:
+            self._submit(list(self._pending))